@@ -1,43 +1,78 @@
-from flask import Flask, request, jsonify, render_template
-from datetime import datetime, timedelta
+import logging
+from time import perf_counter
+
+from flask import Flask, abort, g, request, jsonify, render_template
 # from werkzeug.exceptions import BadRequest # No longer explicitly needed for get_json error handling
 # Ensure timecalculator package is discoverable.
 # If app.py is at the root, and timecalculator is a dir at the root,
 # this import should work when app.py is run from the root.
-from timecalculator.core import Time, Duration
+from timecalculator.service import (
+    INVALID_BATCH_ERROR, INVALID_JSON_ERROR, MAX_BATCH_SIZE, SECURITY_HEADERS, UNEXPECTED_ERROR,
+    batch_too_large, cache_stats, calculate_batch, calculate_get, calculate_json, metrics_text, timezone_get,
+)
+from timecalculator.assets import AssetManifest
+from timecalculator.metrics import PROMETHEUS_CONTENT_TYPE, UNMATCHED_ROUTE, metrics
+from timecalculator.profiling import config_from_environment as profiling_config, profile_requests
 
 app = Flask(__name__)
+# Maximum number of items accepted by /api/calculate_time/batch (TIMECALC_MAX_BATCH_SIZE).
+app.config['MAX_BATCH_SIZE'] = MAX_BATCH_SIZE
+# Opt-in request profiling (TIMECALC_PROFILE_DIR and a token or sample rate, see
+# timecalculator.profiling). Without a profile directory nothing is wrapped.
+app.config.update(profiling_config())
+app.wsgi_app = profile_requests(app.wsgi_app, app.config, app.logger)
+if app.config['PROFILE_DIR'] and not app.logger.level:
+    app.logger.setLevel(logging.INFO) # Profiles are logged at INFO
+# Fingerprinted, gzip-compressed builds of the static assets (python -m timecalculator.assets), if built.
+assets = AssetManifest(app.static_folder, app.static_url_path)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = perf_counter()
 
 @app.after_request
 def add_security_headers(response):
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['X-Frame-Options'] = 'SAMEORIGIN'
-    # A reasonably strict CSP.
-    response.headers['Content-Security-Policy'] = (
-        "default-src 'self'; " # Default policy for fetching resources
-        "script-src 'self'; "  # Allows scripts from 'self' (same origin)
-        "style-src 'self'; "   # Allows stylesheets from 'self'
-        "img-src 'self' data:; " # Allows images from 'self' and data: URIs
-        "font-src 'self'; "    # Allows fonts from 'self'
-        "connect-src 'self';"  # Allows connections (like fetch, XHR) to 'self' for API calls
-    )
-    # Optional: HTTP Strict Transport Security (HSTS)
-    # response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
+    response.headers.update(SECURITY_HEADERS)
     return response
 
+@app.after_request
+def record_request_metrics(response):
+    # Labelled by route pattern (not the raw path) to keep the number of series bounded.
+    rule = request.url_rule
+    metrics.observe_request(rule.rule if rule is not None else UNMATCHED_ROUTE, request.method,
+                            response.status_code, perf_counter() - g.request_started)
+    return response
+
+@app.template_global()
+def asset_url(filename):
+    """URL of a static file for templates: the fingerprinted build when there is a current one."""
+    return assets.url(filename)
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/static/build/<filename>', methods=['GET'])
+def built_asset(filename):
+    """
+    Serves a fingerprinted asset with an immutable, year-long Cache-Control, gzip-compressed
+    when the client accepts it. Only files listed in the current build manifest are served.
+    """
+    response = assets.response(filename, request.headers.get('Accept-Encoding'))
+    if response is None:
+        abort(404)
+    return app.response_class(response.body, headers=response.headers)
+
 @app.route('/api/calculate_time', methods=['POST'])
 def calculate_time_api():
     """
-    API endpoint to calculate a new time based on an initial time, duration, and optional days offset.
+    API endpoint to calculate a new time based on an initial time, duration, and optional start date.
     Expects a JSON payload with:
     {
         "initial_time": "H:MM AM/PM or HH:MM", (string, required)
         "duration": "D days, H:MM:SS or H:MM:SS or H:MM or :SS", (string, required)
-        "days_offset": "N or N" (string or int, optional, defaults to 0)
+        "start_date": "YYYY-MM-DD" (string, optional)
+        "timezone": "IANA key, e.g. America/New_York" (string, optional, used with start_date)
     }
     Returns a JSON response:
     Success (200):
@@ -46,10 +81,19 @@ def calculate_time_api():
         "calculated_time": "H:MM AM/PM part of the new time", (string)
         "days_numeric": total_days_passed (int)
     }
+    or, when start_date is given:
+    {
+        "start_datetime_str": "Thu, 2023-10-26 10:00 AM", (string)
+        "end_datetime_str": "Thu, 2023-10-26 03:00 PM", (string)
+        "duration_details_str": "5:00:00" (string)
+    }
+    (with a timezone, both datetimes end with the zone abbreviation, e.g. "... 10:00 AM EDT")
     Error (400 for client errors, 500 for server errors):
     {
         "error": "Error message describing the issue" (string)
     }
+    The calculation itself lives in timecalculator.service.calculate; responses
+    are served from its response cache when the same inputs were seen before.
     """
     data = request.get_json(silent=True) # Use silent=True to prevent Werkzeug from raising 400 for non-JSON or bad JSON
     if not data:
@@ -57,116 +101,119 @@ def calculate_time_api():
         # 1. Content-Type header is not 'application/json'.
         # 2. Request body is not valid JSON.
         # 3. Request body is valid JSON 'null'.
-        return jsonify({"error": "Invalid JSON payload or Content-Type (must be application/json and valid JSON)"}), 400
+        return jsonify({"error": INVALID_JSON_ERROR}), 400
 
-    initial_time_str = data.get('initial_time')
-    duration_str = data.get('duration')
-    # days_offset_str = data.get('days_offset', '0') # Removed
-    start_date_str = data.get('start_date') # Optional
+    try:
+        body, status = calculate_json(data)
+        return app.response_class(body, status=status, mimetype='application/json')
+    except Exception as e:
+        # Log the actual exception on the server side for debugging.
+        app.logger.error(f"Unexpected server error: {e}", exc_info=True)
+        return jsonify({"error": UNEXPECTED_ERROR}), 500
 
-    if not initial_time_str:
-        return jsonify({"error": "Missing 'initial_time'"}), 400
-    if not duration_str:
-        return jsonify({"error": "Missing 'duration'"}), 400
+@app.route('/api/calculate_time', methods=['GET'])
+def calculate_time_get_api():
+    """
+    HTTP-cacheable GET form of /api/calculate_time:
+    GET /api/calculate_time?initial_time=3:00%20PM&duration=1:30[&start_date=2023-10-26]
+    Returns the same body and status as the POST form, plus a strong ETag and a
+    Cache-Control (immutable for successes without a timezone, short-lived
+    otherwise); If-None-Match with a matching ETag gets a 304.
+    Requests whose query string is not in canonical form (see
+    timecalculator.service.canonical_query) are redirected (301) to it.
+    """
+    try:
+        body, status, headers = calculate_get(request.args, request.query_string.decode('latin-1'),
+                                              request.path, request.headers.get('If-None-Match'))
+    except Exception as e:
+        app.logger.error(f"Unexpected server error: {e}", exc_info=True)
+        return jsonify({"error": UNEXPECTED_ERROR}), 500
+    mimetype = 'application/json' if body else None
+    return app.response_class(body, status=status, headers=headers, mimetype=mimetype)
 
+@app.route('/api/timezone', methods=['GET'])
+def timezone_api():
+    """
+    Transition table of an IANA time zone, for the page's JavaScript engine:
+    GET /api/timezone?key=Europe/Berlin
+    Returns 200 with the table (see TransitionTable.to_payload), or 400 with an
+    "error" for a missing or unknown key. Responses carry an ETag and a short
+    Cache-Control; If-None-Match with a matching ETag gets a 304.
+    """
     try:
-        if not start_date_str:
-            # --- Existing logic without start_date ---
-            time_obj = Time(initial_time_str)
-            duration_obj = Duration(duration_str)
-
-            # days_offset related logic removed
-            # days_offset = 0
-            # if isinstance(days_offset_str, (int, str)):
-            #     try:
-            #         days_offset = int(days_offset_str)
-            #     except ValueError:
-            #         return jsonify({"error": "Invalid format for days_offset, must be a string representing an integer."}), 400
-            # else:
-            #     return jsonify({"error": "Invalid type for days_offset, must be an integer or a string representing an integer."}), 400
-
-            new_time_obj, days_from_duration = time_obj + duration_obj
-            total_days_passed = days_from_duration # Removed + days_offset
-
-            calculated_time_str = str(new_time_obj)
-            result_display_str = calculated_time_str
-
-            if total_days_passed == 1:
-                result_display_str += " (next day)"
-            elif total_days_passed > 1:
-                result_display_str += f" ({total_days_passed} days later)"
-            elif total_days_passed == -1:
-                result_display_str += " (previous day)"
-            elif total_days_passed < -1:
-                result_display_str += f" ({abs(total_days_passed)} days prior)"
-
-            return jsonify({
-                "result_string": result_display_str,
-                "calculated_time": calculated_time_str,
-                "days_numeric": total_days_passed
-            }), 200
-        else:
-            # --- New logic with start_date ---
-            # Parse initial_time_str to get hours and minutes
-            time_obj_for_parsing = Time(initial_time_str) # Can raise ValueError
-            parsed_hours = time_obj_for_parsing.minutes_from_midnight // 60
-            parsed_minutes = time_obj_for_parsing.minutes_from_midnight % 60
-
-            # Parse start_date_str
-            try:
-                start_datetime_obj = datetime.strptime(start_date_str, '%Y-%m-%d')
-            except ValueError: # Catches invalid date format for start_date_str
-                return jsonify({"error": f"Invalid start_date format. Expected YYYY-MM-DD, got '{start_date_str}'"}), 400
-
-            # Combine into a full start datetime
-            full_start_datetime = start_datetime_obj.replace(
-                hour=parsed_hours, minute=parsed_minutes, second=0, microsecond=0
-            )
-
-            # Process Duration
-            duration_obj = Duration(duration_str) # Can raise ValueError
-            duration_timedelta = timedelta(seconds=duration_obj.total_seconds)
-
-            # Apply days_offset if provided and valid. This is an ADDITION to the duration itself.
-            # Note: The original logic applied days_offset on top of the duration's days.
-            # Here, we add it to the start_datetime before adding the main duration, or add it to the duration_timedelta.
-            # Let's add it to duration_timedelta for simplicity, consistent with how Duration might handle "X days".
-            # Or, more directly, add to full_start_datetime if it's purely a date shift.
-            # The original spec for days_offset was for the non-calendar case.
-            # For calendar case, if days_offset is to be supported, it should shift the full_start_datetime.
-            # All days_offset logic removed from this path as well.
-            # current_days_offset = 0
-            # if isinstance(days_offset_str, (int, str)) and days_offset_str != '0': # Only process if not default '0'
-            #     try:
-            #         current_days_offset = int(days_offset_str)
-            #         full_start_datetime += timedelta(days=current_days_offset)
-            #     except ValueError:
-            #          return jsonify({"error": "Invalid format for days_offset, must be a string representing an integer when used with start_date."}), 400
-            # elif not isinstance(days_offset_str, (int, str)) and days_offset_str != '0':
-            #      return jsonify({"error": "Invalid type for days_offset, must be an integer or a string representing an integer when used with start_date."}), 400
-
-            # Calculate End Datetime
-            end_datetime_obj = full_start_datetime + duration_timedelta
-
-            # Format Output Strings
-            start_dt_str_formatted = full_start_datetime.strftime('%a, %Y-%m-%d %I:%M %p')
-            end_dt_str_formatted = end_datetime_obj.strftime('%a, %Y-%m-%d %I:%M %p')
-            duration_details = str(duration_obj) # e.g., "X days, H:MM:SS"
-
-            return jsonify({
-                "start_datetime_str": start_dt_str_formatted,
-                "end_datetime_str": end_dt_str_formatted,
-                "duration_details_str": duration_details
-            }), 200
-
-    except ValueError as e: # Catches errors from Time/Duration init or other ValueErrors like strptime
-        return jsonify({"error": f"Error processing time/duration: {str(e)}"}), 400
-    # A direct TypeError for days_offset itself is less likely with the new logic.
-    # The previous custom TypeError for days_offset is removed in favor of direct int conversion attempt.
+        body, status, headers = timezone_get(request.args, request.headers.get('If-None-Match'))
     except Exception as e:
-        # Log the actual exception on the server side for debugging.
         app.logger.error(f"Unexpected server error: {e}", exc_info=True)
-        return jsonify({"error": "An unexpected server error occurred"}), 500
+        return jsonify({"error": UNEXPECTED_ERROR}), 500
+    mimetype = 'application/json' if body else None
+    return app.response_class(body, status=status, headers=headers, mimetype=mimetype)
+
+@app.route('/api/calculate_time/batch', methods=['POST'])
+def calculate_time_batch_api():
+    """
+    Batch variant of /api/calculate_time: many calculations in one request.
+    Expects a JSON array of items, each shaped like a /api/calculate_time payload:
+    [
+        {"initial_time": "3:00 PM", "duration": "1:30"},
+        {"initial_time": "10:00 AM", "duration": "5:00:00", "start_date": "2023-10-26"},
+        ...
+    ]
+    Returns 200 with one result per item, in order. Each result is the body
+    /api/calculate_time would return for that item plus its "status", so an
+    invalid item does not fail the batch:
+    {
+        "results": [
+            {"result_string": "4:30 PM", "calculated_time": "4:30 PM", "days_numeric": 0, "status": 200},
+            {"error": "Missing 'duration'", "status": 400},
+            ...
+        ]
+    }
+    Errors for the request as a whole:
+    400 if the body is not a JSON array; 413 if it has more than
+    app.config['MAX_BATCH_SIZE'] items.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        return jsonify({"error": INVALID_BATCH_ERROR}), 400
+
+    max_batch_size = app.config['MAX_BATCH_SIZE']
+    if len(items) > max_batch_size:
+        body, status = batch_too_large(len(items), max_batch_size)
+        return jsonify(body), status
+
+    def log_unexpected_error(e):
+        app.logger.error(f"Unexpected server error in batch item: {e}", exc_info=True)
+
+    return jsonify({"results": calculate_batch(items, log_unexpected_error)}), 200
+
+@app.route('/api/cache_stats', methods=['GET'])
+def cache_stats_api():
+    """
+    Monitoring endpoint reporting the parse, response and time zone cache counters.
+    The parse caches are opt-in; set TIMECALC_PARSE_CACHE_SIZE to enable them.
+    The response cache holds TIMECALC_RESPONSE_CACHE_SIZE entries (default 4096).
+    Returns a JSON response:
+    {
+        "parse_cache": {
+            "time": {"hits": int, "misses": int, "evictions": int, "size": int, "maxsize": int, "hit_ratio": float},
+            "duration": {...same fields...}
+        },
+        "response_cache": {...same fields...},
+        "timezone_cache": {...same fields...}
+    }
+    """
+    return jsonify(cache_stats()), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics_api():
+    """
+    Prometheus scrape endpoint (text exposition format):
+    - timecalc_http_requests_total{route, method, status}
+    - timecalc_http_request_duration_seconds{route} (histogram, fixed buckets)
+    - timecalc_parse_errors_total{input="time"|"duration"|"start_date"}
+    - timecalc_cache_{hits_total, misses_total, evictions_total, size, maxsize, hit_ratio}{cache}
+    """
+    return app.response_class(metrics_text(), status=200, content_type=PROMETHEUS_CONTENT_TYPE)
 
 # Custom BadRequest handler (@app.errorhandler(BadRequest)) was removed because
 # request.get_json(silent=True) combined with the 'if not data:' check handles
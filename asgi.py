@@ -0,0 +1,326 @@
+import asyncio
+import json
+import logging
+import mimetypes
+import os
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from timecalculator.service import (
+    INVALID_BATCH_ERROR, INVALID_JSON_ERROR, MAX_BATCH_SIZE, SECURITY_HEADERS, UNEXPECTED_ERROR,
+    batch_too_large, cache_stats, calculate_batch, calculate_get, calculate_json, metrics_text, timezone_get,
+    to_json,
+)
+from timecalculator.assets import BUILD_DIRNAME, AssetManifest
+from timecalculator.metrics import PROMETHEUS_CONTENT_TYPE, UNMATCHED_ROUTE, metrics
+
+# asyncio-native ASGI variant of app.py, for serving many concurrent keep-alive
+# clients from one process:
+#
+#     uvicorn asgi:app --port 8080
+#
+# Routes, JSON bodies (byte for byte), status codes and security headers are the
+# same as the Flask app's; both call timecalculator.service. A calculation takes
+# microseconds, so it runs directly on the event loop rather than in a thread.
+# No web framework is needed; index.html is rendered with Jinja2 (installed
+# with Flask).
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, 'static')
+BUILT_ASSET_PREFIX = f'/static/{BUILD_DIRNAME}/'
+TEMPLATE_DIR = os.path.join(ROOT, 'templates')
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_SECURITY_HEADER_PAIRS = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                          for name, value in SECURITY_HEADERS.items()]
+
+
+def _static_url(endpoint: str, filename: str) -> str:
+    """Stand-in for Flask's url_for, which the template only uses for static files."""
+    if endpoint != 'static':
+        raise ValueError(f"Unsupported endpoint: {endpoint}")
+    return f"/static/{filename}"
+
+
+def _render_index(asset_url: Callable[[str], str]) -> bytes:
+    environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape())
+    environment.globals['url_for'] = _static_url
+    environment.globals['asset_url'] = asset_url
+    return environment.get_template('index.html').render().encode('utf-8')
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    """The first value of a request header (name in lower case), or None."""
+    for header_name, value in scope['headers']:
+        if header_name == name:
+            return value
+    return None
+
+
+def _is_json(scope: Scope) -> bool:
+    """Whether the Content-Type is JSON, by the same rule as Flask's request.is_json."""
+    content_type = _header(scope, b'content-type')
+    if content_type is None:
+        return False
+    mimetype = content_type.split(b';', 1)[0].strip().lower()
+    return mimetype == b'application/json' or (
+        mimetype.startswith(b'application/') and mimetype.endswith(b'+json'))
+
+
+def _query_params(query_string: str) -> Dict[str, str]:
+    """Decodes a query string into a dict holding the first value of each parameter."""
+    params: Dict[str, str] = {}
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        params.setdefault(name, value)
+    return params
+
+
+def _decode_json(scope: Scope, body: bytes) -> Any:
+    """Like Flask's request.get_json(silent=True): the decoded body, or None if it is not JSON."""
+    if not _is_json(scope):
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:  # Includes UnicodeDecodeError.
+        return None
+
+
+async def _read_body(receive: Receive) -> Optional[bytes]:
+    """Reads the full request body, or returns None if the client disconnected."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def _send(send: Send, status: int, body: bytes, content_type: Optional[bytes],
+                extra_headers: Iterable[Tuple[bytes, bytes]] = (), include_body: bool = True) -> None:
+    """Sends a complete response. Without content_type (redirects, 304s) no entity headers are sent."""
+    if content_type is None:
+        headers = []
+    else:
+        headers = [(b'content-type', content_type), (b'content-length', str(len(body)).encode('latin-1'))]
+    headers.extend(extra_headers)
+    headers.extend(_SECURITY_HEADER_PAIRS)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body if include_body else b''})
+
+
+async def _send_json(send: Send, body: bytes, status: int,
+                     extra_headers: Iterable[Tuple[bytes, bytes]] = (), include_body: bool = True) -> None:
+    await _send(send, status, body, b'application/json', extra_headers, include_body)
+
+
+class CalculatorASGI:
+    """
+    The ASGI application. Routes:
+        GET  /                          -> index.html
+        GET  /static/<file>             -> static assets
+        GET  /static/build/<file>       -> fingerprinted assets (immutable, gzip when accepted)
+        POST /api/calculate_time        -> same contract as app.py
+        GET  /api/calculate_time?...    -> same contract as app.py (cacheable GET form)
+        GET  /api/timezone?key=...      -> same contract as app.py
+        POST /api/calculate_time/batch  -> same contract as app.py
+        GET  /api/cache_stats           -> same contract as app.py
+        GET  /metrics                   -> same contract as app.py
+    Requests are recorded in timecalculator.metrics under the route labels app.py uses.
+    max_batch_size plays the role of app.config['MAX_BATCH_SIZE'], and assets that of
+    app.py's asset manifest (by default the build in static/, if any).
+    """
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, assets: Optional[AssetManifest] = None):
+        self.max_batch_size = max_batch_size
+        self.assets = assets if assets is not None else AssetManifest(STATIC_DIR)
+        self._index_html = _render_index(self.assets.url)
+        # path -> {method: handler}; HEAD is served by the GET handler.
+        self._json_routes = {
+            '/api/calculate_time': {'POST': self._calculate_time, 'GET': self._calculate_time_get},
+            '/api/timezone': {'GET': self._timezone},
+            '/api/calculate_time/batch': {'POST': self._calculate_time_batch},
+            '/api/cache_stats': {'GET': self._cache_stats},
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        path, method = scope['path'], scope['method']
+        started = perf_counter()
+        status = None
+
+        async def send_recording_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self._dispatch(scope, receive, send_recording_status, path, method)
+        except Exception as e:
+            logger.error(f"Unexpected server error: {e}", exc_info=True)
+            if status is None:
+                await _send_json(send_recording_status, to_json({"error": UNEXPECTED_ERROR}), 500)
+        finally:
+            if status is not None: # Nothing is recorded for clients that disconnected first
+                metrics.observe_request(self._route_label(path, method), method, status, perf_counter() - started)
+
+    def _route_label(self, path: str, method: str) -> str:
+        """The route pattern app.py reports for a request (UNMATCHED_ROUTE for 404s and 405s)."""
+        if path in self._json_routes:
+            handlers = self._json_routes[path]
+            matched = method in handlers or (method == 'HEAD' and 'GET' in handlers)
+        elif path == '/' or path == '/metrics' or path.startswith('/static/'):
+            matched = method in ('GET', 'HEAD')
+        else:
+            matched = False
+        if not matched:
+            return UNMATCHED_ROUTE
+        if self._is_built_asset_path(path):
+            return BUILT_ASSET_PREFIX + '<filename>'
+        return '/static/<path:filename>' if path.startswith('/static/') else path
+
+    @staticmethod
+    def _is_built_asset_path(path: str) -> bool:
+        built_name = path[len(BUILT_ASSET_PREFIX):]
+        return path.startswith(BUILT_ASSET_PREFIX) and built_name != '' and '/' not in built_name
+
+    async def _dispatch(self, scope: Scope, receive: Receive, send: Send, path: str, method: str) -> None:
+        if path in self._json_routes:
+            handlers = self._json_routes[path]
+            handler = handlers.get('GET' if method == 'HEAD' else method)
+            if handler is None:
+                allowed = list(handlers) + (['HEAD'] if 'GET' in handlers else [])
+                await self._method_not_allowed(send, ', '.join(sorted(allowed)))
+                return
+            body = await _read_body(receive)
+            if body is None:
+                return
+            response_body, status, headers = handler(scope, body)
+            header_pairs = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                            for name, value in headers.items()]
+            if status in (301, 304):
+                await _send(send, status, b'', None, header_pairs)
+            else:
+                await _send_json(send, response_body, status, header_pairs, include_body=(method != 'HEAD'))
+        elif path == '/' or path == '/metrics' or path.startswith('/static/'):
+            if method not in ('GET', 'HEAD'):
+                await self._method_not_allowed(send, 'GET, HEAD')
+            elif path == '/':
+                await _send(send, 200, self._index_html, b'text/html; charset=utf-8',
+                            include_body=(method == 'GET'))
+            elif path == '/metrics':
+                await _send(send, 200, metrics_text().encode('utf-8'), PROMETHEUS_CONTENT_TYPE.encode('latin-1'),
+                            include_body=(method == 'GET'))
+            elif self._is_built_asset_path(path):
+                await self._built_asset(send, scope, path[len(BUILT_ASSET_PREFIX):], include_body=(method == 'GET'))
+            else:
+                await self._static_file(send, path[len('/static/'):], include_body=(method == 'GET'))
+        else:
+            await _send(send, 404, b'Not Found', b'text/plain; charset=utf-8')
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _method_not_allowed(send: Send, allowed: str) -> None:
+        await _send(send, 405, b'Method Not Allowed', b'text/plain; charset=utf-8',
+                    [(b'allow', allowed.encode('latin-1'))])
+
+    # JSON route handlers:
+    # (scope, request body) -> (serialized response body, status, extra headers).
+
+    def _calculate_time(self, scope: Scope, body: bytes) -> Tuple[bytes, int, Dict[str, str]]:
+        data = _decode_json(scope, body)
+        if not data:
+            return to_json({"error": INVALID_JSON_ERROR}), 400, {}
+        return calculate_json(data) + ({},)
+
+    def _calculate_time_get(self, scope: Scope, body: bytes) -> Tuple[bytes, int, Dict[str, str]]:
+        query_string = scope['query_string'].decode('latin-1')
+        if_none_match = _header(scope, b'if-none-match')
+        return calculate_get(_query_params(query_string), query_string, scope['path'],
+                             if_none_match.decode('latin-1') if if_none_match is not None else None)
+
+    def _timezone(self, scope: Scope, body: bytes) -> Tuple[bytes, int, Dict[str, str]]:
+        if_none_match = _header(scope, b'if-none-match')
+        return timezone_get(_query_params(scope['query_string'].decode('latin-1')),
+                            if_none_match.decode('latin-1') if if_none_match is not None else None)
+
+    def _calculate_time_batch(self, scope: Scope, body: bytes) -> Tuple[bytes, int, Dict[str, str]]:
+        items = _decode_json(scope, body)
+        if not isinstance(items, list):
+            return to_json({"error": INVALID_BATCH_ERROR}), 400, {}
+        if len(items) > self.max_batch_size:
+            payload, status = batch_too_large(len(items), self.max_batch_size)
+            return to_json(payload), status, {}
+
+        def log_unexpected_error(e):
+            logger.error(f"Unexpected server error in batch item: {e}", exc_info=True)
+
+        return to_json({"results": calculate_batch(items, log_unexpected_error)}), 200, {}
+
+    def _cache_stats(self, scope: Scope, body: bytes) -> Tuple[bytes, int, Dict[str, str]]:
+        return to_json(cache_stats()), 200, {}
+
+    async def _static_file(self, send: Send, filename: str, include_body: bool) -> None:
+        path = os.path.realpath(os.path.join(STATIC_DIR, filename))
+        if os.path.dirname(path) != os.path.realpath(STATIC_DIR) or not os.path.isfile(path):
+            await _send(send, 404, b'Not Found', b'text/plain; charset=utf-8')
+            return
+        content = await asyncio.to_thread(_read_file, path)
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
+        await _send(send, 200, content, content_type.encode('latin-1'),
+                    [(b'cache-control', b'no-cache')], include_body)
+
+
+    async def _built_asset(self, send: Send, scope: Scope, built_name: str, include_body: bool) -> None:
+        accept_encoding = _header(scope, b'accept-encoding')
+        response = self.assets.response(built_name,
+                                        accept_encoding.decode('latin-1') if accept_encoding is not None else None)
+        if response is None:
+            await _send(send, 404, b'Not Found', b'text/plain; charset=utf-8')
+            return
+        headers = dict(response.headers)
+        content_type = headers.pop('Content-Type')
+        await _send(send, 200, response.body, content_type.encode('latin-1'),
+                    [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()],
+                    include_body)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+app = CalculatorASGI()
+
+if __name__ == '__main__':
+    # For development; equivalent to `uvicorn asgi:app --host 0.0.0.0 --port 8080`.
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Running asgi.py directly requires an ASGI server: pip install uvicorn")
+    uvicorn.run(app, host='0.0.0.0', port=8080)
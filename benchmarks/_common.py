@@ -0,0 +1,28 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+import os
+import sys
+import time
+from typing import Callable
+
+# Make the repository root importable when a script is run directly,
+# e.g. `python benchmarks/bench_duration_parse.py`.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """Runs func `repeat` times and returns the fastest wall-clock time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(label: str, seconds: float, count: int) -> None:
+    """Prints one result line: total time, per-item cost and throughput."""
+    per_item_ns = seconds / count * 1e9
+    rate = count / seconds if seconds else float("inf")
+    print(f"{label:<40} {seconds * 1000:10.1f} ms {per_item_ns:10.1f} ns/item {rate:14,.0f} items/s")
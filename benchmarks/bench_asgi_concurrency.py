@@ -0,0 +1,147 @@
+"""
+Benchmark: many concurrent keep-alive clients against the Flask and ASGI apps.
+
+Starts each app in its own server process (Flask on its threaded development
+server, as `app.py` runs it; `asgi.py` under uvicorn), then runs --clients
+concurrent clients that each POST --requests calculations to
+/api/calculate_time back to back over a keep-alive connection. The Flask
+development server closes the connection after every response, so its clients
+reconnect each time. Reports throughput and latency percentiles.
+Responses are checked to be identical between the two apps.
+
+Usage:
+    python benchmarks/bench_asgi_concurrency.py [--clients N] [--requests N]
+
+The ASGI run needs uvicorn (`pip install uvicorn`); it is skipped otherwise.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import _common
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PAYLOAD = json.dumps({"initial_time": "11:43 PM", "duration": "24:20"}).encode()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command(kind: str, port: int) -> Optional[List[str]]:
+    if kind == "flask":
+        return [sys.executable, "-c",
+                f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        return None
+    return [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning"]
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"Server did not start listening on port {port}")
+
+
+async def post(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, port: int) -> Tuple[bytes, bool]:
+    """Sends one keep-alive POST; returns the response body and whether the server kept the connection open."""
+    writer.write(b"POST /api/calculate_time HTTP/1.1\r\n"
+                 b"Host: 127.0.0.1:%d\r\n"
+                 b"Content-Type: application/json\r\n"
+                 b"Content-Length: %d\r\n\r\n%s" % (port, len(PAYLOAD), PAYLOAD))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, _, header_block = head.partition(b"\r\n")
+    if b" 200 " not in status_line:
+        raise RuntimeError(f"Unexpected response: {status_line!r}")
+    length = 0
+    keep_alive = True
+    for line in header_block.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"connection" and value.strip().lower() == b"close":
+            keep_alive = False
+    return await reader.readexactly(length), keep_alive
+
+
+async def client(port: int, requests: int, latencies: List[float], bodies: set) -> None:
+    connection = None
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            # Servers without keep-alive close after each response; reconnecting is part of their latency.
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", port)
+            body, keep_alive = await post(*connection, port)
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+            bodies.add(body)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        if connection is not None:
+            connection[1].close()
+
+
+async def load(port: int, clients: int, requests: int):
+    latencies: List[float] = []
+    bodies: set = set()
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, latencies, bodies) for _ in range(clients)))
+    return time.perf_counter() - start, sorted(latencies), bodies
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent keep-alive connections.")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per connection.")
+    args = parser.parse_args()
+    total = args.clients * args.requests
+
+    reference_bodies = None
+    for kind in ("flask", "asgi"):
+        port = free_port()
+        command = server_command(kind, port)
+        if command is None:
+            print(f"{kind}: skipped (pip install uvicorn to run the ASGI app)")
+            continue
+        server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            elapsed, latencies, bodies = asyncio.run(load(port, args.clients, args.requests))
+        finally:
+            server.terminate()
+            server.wait()
+        if reference_bodies is None:
+            reference_bodies = bodies
+        elif bodies != reference_bodies:
+            raise SystemExit(f"{kind} responses differ: {bodies!r} != {reference_bodies!r}")
+        _common.report(f"{kind} ({args.clients} clients)", elapsed, total)
+        print(f"{'':<40} latency p50 {percentile(latencies, 0.5) * 1000:7.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms, max {latencies[-1] * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: batch computation of end times.
+
+Compares the per-object path (Time + Duration for each row) with
+timecalculator.batch over pre-parsed integer columns, with and without NumPy,
+and with parsing from strings included.
+
+Usage:
+    python benchmarks/bench_batch.py [--rows N] [--repeat R]
+"""
+import argparse
+import random
+
+import _common
+from timecalculator import batch
+from timecalculator.core import Time, Duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    time_pool = [str(Time.from_minutes(m)) for m in range(0, 1440, 5)]
+    duration_pool = [f"{rng.randrange(200)}:{rng.randrange(60):02d}:{rng.randrange(60):02d}" for _ in range(500)]
+    time_strings = [rng.choice(time_pool) for _ in range(args.rows)]
+    duration_strings = [rng.choice(duration_pool) for _ in range(args.rows)]
+    start_minutes = batch.parse_times(time_strings, use_numpy=False)
+    duration_seconds = batch.parse_durations(duration_strings, use_numpy=False)
+
+    def per_object():
+        return [Time(t) + Duration(d) for t, d in zip(time_strings, duration_strings)]
+
+    print(f"Computing {args.rows:,} rows (best of {args.repeat})")
+    runs = [
+        ("per-object Time + Duration (strings)", per_object),
+        ("batch, pure Python (strings)", lambda: batch.add_time_batch(time_strings, duration_strings, use_numpy=False)),
+        ("batch, pure Python (integers)", lambda: batch.add_durations(start_minutes, duration_seconds, use_numpy=False)),
+    ]
+    if batch.np is not None:
+        start_array = batch.np.asarray(start_minutes, dtype=batch.np.int64)
+        duration_array = batch.np.asarray(duration_seconds, dtype=batch.np.int64)
+        runs += [
+            ("batch, NumPy (strings)", lambda: batch.add_time_batch(time_strings, duration_strings, use_numpy=True)),
+            ("batch, NumPy (int64 arrays)", lambda: batch.add_durations(start_array, duration_array, use_numpy=True)),
+        ]
+    else:
+        print("NumPy not installed; skipping the vectorized runs.")
+
+    for label, func in runs:
+        _common.report(label, _common.best_of(func, args.repeat), args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: per-invocation latency of the CLI, with and without the warm daemon.
+
+Measures, for one single calculation:
+  - `python -m timecalculator.cli` (cold start: interpreter, imports, tables),
+  - `python -m timecalculator.client` with no daemon (in-process fallback),
+  - `python -m timecalculator.client` forwarding to a running daemon,
+  - a bare socket round trip to the daemon (client.request, no interpreter start),
+and reports the mean latency per invocation.
+
+Usage:
+    python benchmarks/bench_cli_daemon.py [--runs N] [--requests N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+
+from timecalculator import client
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ARGS = ["11:43 PM", "24:20", "--days_offset", "1"]
+
+
+def run_processes(module: str, runs: int, env: dict) -> float:
+    """Starts `python -m module ARGS` runs times, returning the total wall time."""
+    command = [sys.executable, "-m", module] + ARGS
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(command, check=True, cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def wait_for_socket(socket_path: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            client.request(ARGS, socket_path)
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f"Daemon did not start listening on {socket_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Process invocations per variant.")
+    parser.add_argument("--requests", type=int, default=5000, help="Socket round trips to time.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "daemon.sock")
+        env = dict(os.environ, TIMECALC_DAEMON_SOCKET=socket_path)
+
+        expected = subprocess.run([sys.executable, "-m", "timecalculator.cli"] + ARGS, check=True,
+                                  cwd=ROOT, capture_output=True, text=True).stdout
+        _common.report("cli (cold start)", run_processes("timecalculator.cli", args.runs, env), args.runs)
+        _common.report("client, no daemon (fallback)",
+                       run_processes("timecalculator.client", args.runs, env), args.runs)
+
+        daemon = subprocess.Popen([sys.executable, "-m", "timecalculator.daemon", "--socket", socket_path],
+                                  cwd=ROOT, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_socket(socket_path)
+            stdout, _, _ = client.request(ARGS, socket_path)
+            if stdout != expected:
+                raise SystemExit(f"Daemon output {stdout!r} differs from CLI output {expected!r}")
+            _common.report("client -> daemon",
+                           run_processes("timecalculator.client", args.runs, env), args.runs)
+            elapsed = _common.best_of(lambda: [client.request(ARGS, socket_path)
+                                               for _ in range(args.requests)], repeat=3)
+            _common.report("socket round trip (client.request)", elapsed, args.requests)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: CLI batch mode scaling with --workers.
+
+Generates a CSV file of N records, runs `python -m timecalculator.cli --batch`
+with each worker count, and reports wall time, speedup over one worker and
+parallel efficiency. Output goes to a temporary file and is checked to be
+identical across worker counts.
+
+Usage:
+    python benchmarks/bench_cli_workers.py [--rows N] [--workers 1,2,4,8]
+"""
+import argparse
+import filecmp
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def write_input(path: str, rows: int) -> None:
+    rng = random.Random(11)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("initial_time,duration,days_offset\n")
+        for _ in range(rows):
+            f.write(f"{rng.randrange(1, 13)}:{rng.randrange(60):02d} {rng.choice(('AM', 'PM'))},"
+                    f"{rng.randrange(300)}:{rng.randrange(60):02d}:{rng.randrange(60):02d},"
+                    f"{rng.choice(('', '', '1'))}\n")
+
+
+def run_cli(input_path: str, output_path: str, workers: int) -> float:
+    command = [sys.executable, "-m", "timecalculator.cli", "--batch", input_path,
+               "--output", output_path, "--workers", str(workers)]
+    start = time.perf_counter()
+    subprocess.run(command, check=True, cwd=ROOT)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Records in the generated file.")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts to run.")
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "jobs.csv")
+        write_input(input_path, args.rows)
+        size_mb = os.path.getsize(input_path) / 1e6
+        print(f"{args.rows:,} records ({size_mb:.1f} MB), {os.cpu_count()} CPUs available")
+
+        baseline = None
+        reference_output = None
+        for workers in worker_counts:
+            output_path = os.path.join(tmp, f"out-{workers}.csv")
+            elapsed = run_cli(input_path, output_path, workers)
+            if reference_output is None:
+                reference_output = output_path
+            elif not filecmp.cmp(reference_output, output_path, shallow=False):
+                raise SystemExit(f"Output with {workers} workers differs from {worker_counts[0]} worker(s)")
+            if baseline is None:
+                baseline = elapsed * workers  # Estimated single-worker time.
+            speedup = baseline / elapsed
+            _common.report(f"--workers {workers}", elapsed, args.rows)
+            print(f"{'':<40} speedup {speedup:5.2f}x, efficiency {speedup / workers:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
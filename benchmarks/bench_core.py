@@ -0,0 +1,235 @@
+"""
+Benchmark: core hot paths, with a stored baseline and regression thresholds.
+
+Times Duration.__init__, Time.__init__, Time.__add__, Time.from_minutes,
+Duration.__str__, Time.__str__ and calculator.add_time over representative
+inputs (the common shapes seen in job logs and API traffic) and adversarial
+ones (day prefixes, huge values, unusual spellings that miss the fast paths,
+and invalid strings that raise).
+
+Each case is also expressed relative to a fixed pure-Python calibration loop
+timed alongside it, which cancels most of the difference between machines,
+interpreter builds and the load on the machine at the time. Baselines store both numbers; checks compare the
+relative one, so a baseline recorded on one machine is usable on another.
+
+    --save       write the results to the baseline file
+    --check      compare against the baseline and exit with status 1 when any
+                 case is slower by more than --threshold (default 25%) in two
+                 measurements; a case's own threshold can be set in the
+                 baseline's "thresholds" map, which --save keeps
+
+Usage:
+    python benchmarks/bench_core.py [--count N] [--repeat R] [--only SUBSTRING]
+        [--baseline FILE] [--save | --check [--threshold FRACTION]]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import _common
+from timecalculator.calculator import add_time
+from timecalculator.core import Duration, Time
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "core.json")
+DEFAULT_THRESHOLD = 0.25
+
+REPRESENTATIVE_DURATIONS = ["0:05", "1:30", "12:00", "150:35", "3:10", "0:00:59", "1:02:03", "23:59:59",
+                            "48:00:00", "8:15", "0:45", "2:30:00"]
+ADVERSARIAL_DURATIONS = ["2 days, 1:00:00", "1 day, 2:05", ":30", "999999999999:59:59", "12345 days, 0:00",
+                         "3  days,  4:05", "１:30", "0:7:7"]
+INVALID_DURATIONS = ["1:60", "abc", "", "1:2:3:4", "-1:00", "1 days 2:00", ":60", "1:00:60"]
+
+REPRESENTATIVE_TIMES = ["3:00 PM", "11:43 AM", "12:00 AM", "9:15 pm", "13:45", "00:30", "6:05 AM", "23:59"]
+ADVERSARIAL_TIMES = ["3:00  PM", "3:00\tpm", "３:00 PM", "12:00 Am", "7:30 pM", "0:00"]
+INVALID_TIMES = ["13:00 PM", "12:60", "24:00", "noon", "", "3:00 XM", "1:5 PM", "003:00"]
+
+
+def calibration(inputs: List[str]) -> Callable[[], object]:
+    """A fixed mix of calls, slicing, dict lookups and integer arithmetic, as used by the cases."""
+    table = {str(n): n for n in range(100)}
+
+    def op(s: str) -> int:
+        return table.get(s[:2], 0) * 60 + len(s) % 7
+
+    return lambda: [op(s) for s in inputs]
+
+
+def each(func: Callable[[Any], object], inputs: List[Any]) -> Callable[[], object]:
+    return lambda: [func(x) for x in inputs]
+
+
+def each_raising(func: Callable[[Any], object], inputs: List[Any]) -> Callable[[], None]:
+    def run() -> None:
+        for x in inputs:
+            try:
+                func(x)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{func.__qualname__}({x!r}) did not raise")
+    return run
+
+
+def cycle(values: List[Any], count: int) -> List[Any]:
+    return (values * (count // len(values) + 1))[:count]
+
+
+def cases(count: int) -> List[Tuple[str, Callable[[], object]]]:
+    """(name, zero-argument function doing count operations) for every measured path."""
+    durations = [Duration(s) for s in cycle(REPRESENTATIVE_DURATIONS, count)]
+    long_durations = [Duration(f"{h}:{h % 60:02d}:17") for h in cycle([10 ** 6, 10 ** 9, 10 ** 15, 876_543], count)]
+    times = [Time(s) for s in cycle(REPRESENTATIVE_TIMES, count)]
+    time_duration_pairs = list(zip(times, durations))
+    time_long_pairs = list(zip(times, long_durations))
+    add_time_inputs = list(zip(cycle(REPRESENTATIVE_TIMES, count), cycle(REPRESENTATIVE_DURATIONS, count),
+                               cycle([0, 0, 0, 2, None], count)))
+    add_time_adversarial = list(zip(cycle(ADVERSARIAL_TIMES, count), cycle(ADVERSARIAL_DURATIONS, count),
+                                    cycle([0, 400, 10 ** 6], count)))
+
+    return [
+        ("Duration.__init__/representative", each(Duration, cycle(REPRESENTATIVE_DURATIONS, count))),
+        ("Duration.__init__/adversarial", each(Duration, cycle(ADVERSARIAL_DURATIONS, count))),
+        ("Duration.__init__/invalid", each_raising(Duration, cycle(INVALID_DURATIONS, count))),
+        ("Time.__init__/representative", each(Time, cycle(REPRESENTATIVE_TIMES, count))),
+        ("Time.__init__/adversarial", each(Time, cycle(ADVERSARIAL_TIMES, count))),
+        ("Time.__init__/invalid", each_raising(Time, cycle(INVALID_TIMES, count))),
+        ("Time.__add__/representative", lambda: [t + d for t, d in time_duration_pairs]),
+        ("Time.__add__/huge durations", lambda: [t + d for t, d in time_long_pairs]),
+        ("Time.from_minutes/all minutes", each(Time.from_minutes, cycle(list(range(1440)), count))),
+        ("Time.from_minutes/out of range", each_raising(Time.from_minutes, cycle([-1, 1440, 10 ** 12], count))),
+        ("Duration.__str__/representative", each(str, durations)),
+        ("Duration.__str__/huge durations", each(str, long_durations)),
+        ("Time.__str__/all minutes", each(str, cycle(times, count))),
+        ("add_time/representative", lambda: [add_time(t, d, n) for t, d, n in add_time_inputs]),
+        ("add_time/adversarial", lambda: [add_time(t, d, n) for t, d, n in add_time_adversarial]),
+        ("add_time/invalid", each_raising(lambda t: add_time(t, "1:00"), cycle(INVALID_TIMES, count))),
+    ]
+
+
+def measure(count: int, repeat: int, select: Callable[[str], bool]) -> Tuple[float, Dict[str, Dict[str, float]]]:
+    """
+    Returns the calibration cost (ns/op) and {case: {"ns_per_op", "relative"}}
+    for the cases whose name passes select.
+
+    Rounds are interleaved across the cases, with a calibration timing before
+    every case timing, so a slow stretch during the run (frequency scaling, a
+    noisy neighbour) hits both alike. Each figure is the best round; relative
+    is the case's best over the calibration loop's best.
+    """
+    calibrate = calibration(cycle(REPRESENTATIVE_DURATIONS, count))
+    selected = [(name, func) for name, func in cases(count) if select(name)]
+    calibration_best = float("inf")
+    best: Dict[str, float] = {name: float("inf") for name, _ in selected}
+    gc.collect()
+    gc.disable()
+    try:
+        for name, func in selected:  # Warm-up round, not measured.
+            func()
+        for _ in range(repeat):
+            for name, func in selected:
+                calibration_best = min(calibration_best, _common.best_of(calibrate, 1))
+                best[name] = min(best[name], _common.best_of(func, 1))
+    finally:
+        gc.enable()
+    for name, _ in selected:
+        _common.report(name, best[name], count)
+    return calibration_best / count * 1e9, {
+        name: {"ns_per_op": best[name] / count * 1e9, "relative": best[name] / calibration_best}
+        for name, _ in selected}
+
+
+def regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+                threshold: float) -> List[Tuple[str, float, float]]:
+    """(case, change, allowed change) for each case slower than its threshold allows."""
+    thresholds = baseline.get("thresholds", {})
+    found = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["relative"] / before["relative"] - 1
+        allowed = thresholds.get(name, threshold)
+        if change > allowed:
+            found.append((name, change, allowed))
+    return found
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=os.path.dirname(BASELINE),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50_000, help="Operations per case and round.")
+    parser.add_argument("--repeat", type=int, default=7, help="Measured rounds.")
+    parser.add_argument("--only", help="Run only the cases whose name contains this text.")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON file.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="Write the results to the baseline file.")
+    mode.add_argument("--check", action="store_true", help="Exit with status 1 on a regression.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.25 = 25%%) for cases without their own.")
+    args = parser.parse_args()
+
+    print(f"{args.count:,} operations per case, {args.repeat} rounds")
+    calibration_ns, results = measure(args.count, args.repeat, lambda name: not args.only or args.only in name)
+    print(f"{'calibration loop':<40} {calibration_ns:10.1f} ns/op")
+
+    baseline = load_baseline(args.baseline)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        recorded = dict(baseline["results"]) if baseline and args.only else {}
+        recorded.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"revision": git_revision(), "python": platform.python_version(),
+                       "platform": platform.platform(), "calibration_ns": calibration_ns,
+                       "thresholds": baseline.get("thresholds", {}) if baseline else {},
+                       "results": dict(sorted(recorded.items()))}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+    if baseline is None:
+        if args.check:
+            raise SystemExit(f"No baseline at {args.baseline}; record one with --save")
+        return
+
+    print(f"\nchange against the baseline from {baseline.get('revision') or 'an unknown revision'} "
+          f"(relative to the calibration loop):")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is not None:
+            print(f"  {name:<38} {(result['relative'] / before['relative'] - 1) * 100:+7.1f}%")
+    found = regressions(results, baseline, args.threshold)
+    if found and args.check:
+        # A single noisy run should not fail a check: measure the suspects again and keep their better figure.
+        suspects = {name for name, _, _ in found}
+        print(f"\nmeasuring {len(suspects)} slower case(s) again")
+        _, again = measure(args.count, args.repeat, lambda name: name in suspects)
+        for name, result in again.items():
+            results[name]["relative"] = min(results[name]["relative"], result["relative"])
+        found = regressions(results, baseline, args.threshold)
+    if found and args.check:
+        lines = [f"  {name}: {change * 100:+.1f}% (allowed {allowed * 100:+.0f}%)" for name, change, allowed in found]
+        print("regressions:\n" + "\n".join(lines), file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: memory held per Duration instance.
+
+Builds N distinct durations with the current Duration class and with the previous
+__dict__-based layout (five instance attributes), and reports the traced
+allocation per instance, including the int objects each one keeps alive.
+
+Usage:
+    python benchmarks/bench_duration_memory.py [--count N]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Optional
+
+import _common
+from timecalculator.core import Duration
+from timecalculator.parsing import parse_duration
+
+
+class LegacyDuration:
+    """The Duration storage layout before __slots__ (reference only)."""
+
+    def __init__(self, duration_str: str):
+        days, hours, minutes, seconds = parse_duration(duration_str)
+        self._parsed_days: Optional[int] = days
+        self._parsed_hours: Optional[int] = hours
+        self._parsed_minutes: Optional[int] = minutes
+        self._parsed_seconds: Optional[int] = seconds
+        self._total_seconds = (days or 0) * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+def duration_strings(count: int):
+    """Yields `count` distinct-ish duration strings in the common H:MM:SS shape."""
+    for i in range(count):
+        yield f"{i % 500}:{i // 60 % 60:02d}:{i % 60:02d}"
+
+
+def measure(cls, count: int) -> float:
+    """Returns traced bytes per instance for `count` instances of cls."""
+    gc.collect()
+    tracemalloc.start()
+    holder = [None] * count  # Pre-sized so list growth is excluded from the measurement.
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i, duration_str in enumerate(duration_strings(count)):
+        holder[i] = cls(duration_str)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del holder
+    gc.collect()
+    return used / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000_000, help="Durations to build per layout.")
+    args = parser.parse_args()
+
+    print(f"Bytes per instance over {args.count:,} durations")
+    for label, cls in (("legacy (__dict__, 5 attributes)", LegacyDuration), ("Duration (__slots__)", Duration)):
+        start = time.perf_counter()
+        per_instance = measure(cls, args.count)
+        total_mb = per_instance * args.count / 1e6
+        print(f"{label:<34} {per_instance:8.1f} B/instance {total_mb:10.1f} MB total"
+              f"   ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
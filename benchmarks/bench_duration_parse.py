@@ -0,0 +1,99 @@
+"""
+Benchmark: Duration string parsing.
+
+Compares the current Duration constructor against the previous implementation,
+which compiled both regular expressions and ran both matches on every call.
+
+Usage:
+    python benchmarks/bench_duration_parse.py [--count N] [--repeat R]
+"""
+import argparse
+import re
+from typing import Optional
+
+import _common
+from timecalculator.core import Duration
+
+# Representative job-log inputs: mostly H:MM / H:MM:SS, with some day-prefixed and :SS values.
+SAMPLE_INPUTS = [
+    "0:05", "1:30", "12:00", "150:35", "3:10", "0:00:59", "1:02:03", "23:59:59",
+    "48:00:00", "2 days, 1:00:00", "1 day, 2:05:30", ":30",
+]
+
+
+class LegacyDuration:
+    """The Duration constructor as it was before the dedicated parser (reference only)."""
+
+    def __init__(self, duration_str: str):
+        self._parsed_days: Optional[int] = None
+        self._parsed_hours: Optional[int] = None
+        self._parsed_minutes: Optional[int] = None
+        self._parsed_seconds: Optional[int] = None
+        pat1 = re.compile(r"^(?:(\d+)\s+days?,\s+)?(\d+):(\d{1,2})(?::(\d{1,2}))?$")
+        match1 = pat1.fullmatch(duration_str)
+        pat2 = re.compile(r"^:(\d{1,2})$")
+        match2 = pat2.fullmatch(duration_str)
+        if match1:
+            days_str, hours_str, minutes_str, seconds_str = match1.groups()
+            if days_str:
+                self._parsed_days = int(days_str)
+            self._parsed_hours = int(hours_str)
+            self._parsed_minutes = int(minutes_str)
+            if seconds_str:
+                self._parsed_seconds = int(seconds_str)
+            elif self._parsed_minutes is not None:
+                self._parsed_seconds = 0
+        elif match2:
+            seconds_str, = match2.groups()
+            self._parsed_seconds = int(seconds_str)
+            self._parsed_days = 0
+            self._parsed_hours = 0
+            self._parsed_minutes = 0
+        else:
+            raise ValueError(f"Invalid duration string format: {duration_str}")
+        if self._parsed_days is not None and self._parsed_days < 0:
+            raise ValueError("Days component must be non-negative.")
+        if self._parsed_hours is not None and self._parsed_hours < 0:
+            raise ValueError("Hours component must be non-negative.")
+        if self._parsed_minutes is not None and not (0 <= self._parsed_minutes <= 59):
+            raise ValueError("Minutes component must be between 0 and 59.")
+        if self._parsed_seconds is not None and not (0 <= self._parsed_seconds <= 59):
+            raise ValueError("Seconds component must be between 0 and 59.")
+        calc_d = self._parsed_days if self._parsed_days is not None else 0
+        calc_h = self._parsed_hours if self._parsed_hours is not None else 0
+        calc_m = self._parsed_minutes if self._parsed_minutes is not None else 0
+        calc_s = self._parsed_seconds if self._parsed_seconds is not None else 0
+        self._total_seconds = calc_d * 86400 + calc_h * 3600 + calc_m * 60 + calc_s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="Strings parsed per run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    inputs = (SAMPLE_INPUTS * (args.count // len(SAMPLE_INPUTS) + 1))[:args.count]
+    common_shapes = [s for s in inputs if "day" not in s and not s.startswith(":")]
+
+    for s in SAMPLE_INPUTS:
+        assert Duration(s).total_seconds == LegacyDuration(s)._total_seconds, s
+
+    def run(cls, data):
+        return lambda: [cls(s) for s in data]
+
+    print(f"Parsing {args.count:,} duration strings (best of {args.repeat})")
+    legacy = _common.best_of(run(LegacyDuration, inputs), args.repeat)
+    current = _common.best_of(run(Duration, inputs), args.repeat)
+    _common.report("legacy constructor, mixed", legacy, len(inputs))
+    _common.report("Duration, mixed", current, len(inputs))
+
+    legacy_common = _common.best_of(run(LegacyDuration, common_shapes), args.repeat)
+    current_common = _common.best_of(run(Duration, common_shapes), args.repeat)
+    _common.report("legacy constructor, H:MM[:SS] only", legacy_common, len(common_shapes))
+    _common.report("Duration, H:MM[:SS] only", current_common, len(common_shapes))
+
+    print(f"speedup: mixed {legacy / current:.2f}x, H:MM[:SS] only {legacy_common / current_common:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
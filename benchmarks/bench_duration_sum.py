@@ -0,0 +1,63 @@
+"""
+Benchmark: Summing many duration strings.
+
+Compares totalling by hand through Duration objects against the streaming
+timecalculator.aggregate.sum_seconds, over a repetitive log-like stream (few
+distinct strings) and over one with every string distinct (no memo hits), and
+checks that the streaming sum's memory stays flat.
+
+Usage:
+    python benchmarks/bench_duration_sum.py [--count N] [--repeat R]
+"""
+import argparse
+import tracemalloc
+from itertools import cycle, islice
+
+import _common
+from timecalculator.aggregate import sum_seconds
+from timecalculator.core import Duration
+
+SAMPLE_INPUTS = [
+    "0:05", "1:30", "12:00", "150:35", "3:10", "0:00:59", "1:02:03", "23:59:59",
+    "48:00:00", "2 days, 1:00:00", "1 day, 2:05:30", ":30",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="Strings summed per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    repetitive = list(islice(cycle(SAMPLE_INPUTS), args.count))
+    # Every string different: H:MM:SS for 0, 7, 14, ... seconds.
+    distinct = [f"{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+                for seconds in range(0, 7 * args.count, 7)]
+
+    def by_hand(data):
+        return lambda: sum(Duration(s).total_seconds for s in data)
+
+    def streaming(data):
+        return lambda: sum_seconds(data)
+
+    for data in (repetitive, distinct):
+        assert by_hand(data)() == streaming(data)()
+
+    print(f"Summing {args.count:,} duration strings (best of {args.repeat})")
+    for label, data in (("repetitive", repetitive), ("all distinct", distinct)):
+        hand = _common.best_of(by_hand(data), args.repeat)
+        stream = _common.best_of(streaming(data), args.repeat)
+        _common.report(f"Duration objects, {label}", hand, len(data))
+        _common.report(f"sum_seconds, {label}", stream, len(data))
+        print(f"speedup ({label}): {hand / stream:.2f}x")
+
+    # A generator input, as a file would be: nothing grows with the count.
+    tracemalloc.start()
+    sum_seconds(islice(cycle(SAMPLE_INPUTS), args.count))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"peak memory streaming {args.count:,} strings: {peak / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
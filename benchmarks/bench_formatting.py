@@ -0,0 +1,76 @@
+"""
+Benchmark: formatting calculation results.
+
+Formats N (time, days passed) results and N durations with the table-driven
+formatters and with the previous divmod/zfill/f-string code.
+
+Usage:
+    python benchmarks/bench_formatting.py [--count N] [--repeat R]
+"""
+import argparse
+import random
+
+import _common
+from timecalculator.formatting import format_duration, format_result
+
+
+def legacy_format_result(minutes_from_midnight: int, total_days_passed: int) -> str:
+    """Time.__str__ plus the CLI day suffix as they were before the tables (reference only)."""
+    hours_24 = minutes_from_midnight // 60
+    minutes = minutes_from_midnight % 60
+    period = "AM" if hours_24 < 12 else "PM"
+    display_hours_12 = hours_24 % 12
+    if display_hours_12 == 0:
+        display_hours_12 = 12
+    result_str = f"{display_hours_12}:{str(minutes).zfill(2)} {period}"
+    if total_days_passed == 1:
+        result_str += ", 1 day later"
+    elif total_days_passed > 1:
+        result_str += f", {total_days_passed} days later"
+    return result_str
+
+
+def legacy_format_duration(total_seconds: int) -> str:
+    """Duration.__str__ as it was before the tables (reference only)."""
+    if total_seconds == 0:
+        return "0:00:00"
+    calc_d = total_seconds // (24 * 60 * 60)
+    remaining_secs = total_seconds % (24 * 60 * 60)
+    calc_h = remaining_secs // (60 * 60)
+    remaining_secs %= (60 * 60)
+    calc_m = remaining_secs // 60
+    calc_s = remaining_secs % 60
+    if calc_d > 0:
+        day_str = f"{calc_d} day{'s' if calc_d > 1 else ''}, "
+    else:
+        day_str = ""
+    return f"{day_str}{calc_h}:{str(calc_m).zfill(2)}:{str(calc_s).zfill(2)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="Results formatted per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    results = [(rng.randrange(1440), rng.choice((0, 0, 0, 1, 2, 6))) for _ in range(args.count)]
+    durations = [rng.randrange(3 * 24 * 60 * 60) for _ in range(args.count)]
+
+    for (minutes, days), seconds in zip(results[:10_000], durations[:10_000]):
+        assert format_result(minutes, days) == legacy_format_result(minutes, days)
+        assert format_duration(seconds) == legacy_format_duration(seconds)
+
+    print(f"Formatting {args.count:,} results (best of {args.repeat})")
+    timings = [
+        ("legacy time result", lambda: [legacy_format_result(m, d) for m, d in results]),
+        ("table time result", lambda: [format_result(m, d) for m, d in results]),
+        ("legacy duration", lambda: [legacy_format_duration(s) for s in durations]),
+        ("table duration", lambda: [format_duration(s) for s in durations]),
+    ]
+    for label, func in timings:
+        _common.report(label, _common.best_of(func, args.repeat), args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Benchmark: load test of /api/calculate_time with mixed payloads.
+
+Drives the API with a seeded mix of realistic requests: plain calculations,
+start_date calculations (some with a timezone) and invalid inputs (bad times,
+durations and dates, missing fields, non-JSON bodies). Each response status is
+checked against the status its payload should get. Payloads are drawn from a
+pool of --distinct variants, so the response cache sees repeats as it would in
+production.
+
+Targets:
+    wsgi    the Flask app called in-process through its WSGI interface, one
+            request at a time (no server or network in the measurement)
+    socket  a server process on a local port (the Flask development server, or
+            asgi.py under uvicorn with --server asgi) with --clients concurrent
+            keep-alive clients
+
+Reports throughput, p50/p95/p99/max latency (overall and per payload kind) and
+memory growth (resident set size after the run minus after the warm-up; on
+Linux only). --output saves the results as JSON; --compare prints the change
+against a previous file, e.g. one saved on another version.
+
+Usage:
+    python benchmarks/bench_load.py [--target wsgi|socket|both] [--requests N]
+        [--mix plain=60,start_date=30,invalid=10] [--output FILE] [--compare FILE]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import _common
+from bench_asgi_concurrency import ROOT, free_port, percentile, server_command, wait_for_port
+
+KINDS = ("plain", "start_date", "invalid")
+ZONES = ("America/New_York", "Europe/Berlin", "Asia/Tokyo", "Australia/Sydney")
+
+# A request to send: payload kind, request body, expected status.
+Request = Tuple[str, bytes, int]
+
+
+def random_time(rng: random.Random) -> str:
+    return f"{rng.randint(1, 12)}:{rng.randrange(60):02d} {rng.choice(('AM', 'PM'))}"
+
+
+def random_duration(rng: random.Random) -> str:
+    hours = rng.choice((rng.randrange(24), rng.randrange(24 * 30), rng.randrange(24 * 3650)))
+    return f"{hours}:{rng.randrange(60):02d}"
+
+
+def random_date(rng: random.Random) -> str:
+    return f"{rng.randint(1990, 2040):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def invalid_body(rng: random.Random) -> bytes:
+    variants = (
+        {"initial_time": f"{rng.randint(13, 99)}:00 PM", "duration": random_duration(rng)},
+        {"initial_time": random_time(rng), "duration": f"1:{rng.randint(60, 99)}"},
+        {"initial_time": random_time(rng), "duration": random_duration(rng),
+         "start_date": f"2023-02-{rng.randint(29, 31)}"},
+        {"initial_time": random_time(rng)},
+        {"duration": random_duration(rng)},
+    )
+    choice = rng.randrange(len(variants) + 1)
+    if choice == len(variants):
+        return b'{"initial_time": '  # Not JSON
+    return json.dumps(variants[choice]).encode()
+
+
+def make_request(kind: str, rng: random.Random) -> Request:
+    if kind == "invalid":
+        return kind, invalid_body(rng), 400
+    data = {"initial_time": random_time(rng), "duration": random_duration(rng)}
+    if kind == "start_date":
+        data["start_date"] = random_date(rng)
+        if rng.random() < 0.5:
+            data["timezone"] = rng.choice(ZONES)
+    return kind, json.dumps(data).encode(), 200
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown payload kind {kind!r}, expected one of {', '.join(KINDS)}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def make_workload(mix: Dict[str, float], count: int, distinct: int, seed: int) -> List[Request]:
+    """count requests drawn from a pool of distinct payloads, in the proportions of mix."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*mix.items())
+    pool = [make_request(kind, rng) for kind in rng.choices(kinds, weights, k=distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process (this one by default), or None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def summarize(target: str, elapsed: float, samples: List[Tuple[str, int, float]],
+              rss_before: Optional[int], rss_after: Optional[int]) -> Dict[str, Any]:
+    def latency(values: List[float]) -> Dict[str, float]:
+        values = sorted(values)
+        return {"p50_ms": percentile(values, 0.50) * 1000, "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000, "max_ms": values[-1] * 1000,
+                "mean_ms": sum(values) / len(values) * 1000}
+
+    by_kind: Dict[str, List[float]] = {}
+    statuses: Dict[str, int] = {}
+    for kind, status, seconds in samples:
+        by_kind.setdefault(kind, []).append(seconds)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "target": target,
+        "requests": len(samples),
+        "seconds": elapsed,
+        "requests_per_second": len(samples) / elapsed,
+        "latency": latency([seconds for _, _, seconds in samples]),
+        "latency_by_kind": {kind: dict(latency(values), requests=len(values)) for kind, values in by_kind.items()},
+        "statuses": statuses,
+        "memory": {"rss_before_bytes": rss_before, "rss_after_bytes": rss_after,
+                   "rss_growth_bytes": None if rss_before is None or rss_after is None else rss_after - rss_before},
+    }
+
+
+def check_status(kind: str, body: bytes, status: int, expected: int) -> None:
+    if status != expected:
+        raise SystemExit(f"{kind} request {body!r} returned {status}, expected {expected}")
+
+
+def run_wsgi(workload: List[Request], warmup: List[Request]) -> Dict[str, Any]:
+    from app import app as flask_app
+
+    statuses: List[str] = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(status)
+
+    def call(body: bytes) -> int:
+        environ = {
+            "REQUEST_METHOD": "POST", "SCRIPT_NAME": "", "PATH_INFO": "/api/calculate_time", "QUERY_STRING": "",
+            "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_TYPE": "application/json", "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0), "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr, "wsgi.multithread": False, "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        response = flask_app(environ, start_response)
+        try:
+            b"".join(response)
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        return int(statuses.pop()[:3])
+
+    for kind, body, expected in warmup:
+        check_status(kind, body, call(body), expected)
+    rss_before = rss_bytes()
+    samples = []
+    started = time.perf_counter()
+    for kind, body, expected in workload:
+        request_started = time.perf_counter()
+        status = call(body)
+        samples.append((kind, status, time.perf_counter() - request_started))
+    elapsed = time.perf_counter() - started
+    for (kind, body, expected), (_, status, _) in zip(workload, samples):
+        check_status(kind, body, status, expected)
+    return summarize("wsgi", elapsed, samples, rss_before, rss_bytes())
+
+
+async def post(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, port: int, body: bytes) -> Tuple[int, bool]:
+    """Sends one keep-alive POST; returns the status and whether the server kept the connection open."""
+    writer.write(b"POST /api/calculate_time HTTP/1.1\r\n"
+                 b"Host: 127.0.0.1:%d\r\n"
+                 b"Content-Type: application/json\r\n"
+                 b"Content-Length: %d\r\n\r\n%s" % (port, len(body), body))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, _, header_block = head.partition(b"\r\n")
+    length = 0
+    keep_alive = True
+    for line in header_block.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"connection" and value.strip().lower() == b"close":
+            keep_alive = False
+    await reader.readexactly(length)
+    return int(status_line.split()[1]), keep_alive
+
+
+async def client(port: int, requests: List[Request], samples: List[Tuple[str, int, float]]) -> None:
+    connection = None
+    try:
+        for kind, body, expected in requests:
+            start = time.perf_counter()
+            # Servers without keep-alive close after each response; reconnecting is part of their latency.
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", port)
+            status, keep_alive = await post(*connection, port, body)
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+            samples.append((kind, status, time.perf_counter() - start))
+            check_status(kind, body, status, expected)
+    finally:
+        if connection is not None:
+            connection[1].close()
+
+
+async def load(port: int, clients: int, workload: List[Request]) -> Tuple[float, List[Tuple[str, int, float]]]:
+    samples: List[Tuple[str, int, float]] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, workload[i::clients], samples) for i in range(clients)))
+    return time.perf_counter() - start, samples
+
+
+def run_socket(kind: str, clients: int, workload: List[Request], warmup: List[Request]) -> Optional[Dict[str, Any]]:
+    port = free_port()
+    command = server_command(kind, port)
+    if command is None:
+        print(f"socket ({kind}): skipped (pip install uvicorn to run the ASGI app)")
+        return None
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        asyncio.run(load(port, clients, warmup))
+        rss_before = rss_bytes(server.pid)
+        elapsed, samples = asyncio.run(load(port, clients, workload))
+        rss_after = rss_bytes(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+    return summarize(f"socket ({kind}, {clients} clients)", elapsed, samples, rss_before, rss_after)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    _common.report(result["target"], result["seconds"], result["requests"])
+    for kind, latency in [("all", result["latency"])] + sorted(result["latency_by_kind"].items()):
+        print(f"  {kind:<12} p50 {latency['p50_ms']:8.3f} ms  p95 {latency['p95_ms']:8.3f} ms  "
+              f"p99 {latency['p99_ms']:8.3f} ms  max {latency['max_ms']:8.3f} ms")
+    growth = result["memory"]["rss_growth_bytes"]
+    print(f"  statuses {result['statuses']}, RSS growth "
+          + ("n/a" if growth is None else f"{growth / 1024:,.0f} KiB"))
+
+
+def print_comparison(results: List[Dict[str, Any]], previous: Dict[str, Any]) -> None:
+    print(f"\nchange against {previous.get('revision') or 'previous run'}:")
+    earlier = {result["target"]: result for result in previous["results"]}
+    for result in results:
+        before = earlier.get(result["target"])
+        if before is None:
+            continue
+        changes = [f"throughput {result['requests_per_second'] / before['requests_per_second'] * 100 - 100:+.1f}%"]
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            changes.append(f"{key[:3]} {result['latency'][key] / before['latency'][key] * 100 - 100:+.1f}%")
+        print(f"  {result['target']:<38} " + ", ".join(changes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", choices=("wsgi", "socket", "both"), default="wsgi")
+    parser.add_argument("--server", choices=("flask", "asgi"), default="flask",
+                        help="Server for the socket target.")
+    parser.add_argument("--requests", type=int, default=50_000, help="Measured requests per target.")
+    parser.add_argument("--warmup", type=int, default=2_000, help="Unmeasured requests sent first.")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent connections for the socket target.")
+    parser.add_argument("--mix", type=parse_mix, default="plain=60,start_date=30,invalid=10",
+                        help="Relative weights of the payload kinds.")
+    parser.add_argument("--distinct", type=int, default=5_000, help="Distinct payloads to draw requests from.")
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="A JSON file from an earlier run to compare against.")
+    args = parser.parse_args()
+
+    workload = make_workload(args.mix, args.requests, args.distinct, args.seed)
+    warmup = make_workload(args.mix, args.warmup, args.distinct, args.seed)
+
+    results = []
+    if args.target in ("wsgi", "both"):
+        results.append(run_wsgi(workload, warmup))
+    if args.target in ("socket", "both"):
+        result = run_socket(args.server, args.clients, workload, warmup)
+        if result is not None:
+            results.append(result)
+    for result in results:
+        print_result(result)
+
+    report = {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"requests": args.requests, "warmup": args.warmup, "clients": args.clients, "mix": args.mix,
+                   "distinct": args.distinct, "seed": args.seed, "server": args.server},
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: cost of the request metrics.
+
+Measures Metrics.observe_request on its own, the Flask metrics hooks
+(before_request timer plus after_request recording) inside a request context,
+and a full cached POST /api/calculate_time through the Flask test client for
+comparison. The hooks are timed directly because their cost is well below the
+run-to-run noise of whole requests.
+
+Usage:
+    python benchmarks/bench_metrics.py [--count N] [--repeat R]
+"""
+import argparse
+
+import _common
+import app as webapp
+from timecalculator.metrics import Metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="Recorded requests per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    registry = Metrics()
+    routes = ['/api/calculate_time', '/api/calculate_time/batch', '/', '/static/<path:filename>']
+    observe = _common.best_of(lambda: [registry.observe_request(routes[i & 3], 'POST', 200, i * 1e-7)
+                                       for i in range(args.count)], args.repeat)
+
+    flask_app = webapp.app
+    payload = {"initial_time": "3:00 PM", "duration": "1:30"}
+    with flask_app.test_request_context('/api/calculate_time', method='POST', json=payload):
+        flask_app.preprocess_request()  # Matches the URL rule, as dispatch would.
+        response = flask_app.response_class(b'{}', mimetype='application/json')
+
+        def hooks():
+            for _ in range(args.count):
+                webapp.start_request_timer()
+                webapp.record_request_metrics(response)
+
+        hooked = _common.best_of(hooks, args.repeat)
+
+    client = flask_app.test_client()
+    requests = max(args.count // 100, 1)
+    full = _common.best_of(lambda: [client.post('/api/calculate_time', json=payload) for _ in range(requests)],
+                           args.repeat)
+
+    _common.report("Metrics.observe_request", observe, args.count)
+    _common.report("Flask metrics hooks", hooked, args.count)
+    _common.report("Flask request (test client)", full, requests)
+    print(f"hooks: {hooked / args.count / (full / requests) * 100:.1f}% of a cached request")
+
+
+if __name__ == "__main__":
+    main()
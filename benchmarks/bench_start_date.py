@@ -0,0 +1,58 @@
+"""
+Benchmark: the start_date path of the web API calculation.
+
+Computes N (start date, start time, duration) results with the integer
+calendar engine (timecalculator.civil) and with the previous
+strptime/replace/timedelta/strftime code, after checking that both produce
+identical strings.
+
+Usage:
+    python benchmarks/bench_start_date.py [--count N] [--repeat R]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import _common
+from timecalculator.civil import SECONDS_PER_DAY, format_instant, parse_iso_date
+
+
+def legacy_start_end(start_date_str: str, minutes_from_midnight: int, duration_seconds: int):
+    """The datetime-based start_date path as it was before the calendar engine (reference only)."""
+    start_datetime_obj = datetime.strptime(start_date_str, '%Y-%m-%d')
+    full_start_datetime = start_datetime_obj.replace(
+        hour=minutes_from_midnight // 60, minute=minutes_from_midnight % 60, second=0, microsecond=0
+    )
+    end_datetime_obj = full_start_datetime + timedelta(seconds=duration_seconds)
+    return (full_start_datetime.strftime('%a, %Y-%m-%d %I:%M %p'),
+            end_datetime_obj.strftime('%a, %Y-%m-%d %I:%M %p'))
+
+
+def civil_start_end(start_date_str: str, minutes_from_midnight: int, duration_seconds: int):
+    start_instant = parse_iso_date(start_date_str) * SECONDS_PER_DAY + minutes_from_midnight * 60
+    return format_instant(start_instant), format_instant(start_instant + duration_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="Calculations per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    rng = random.Random(16)
+    inputs = [(f"{rng.randint(1990, 2040):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+               rng.randrange(1440), rng.randrange(10 * SECONDS_PER_DAY)) for _ in range(args.count)]
+
+    for row in inputs[:10_000]:
+        if civil_start_end(*row) != legacy_start_end(*row):
+            raise SystemExit(f"Mismatch for {row}: {civil_start_end(*row)} != {legacy_start_end(*row)}")
+
+    legacy = _common.best_of(lambda: [legacy_start_end(*row) for row in inputs], args.repeat)
+    civil = _common.best_of(lambda: [civil_start_end(*row) for row in inputs], args.repeat)
+    _common.report("datetime strptime/strftime (legacy)", legacy, args.count)
+    _common.report("civil epoch-day engine", civil, args.count)
+    print(f"speedup: {legacy / civil:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: time zone aware start_date calculations.
+
+Computes N (start date, start time, duration, zone) results with the cached
+transition tables (timecalculator.timezones) and with zoneinfo-aware datetime
+arithmetic, after checking that both produce identical strings.
+
+Usage:
+    python benchmarks/bench_timezones.py [--count N] [--repeat R]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import _common
+from timecalculator.civil import SECONDS_PER_DAY, format_instant, parse_iso_date
+from timecalculator.timezones import transition_table
+
+ZONES = ("America/New_York", "Europe/London", "Europe/Berlin", "Australia/Sydney", "America/Sao_Paulo",
+         "Asia/Tokyo", "Pacific/Auckland", "America/Los_Angeles")
+
+
+def zoneinfo_start_end(start_date_str: str, minutes_from_midnight: int, duration_seconds: int, key: str):
+    """The same calculation with aware datetimes (reference only)."""
+    zone = ZoneInfo(key)
+    start = datetime.strptime(start_date_str, '%Y-%m-%d').replace(
+        hour=minutes_from_midnight // 60, minute=minutes_from_midnight % 60, tzinfo=zone)
+    # Aware datetime arithmetic is wall-clock arithmetic; elapsed time goes through UTC.
+    start = start.astimezone(timezone.utc).astimezone(zone)
+    end = (start.astimezone(timezone.utc) + timedelta(seconds=duration_seconds)).astimezone(zone)
+    return (start.strftime('%a, %Y-%m-%d %I:%M %p %Z'), end.strftime('%a, %Y-%m-%d %I:%M %p %Z'))
+
+
+def table_start_end(start_date_str: str, minutes_from_midnight: int, duration_seconds: int, key: str):
+    zone = transition_table(key)
+    utc_start = zone.from_local(parse_iso_date(start_date_str) * SECONDS_PER_DAY + minutes_from_midnight * 60)
+    start, start_abbreviation = zone.to_local(utc_start)
+    end, end_abbreviation = zone.to_local(utc_start + duration_seconds)
+    return f"{format_instant(start)} {start_abbreviation}", f"{format_instant(end)} {end_abbreviation}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Calculations per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    inputs = [(f"{rng.randint(1990, 2040):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+               rng.randrange(1440), rng.randrange(10 * SECONDS_PER_DAY), rng.choice(ZONES))
+              for _ in range(args.count)]
+
+    for row in inputs[:10_000]:
+        if table_start_end(*row) != zoneinfo_start_end(*row):
+            raise SystemExit(f"Mismatch for {row}: {table_start_end(*row)} != {zoneinfo_start_end(*row)}")
+
+    reference = _common.best_of(lambda: [zoneinfo_start_end(*row) for row in inputs], args.repeat)
+    tables = _common.best_of(lambda: [table_start_end(*row) for row in inputs], args.repeat)
+    _common.report("zoneinfo aware datetimes (reference)", reference, args.count)
+    _common.report("cached transition tables", tables, args.count)
+    print(f"speedup: {reference / tables:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
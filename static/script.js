@@ -135,6 +135,34 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    // Builds the GET URL for a calculation in the server's canonical form (fields in a
+    // fixed order, empty ones omitted, ':' and ',' left unescaped), so it is not redirected.
+    function calculationUrl(requestData) {
+        const encode = value => encodeURIComponent(value)
+            .replace(/[!'()*]/g, c => '%' + c.charCodeAt(0).toString(16).toUpperCase())
+            .replace(/%3A/g, ':')
+            .replace(/%2C/g, ',');
+        const query = ['initial_time', 'duration', 'start_date', 'timezone']
+            .filter(field => requestData[field])
+            .map(field => `${field}=${encode(requestData[field])}`)
+            .join('&');
+        return query ? `/api/calculate_time?${query}` : '/api/calculate_time';
+    }
+
+    // Fetches the transition table of the browser's time zone (once), so the local engine
+    // also answers start_date calculations in that zone. Until it has arrived, or if the
+    // server does not know the zone, those calculations go to the server.
+    let zoneTableRequested = false;
+    function loadZoneTable() {
+        const timezone = Intl.DateTimeFormat().resolvedOptions().timeZone;
+        if (zoneTableRequested || !timezone || !window.TimeCalc) return;
+        zoneTableRequested = true;
+        fetch(`/api/timezone?key=${encodeURIComponent(timezone)}`)
+            .then(response => response.ok ? response.json() : null)
+            .then(table => { if (table) TimeCalc.addZone(table); })
+            .catch(() => { zoneTableRequested = false; }); // Retried the next time start_date is enabled
+    }
+
     function loadPresetsFromStorage() {
         const presetsJson = localStorage.getItem(PRESETS_STORAGE_KEY);
         try {
@@ -276,6 +304,7 @@ document.addEventListener('DOMContentLoaded', () => {
     use_start_date_checkbox.addEventListener('change', () => {
         if (use_start_date_checkbox.checked) {
             start_date_section_div.style.display = 'block';
+            loadZoneTable();
             if (!startDatePickerInstance) {
                 const calendarContainer = document.getElementById('inline_calendar_container');
                 const datepickerInput = start_date_input;
@@ -395,21 +424,12 @@ document.addEventListener('DOMContentLoaded', () => {
         };
         if (use_start_date_checkbox.checked && start_date_input.value) {
             requestData.start_date = start_date_input.value;
+            // The browser's IANA zone, so that durations across DST changes come out right.
+            const timezone = Intl.DateTimeFormat().resolvedOptions().timeZone;
+            if (timezone) requestData.timezone = timezone;
         }
 
-        calculateButton.disabled = true;
-        calculateButton.textContent = 'Calculating...';
-
-        fetch('/api/calculate_time', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(requestData)
-        })
-        .then(response => {
-            if (!response.ok) { return response.json().then(err => { throw new Error(err.error || `Server error: ${response.status}`); }); }
-            return response.json();
-        })
-        .then(data => {
+        function showResult(data) {
             resultArea.classList.remove('calculating-message'); // ADD THIS
             if (data.error) {
                 resultArea.textContent = `Error: ${data.error}`;
@@ -431,7 +451,27 @@ document.addEventListener('DOMContentLoaded', () => {
                 localStorage.setItem('timeCalcUseStartDate', use_start_date_checkbox.checked);
                 localStorage.setItem('timeCalcStartDate', start_date_input.value.trim());
             }
+        }
+
+        // The local engine gives the server's exact response for most requests; it returns
+        // null for the rest (e.g. a time zone whose table has not loaded yet), which go to the server.
+        const localResponse = window.TimeCalc ? TimeCalc.calculate(requestData) : null;
+        if (localResponse) {
+            showResult(localResponse.body);
+            checkFormValidityAndToggleButtonState();
+            return;
+        }
+
+        calculateButton.disabled = true;
+        calculateButton.textContent = 'Calculating...';
+
+        // GET with the canonical query string, so the browser (and any proxy) can cache the result.
+        fetch(calculationUrl(requestData))
+        .then(response => {
+            if (!response.ok) { return response.json().then(err => { throw new Error(err.error || `Server error: ${response.status}`); }); }
+            return response.json();
         })
+        .then(showResult)
         .catch(error => {
             resultArea.classList.remove('calculating-message'); // ADD THIS
             resultArea.textContent = `Error: ${error.message || 'Failed to fetch. Check network or server.'}`;
@@ -473,10 +513,9 @@ document.addEventListener('DOMContentLoaded', () => {
         checkFormValidityAndToggleButtonState();
         if(initialTimeInput) { initialTimeInput.focus(); }
     });
-});
 
-// Note: clearAllValidationVisuals function was removed as it was unused and clearInputValidationStates handles specific cases.
-// If a global clear is needed later, it can be re-evaluated.
+    // Note: clearAllValidationVisuals function was removed as it was unused and clearInputValidationStates handles specific cases.
+    // If a global clear is needed later, it can be re-evaluated.
 
     if (copyResultButton) {
         copyResultButton.addEventListener('click', () => {
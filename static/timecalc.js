@@ -0,0 +1,322 @@
+// Client-side port of the /api/calculate_time calculation.
+//
+// TimeCalc.calculate(requestData) returns {status, body} exactly as the server would
+// answer the same request (the Time + Duration arithmetic, the start_date calendar
+// mode and the 400 error messages), so the page can show results without a round
+// trip. It returns null for requests it cannot answer identically, and the caller
+// should then ask the server: a timezone other than UTC whose table has not been
+// added, non-string or unusually long fields, non-ASCII text (the server's
+// parsers accept any Unicode digit or space) and dates outside years 1 to 9999
+// (a server error).
+//
+// The tz database stays on the server. TimeCalc.addZone(table) takes a zone's
+// transition table as served by GET /api/timezone?key=... and converts wall-clock
+// times in that zone with the server's own offsets and abbreviations
+// (timecalculator/timezones.py), so its results match the server's exactly.
+//
+// tests/vectors/calculate_time.json holds request/response pairs that both the
+// Python tests and tests/js/test_timecalc.js check against, keeping the two in step.
+(function (root, factory) {
+    if (typeof module === 'object' && module.exports) {
+        module.exports = factory();
+    } else {
+        root.TimeCalc = factory();
+    }
+}(typeof self !== 'undefined' ? self : this, function () {
+    'use strict';
+
+    const SECONDS_PER_DAY = 24 * 60 * 60;
+
+    // Python's \s on ASCII text, which also includes the \x1c-\x1f separators.
+    const SPACE = '[ \\t\\n\\r\\f\\v\\x1c-\\x1f]';
+
+    // The server's patterns (timecalculator/parsing.py); its scanner fast paths accept the same strings.
+    const TIME_12HR_PATTERN = new RegExp('^(\\d{1,2}):(\\d{2})' + SPACE + '+(AM|PM)$', 'i');
+    const TIME_24HR_PATTERN = /^(\d{1,2}):(\d{2})$/;
+    const DURATION_PATTERN = new RegExp('^(?:(\\d+)' + SPACE + '+days?,' + SPACE + '+)?(\\d+):(\\d{1,2})(?::(\\d{1,2}))?$');
+    const SECONDS_ONLY_PATTERN = /^:(\d{1,2})$/;
+
+    // datetime.strptime(s, '%Y-%m-%d'), as used for start_date.
+    const DATE_PATTERN = /^(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])$/i;
+    const DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31];
+
+    // Zones the engine handles without a table: fixed UTC, abbreviated "UTC".
+    const UTC_ZONES = new Set(['UTC', 'Etc/UTC']);
+
+    // Length of the Gregorian 400-year cycle, after which rule-based offsets repeat.
+    const CYCLE_SECONDS = 146097 * SECONDS_PER_DAY;
+
+    // Longer fields are left to the server (Python's int() limits, huge values).
+    const MAX_FIELD_LENGTH = 64;
+
+    // Seconds since 1970-01-01 of 0001-01-01 00:00 and 9999-12-31 23:59:59.
+    const MIN_INSTANT = -62135596800;
+    const MAX_INSTANT = 253402300799;
+
+    const WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'];
+
+    // A rejected input; the message is the server's.
+    class InputError extends Error {}
+
+    // The server could not answer either (it would fail with a 500); leave it to the server.
+    class Unsupported extends Error {}
+
+    function pad2(n) {
+        return n < 10 ? '0' + n : String(n);
+    }
+
+    function toInteger(digits) {
+        const value = parseInt(digits, 10);
+        if (!Number.isSafeInteger(value)) throw new Unsupported();
+        return value;
+    }
+
+    function minutesFrom12hr(hours12, minutes, period) {
+        if (!(hours12 >= 1 && hours12 <= 12)) {
+            throw new InputError('Time hours must be between 1 and 12 for AM/PM format.');
+        }
+        if (!(minutes >= 0 && minutes <= 59)) throw new InputError('Time minutes must be between 00 and 59.');
+        let hours24 = hours12 % 12;
+        if (period === 'PM') hours24 += 12;
+        return hours24 * 60 + minutes;
+    }
+
+    function minutesFrom24hr(hours24, minutes) {
+        if (!(hours24 >= 0 && hours24 <= 23)) {
+            throw new InputError('Time hours must be between 0 and 23 for HH:MM format.');
+        }
+        if (!(minutes >= 0 && minutes <= 59)) throw new InputError('Time minutes must be between 00 and 59.');
+        return hours24 * 60 + minutes;
+    }
+
+    // "H:MM AM/PM" or "HH:MM" to minutes from midnight (0-1439).
+    function parseTime(text) {
+        let match = TIME_12HR_PATTERN.exec(text);
+        if (match) return minutesFrom12hr(toInteger(match[1]), toInteger(match[2]), match[3].toUpperCase());
+        match = TIME_24HR_PATTERN.exec(text);
+        if (match) return minutesFrom24hr(toInteger(match[1]), toInteger(match[2]));
+        throw new InputError('Initial time must be in H:MM AM/PM or HH:MM format.');
+    }
+
+    // "H:MM:SS", "H:MM", "D days, H:MM:SS", "D days, H:MM" or ":SS" to total seconds.
+    function parseDurationSeconds(text) {
+        let days = 0, hours = 0, minutes = 0, seconds;
+        let match = DURATION_PATTERN.exec(text);
+        if (match) {
+            if (match[1] !== undefined) days = toInteger(match[1]);
+            hours = toInteger(match[2]);
+            minutes = toInteger(match[3]);
+            seconds = match[4] !== undefined ? toInteger(match[4]) : 0;
+        } else if ((match = SECONDS_ONLY_PATTERN.exec(text))) {
+            seconds = toInteger(match[1]);
+        } else {
+            throw new InputError(`Invalid duration string format: ${text}`);
+        }
+        if (!(minutes <= 59)) throw new InputError('Minutes component must be between 0 and 59.');
+        if (!(seconds <= 59)) throw new InputError('Seconds component must be between 0 and 59.');
+        const total = days * SECONDS_PER_DAY + hours * 3600 + minutes * 60 + seconds;
+        if (!Number.isSafeInteger(total)) throw new Unsupported();
+        return total;
+    }
+
+    // Canonical 'D days, H:MM:SS' (days omitted when 0), as str(Duration).
+    function formatDuration(totalSeconds) {
+        const days = Math.floor(totalSeconds / SECONDS_PER_DAY);
+        const inDay = totalSeconds - days * SECONDS_PER_DAY;
+        const clock = `${Math.floor(inDay / 3600)}:${pad2(Math.floor(inDay / 60) % 60)}:${pad2(inDay % 60)}`;
+        if (days === 0) return clock;
+        return (days === 1 ? '1 day, ' : `${days} days, `) + clock;
+    }
+
+    // "H:MM AM/PM" for minutes from midnight.
+    function formatClock(minutesFromMidnight) {
+        const hours24 = Math.floor(minutesFromMidnight / 60);
+        return `${(hours24 + 11) % 12 + 1}:${pad2(minutesFromMidnight % 60)} ${hours24 < 12 ? 'AM' : 'PM'}`;
+    }
+
+    function relativeDaysSuffix(totalDaysPassed) {
+        if (totalDaysPassed === 1) return ' (next day)';
+        if (totalDaysPassed > 1) return ` (${totalDaysPassed} days later)`;
+        return '';
+    }
+
+    function isLeapYear(year) {
+        return year % 4 === 0 && (year % 100 !== 0 || year % 400 === 0);
+    }
+
+    // Days since 1970-01-01 of a proleptic Gregorian date (timecalculator/civil.py).
+    function daysFromCivil(year, month, day) {
+        const y = month <= 2 ? year - 1 : year;
+        const era = Math.floor(y / 400);
+        const yearOfEra = y - era * 400;
+        const dayOfYear = Math.floor((153 * (month + (month > 2 ? -3 : 9)) + 2) / 5) + day - 1;
+        const dayOfEra = yearOfEra * 365 + Math.floor(yearOfEra / 4) - Math.floor(yearOfEra / 100) + dayOfYear;
+        return era * 146097 + dayOfEra - 719468;
+    }
+
+    function civilFromDays(days) {
+        const z = days + 719468;
+        const era = Math.floor(z / 146097);
+        const dayOfEra = z - era * 146097;
+        const yearOfEra = Math.floor((dayOfEra - Math.floor(dayOfEra / 1460) + Math.floor(dayOfEra / 36524)
+                                      - Math.floor(dayOfEra / 146096)) / 365);
+        const dayOfYear = dayOfEra - (365 * yearOfEra + Math.floor(yearOfEra / 4) - Math.floor(yearOfEra / 100));
+        const mp = Math.floor((5 * dayOfYear + 2) / 153);
+        const day = dayOfYear - Math.floor((153 * mp + 2) / 5) + 1;
+        const month = mp < 10 ? mp + 3 : mp - 9;
+        return [yearOfEra + era * 400 + (month <= 2 ? 1 : 0), month, day];
+    }
+
+    // A start_date to its day number; the error is the API's own.
+    function parseIsoDate(text) {
+        const match = DATE_PATTERN.exec(text);
+        if (match) {
+            const year = toInteger(match[1]), month = toInteger(match[2]), day = toInteger(match[3].trim());
+            const daysInMonth = month === 2 && isLeapYear(year) ? 29 : DAYS_IN_MONTH[month];
+            if (year >= 1 && day <= daysInMonth) return daysFromCivil(year, month, day);
+        }
+        throw new InputError(`Invalid start_date format. Expected YYYY-MM-DD, got '${text}'`);
+    }
+
+    // '%a, %Y-%m-%d %I:%M %p' for seconds since 1970-01-01 (seconds dropped, years unpadded).
+    function formatInstant(instant) {
+        if (instant < MIN_INSTANT || instant > MAX_INSTANT) throw new Unsupported();
+        const days = Math.floor(instant / SECONDS_PER_DAY);
+        const minutes = Math.floor((instant - days * SECONDS_PER_DAY) / 60);
+        const [year, month, day] = civilFromDays(days);
+        const hours24 = Math.floor(minutes / 60);
+        return `${WEEKDAYS[((days + 3) % 7 + 7) % 7]}, ${year}-${pad2(month)}-${pad2(day)} `
+            + `${pad2((hours24 + 11) % 12 + 1)}:${pad2(minutes % 60)} ${hours24 < 12 ? 'AM' : 'PM'}`;
+    }
+
+    // Index of the first element greater than x in a sorted array (Python's bisect_right).
+    function bisectRight(values, x) {
+        let low = 0, high = values.length;
+        while (low < high) {
+            const middle = (low + high) >>> 1;
+            if (x < values[middle]) high = middle;
+            else low = middle + 1;
+        }
+        return low;
+    }
+
+    // A zone's offsets, rebuilt from its /api/timezone payload: the browser side of
+    // timecalculator.timezones.TransitionTable, with the same lookups.
+    class ZoneTable {
+        constructor(payload) {
+            this.utcStarts = [-Infinity].concat(payload.transitions);
+            this.infos = payload.type_indices.map(index => payload.types[index]);
+            this.localStarts = [-Infinity];
+            for (let i = 1; i < this.utcStarts.length; i += 1) {
+                // With fold=0, a transition happens in wall time at the later of the two readings.
+                this.localStarts.push(this.utcStarts[i] + Math.max(this.infos[i - 1][0], this.infos[i][0]));
+            }
+            this.cycleStart = payload.cycle_start;
+            this.periodicBefore = payload.periodic_before;
+        }
+
+        // Multiple of the 400-year cycle to subtract from an instant to bring it into the table.
+        cycleShift(instant) {
+            if (this.cycleStart === null) return 0;
+            const cycles = Math.floor((instant - this.cycleStart) / CYCLE_SECONDS);
+            return cycles > 0 || (cycles < 0 && this.periodicBefore) ? cycles * CYCLE_SECONDS : 0;
+        }
+
+        // A UTC instant to [local wall-clock instant, abbreviation].
+        toLocal(instant) {
+            const [offset, abbreviation] = this.infos[bisectRight(this.utcStarts, instant - this.cycleShift(instant)) - 1];
+            return [instant + offset, abbreviation];
+        }
+
+        // A local wall-clock instant to UTC; gaps and repeated times resolve as zoneinfo's fold=0.
+        fromLocal(localInstant) {
+            const shift = this.cycleShift(localInstant);
+            return localInstant - this.infos[bisectRight(this.localStarts, localInstant - shift) - 1][0];
+        }
+    }
+
+    // Added zone tables by IANA key.
+    const zones = new Map();
+
+    // Registers a zone's table, the JSON body of GET /api/timezone?key=....
+    function addZone(payload) {
+        zones.set(payload.key, new ZoneTable(payload));
+    }
+
+    function isLocalField(value) {
+        return value === undefined || value === null
+            || (typeof value === 'string' && value.length <= MAX_FIELD_LENGTH && /^[\x00-\x7f]*$/.test(value));
+    }
+
+    function compute(initialTime, duration, startDate, timezone) {
+        if (!initialTime) return {status: 400, body: {error: "Missing 'initial_time'"}};
+        if (!duration) return {status: 400, body: {error: "Missing 'duration'"}};
+
+        const minutesFromMidnight = parseTime(initialTime);
+        if (!startDate) {
+            const total = minutesFromMidnight * 60 + parseDurationSeconds(duration);
+            const daysPassed = Math.floor(total / SECONDS_PER_DAY);
+            const calculatedTime = formatClock(Math.floor((total - daysPassed * SECONDS_PER_DAY) / 60));
+            return {
+                status: 200,
+                body: {
+                    result_string: calculatedTime + relativeDaysSuffix(daysPassed),
+                    calculated_time: calculatedTime,
+                    days_numeric: daysPassed,
+                },
+            };
+        }
+
+        let startInstant;
+        try {
+            startInstant = parseIsoDate(startDate) * SECONDS_PER_DAY + minutesFromMidnight * 60;
+        } catch (e) {
+            if (e instanceof InputError) return {status: 400, body: {error: e.message}};
+            throw e;
+        }
+        const durationSeconds = parseDurationSeconds(duration);
+        const zone = timezone ? zones.get(timezone) : undefined;
+        if (zone !== undefined) {
+            // The duration is elapsed (UTC) time; both ends are read off the zone's clock.
+            const utcStart = zone.fromLocal(startInstant);
+            const [localStart, startAbbreviation] = zone.toLocal(utcStart);
+            const [localEnd, endAbbreviation] = zone.toLocal(utcStart + durationSeconds);
+            return {
+                status: 200,
+                body: {
+                    start_datetime_str: `${formatInstant(localStart)} ${startAbbreviation}`,
+                    end_datetime_str: `${formatInstant(localEnd)} ${endAbbreviation}`,
+                    duration_details_str: formatDuration(durationSeconds),
+                },
+            };
+        }
+        const suffix = timezone ? ' UTC' : '';
+        return {
+            status: 200,
+            body: {
+                start_datetime_str: formatInstant(startInstant) + suffix,
+                end_datetime_str: formatInstant(startInstant + durationSeconds) + suffix,
+                duration_details_str: formatDuration(durationSeconds),
+            },
+        };
+    }
+
+    // The server's {status, body} for a request object, or null when only the server can answer it.
+    function calculate(requestData) {
+        if (requestData === null || typeof requestData !== 'object' || Array.isArray(requestData)) return null;
+        const {initial_time: initialTime, duration, start_date: startDate, timezone} = requestData;
+        if (![initialTime, duration, startDate, timezone].every(isLocalField)) return null;
+        if (startDate && timezone && !UTC_ZONES.has(timezone) && !zones.has(timezone)) return null;
+        try {
+            return compute(initialTime, duration, startDate, startDate ? timezone : null);
+        } catch (e) {
+            if (e instanceof InputError) {
+                return {status: 400, body: {error: `Error processing time/duration: ${e.message}`}};
+            }
+            if (e instanceof Unsupported) return null;
+            throw e;
+        }
+    }
+
+    return {calculate, addZone, parseTime, parseDurationSeconds, formatDuration, formatInstant, daysFromCivil, civilFromDays};
+}));
@@ -0,0 +1,38 @@
+// Checks static/timecalc.js against the shared request/response vectors.
+// Run with `node tests/js/test_timecalc.js`; tests/test_calculation_vectors.py runs it when node is installed.
+'use strict';
+
+const assert = require('assert');
+const fs = require('fs');
+const path = require('path');
+
+const TimeCalc = require('../../static/timecalc.js');
+
+const vectors = JSON.parse(fs.readFileSync(path.join(__dirname, '..', 'vectors', 'calculate_time.json'), 'utf8'));
+// The /api/timezone tables of the zones the vectors use, as the page would fetch them.
+const zones = JSON.parse(fs.readFileSync(path.join(__dirname, '..', 'vectors', 'timezones.json'), 'utf8'));
+Object.values(zones).forEach(TimeCalc.addZone);
+
+let failures = 0;
+for (const vector of vectors) {
+    const expected = vector.local ? {status: vector.status, body: vector.body} : null;
+    try {
+        assert.deepStrictEqual(TimeCalc.calculate(vector.request), expected);
+    } catch (e) {
+        failures += 1;
+        console.error(`FAIL ${vector.note} ${JSON.stringify(vector.request)}\n${e.message}\n`);
+    }
+}
+
+// The calendar conversions agree with each other over the whole supported range.
+for (let days = TimeCalc.daysFromCivil(1, 1, 1); days <= TimeCalc.daysFromCivil(9999, 12, 31); days += 1) {
+    const [year, month, day] = TimeCalc.civilFromDays(days);
+    if (TimeCalc.daysFromCivil(year, month, day) !== days) {
+        failures += 1;
+        console.error(`FAIL calendar round trip for day ${days}: ${year}-${month}-${day}`);
+        break;
+    }
+}
+
+console.log(`${vectors.length} vectors, ${failures} failure(s)`);
+process.exitCode = failures ? 1 : 0;
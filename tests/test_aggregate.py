@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from itertools import islice, repeat
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator import aggregate
+from timecalculator.aggregate import iter_seconds, sum_duration_file, sum_durations, sum_seconds
+from timecalculator.core import Duration
+
+
+class TestSumSeconds(unittest.TestCase):
+
+    def test_sums_every_format(self):
+        strings = ["1:30", "0:00:45", "2 days, 1:00", ":15", "1:30"]
+        self.assertEqual(sum_seconds(strings), sum(Duration(s).total_seconds for s in strings))
+        self.assertEqual(list(iter_seconds(strings)), [Duration(s).total_seconds for s in strings])
+
+    def test_empty_input(self):
+        self.assertEqual(sum_seconds([]), 0)
+        self.assertEqual(sum_durations(iter([])), Duration.from_seconds(0))
+
+    def test_consumes_an_iterator_once(self):
+        strings = iter(["1:00", "2:00"])
+        self.assertEqual(sum_durations(strings), Duration("3:00"))
+        self.assertEqual(next(strings, None), None)
+
+    def test_error_names_the_item(self):
+        for function in (sum_seconds, lambda strings: list(iter_seconds(strings))):
+            with self.subTest(function=function):
+                with self.assertRaisesRegex(ValueError, r"^Invalid duration on item 3: Minutes component"):
+                    function(["1:00", "1:00", "1:60"])
+                with self.assertRaisesRegex(ValueError, "item 2: Invalid duration string format:  1:00"):
+                    function(["1:00", " 1:00"])
+
+    def test_lines_are_stripped_and_blank_lines_skipped(self):
+        lines = ["1:00\n", "\n", "  0:30:00 \r\n", "2 days, 0:00"]
+        self.assertEqual(sum_seconds(lines, lines=True), 2 * 86400 + 5400)
+        self.assertEqual(list(iter_seconds(lines, lines=True)), [3600, 1800, 2 * 86400])
+        with self.assertRaisesRegex(ValueError, "^Invalid duration on line 3: "):
+            sum_seconds(["1:00\n", "\n", "bogus\n"], lines=True)
+
+    def test_memo_is_bounded(self):
+        with mock.patch.object(aggregate, 'MEMO_SIZE', 2):
+            strings = [f"{hours}:00" for hours in range(10)] * 3
+            self.assertEqual(sum_seconds(strings), 3 * 45 * 3600)
+            self.assertEqual(sum(iter_seconds(strings)), 3 * 45 * 3600)
+
+    def test_constant_memory(self):
+        strings = islice(repeat("1 day, 1:01:01"), 200_000)
+        tracemalloc.start()
+        try:
+            total = sum_seconds(strings)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(total, 200_000 * 90061)
+        self.assertLess(peak, 64 * 1024)
+
+
+class TestSumDurationFile(unittest.TestCase):
+
+    def test_path_and_file_object(self):
+        content = "8:00\n7:30:15\n\n1 day, 0:00\n"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'timesheet.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            self.assertEqual(sum_duration_file(path), Duration("1 day, 15:30:15"))
+        self.assertEqual(sum_duration_file(io.StringIO(content)), Duration("39:30:15"))
+
+    def test_error_names_the_line(self):
+        with self.assertRaisesRegex(ValueError, "^Invalid duration on line 4: "):
+            sum_duration_file(io.StringIO("1:00\n\n2:00\n3:75\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
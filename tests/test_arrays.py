@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+from array import array
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.arrays import TimeArray, DurationArray
+from timecalculator.batch import format_results
+from timecalculator.calculator import add_time
+from timecalculator.core import Time, Duration
+
+class TestTimeArray(unittest.TestCase):
+    def test_from_strings_and_element_access(self):
+        times = TimeArray.from_strings(["3:00 PM", "00:30", "11:59 PM"])
+        self.assertEqual(len(times), 3)
+        self.assertEqual(times.tolist(), [900, 30, 1439])
+        self.assertIs(times[0], Time("3:00 PM"))
+        self.assertIs(times[-1], Time("11:59 PM"))
+        self.assertEqual(times.strings(), ["3:00 PM", "12:30 AM", "11:59 PM"])
+        self.assertEqual(list(times), [Time("15:00"), Time("0:30"), Time("23:59")])
+
+    def test_slices_share_the_buffer(self):
+        times = TimeArray(range(0, 1440, 60))
+        tail = times[20:]
+        every_other = times[::2]
+        self.assertIsInstance(tail, TimeArray)
+        self.assertIs(tail.buffer.obj, times.buffer.obj)
+        self.assertIs(every_other.buffer.obj, times.buffer.obj)
+        self.assertEqual(tail.tolist(), [1200, 1260, 1320, 1380])
+        self.assertEqual(len(every_other), 12)
+
+    def test_buffer_is_read_only(self):
+        times = TimeArray([1, 2])
+        self.assertTrue(times.buffer.readonly)
+        self.assertEqual(times.buffer.format, 'q')
+
+    def test_out_of_range(self):
+        with self.assertRaisesRegex(ValueError, "between 0 and 1439"):
+            TimeArray([0, 1440])
+
+    def test_invalid_string_reports_row(self):
+        with self.assertRaisesRegex(ValueError, "Row 1: Initial time must be in H:MM AM/PM or HH:MM format."):
+            TimeArray.from_strings(["1:00 PM", "bad"])
+
+
+class TestDurationArray(unittest.TestCase):
+    def test_from_strings_and_element_access(self):
+        durations = DurationArray.from_strings(["1:30", "1 day, 0:00:05", ":07"])
+        self.assertEqual(durations.tolist(), [5400, 86405, 7])
+        self.assertEqual(durations[1], Duration("24:00:05"))
+        self.assertEqual(durations.strings(), ["1:30:00", "1 day, 0:00:05", "0:00:07"])
+        self.assertEqual(durations.total_seconds(), 5400 + 86405 + 7)
+
+    def test_negative_rejected(self):
+        with self.assertRaisesRegex(ValueError, "must be non-negative"):
+            DurationArray([-1])
+
+
+class TestArrayAddition(unittest.TestCase):
+    def test_bulk_add_matches_add_time(self):
+        initial_times = ["3:30 PM", "11:00 PM", "5:00 PM", "11:59 PM"]
+        durations = ["2:12", "2:30", "150:35", "0:01:00"]
+        end_times, days_passed = TimeArray.from_strings(initial_times) + DurationArray.from_strings(durations)
+        self.assertIsInstance(end_times, TimeArray)
+        self.assertIsInstance(days_passed, array)
+        self.assertEqual(format_results(end_times.tolist(), days_passed),
+                         [add_time(t, d) for t, d in zip(initial_times, durations)])
+        self.assertEqual(end_times.strings(), ["5:42 PM", "1:30 AM", "11:35 PM", "12:00 AM"])
+        self.assertEqual(days_passed.tolist(), [0, 1, 6, 1])
+
+    def test_add_strided_slices(self):
+        times = TimeArray([60, 0, 120, 0])
+        durations = DurationArray([60, 0, 86400, 0])
+        end_times, days_passed = times[::2] + durations[::2]
+        self.assertEqual((end_times.tolist(), days_passed.tolist()), ([61, 120], [0, 1]))
+
+    def test_add_non_duration_array(self):
+        with self.assertRaises(TypeError):
+            TimeArray([0]) + [60]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app as flask_app
+from asgi import CalculatorASGI, app
+from timecalculator.service import SECURITY_HEADERS
+
+
+def call_asgi(asgi_app, method, path, body=b'', content_type='application/json',
+              query_string=b'', extra_headers=()):
+    """Runs one HTTP request through an ASGI app; returns (status, headers dict, body)."""
+    headers = [(b'content-type', content_type.encode())] if content_type else []
+    headers.extend(extra_headers)
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': headers,
+             'query_string': query_string}
+    messages = [{'type': 'http.request', 'body': body[:5], 'more_body': True},
+                {'type': 'http.request', 'body': body[5:], 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start, body_message = sent
+    response_headers = {name.decode(): value.decode() for name, value in start['headers']}
+    return start['status'], response_headers, body_message['body']
+
+
+class TestASGIMatchesFlask(unittest.TestCase):
+    """The ASGI app must answer exactly like the Flask app."""
+
+    def setUp(self):
+        flask_app.testing = True
+        self.client = flask_app.test_client()
+
+    def assertSameResponse(self, path, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        expected = self.client.post(path, data=body, content_type=content_type)
+        status, headers, data = call_asgi(app, 'POST', path, body, content_type)
+        self.assertEqual(status, expected.status_code)
+        self.assertEqual(data, expected.data)
+        self.assertEqual(headers['content-type'], expected.headers['Content-Type'])
+
+    def test_calculate_time(self):
+        payloads = [
+            {"initial_time": "2:00 PM", "duration": "1:30"},
+            {"initial_time": "11:59 PM", "duration": "49:01:00"},
+            {"initial_time": "10:00 AM", "duration": "5:00:00", "start_date": "2023-10-26"},
+            {"initial_time": "10:00 AM", "duration": "5:00", "start_date": "2023/10/26"},
+            {"initial_time": "1:30 AM", "duration": "2:00", "start_date": "2024-03-10", "timezone": "America/New_York"},
+            {"initial_time": "1:30 AM", "duration": "2:00", "start_date": "2024-03-10", "timezone": "Nowhere"},
+            {"initial_time": "13:00 PM", "duration": "1:00"},
+            {"initial_time": "1:00 PM", "duration": "1:60"},
+            {"duration": "1:00"},
+            {"initial_time": "1:00 PM"},
+            {},
+            None,
+            [1],
+            "text",
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertSameResponse('/api/calculate_time', payload)
+
+    def test_invalid_json_and_content_type(self):
+        self.assertSameResponse('/api/calculate_time', b'{not json')
+        self.assertSameResponse('/api/calculate_time', b'\xff\xfe')
+        self.assertSameResponse('/api/calculate_time',
+                                json.dumps({"initial_time": "1:00 PM", "duration": "1:00"}).encode(),
+                                content_type='text/plain')
+        self.assertSameResponse('/api/calculate_time',
+                                json.dumps({"initial_time": "1:00 PM", "duration": "1:00"}).encode(),
+                                content_type='application/json; charset=utf-8')
+
+    def test_batch(self):
+        self.assertSameResponse('/api/calculate_time/batch',
+                                [{"initial_time": "1:00 PM", "duration": "1:00"}, {}, 5])
+        self.assertSameResponse('/api/calculate_time/batch', {"initial_time": "1:00 PM"})
+
+    def test_get(self):
+        queries = [
+            'initial_time=3:00%20PM&duration=1:30',
+            'initial_time=10:00%20AM&duration=5:00:00&start_date=2023-10-26',
+            'initial_time=3:00%20PM&duration=bad',
+            'duration=1:30&initial_time=3:00+PM&extra=1',
+            'initial_time=caf%C3%A9&duration=1:30',
+            '',
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                expected = self.client.get(f'/api/calculate_time?{query}')
+                status, headers, data = call_asgi(app, 'GET', '/api/calculate_time',
+                                                  query_string=query.encode())
+                self.assertEqual(status, expected.status_code)
+                self.assertEqual(data, expected.data)
+                for name in ('ETag', 'Cache-Control', 'Location'):
+                    self.assertEqual(headers.get(name.lower()), expected.headers.get(name))
+
+    def test_get_not_modified(self):
+        query = b'initial_time=3:00%20PM&duration=1:30'
+        _, headers, _ = call_asgi(app, 'GET', '/api/calculate_time', query_string=query)
+        status, not_modified_headers, data = call_asgi(
+            app, 'GET', '/api/calculate_time', query_string=query,
+            extra_headers=[(b'if-none-match', headers['etag'].encode())])
+        self.assertEqual((status, data), (304, b''))
+        self.assertEqual(not_modified_headers['etag'], headers['etag'])
+        self.assertNotIn('content-length', not_modified_headers)
+
+    def test_timezone(self):
+        for query in ('key=Europe/Berlin', 'key=Mars/Olympus', 'key=', ''):
+            with self.subTest(query=query):
+                expected = self.client.get(f'/api/timezone?{query}')
+                status, headers, data = call_asgi(app, 'GET', '/api/timezone', query_string=query.encode())
+                self.assertEqual((status, data), (expected.status_code, expected.data))
+                for name in ('ETag', 'Cache-Control'):
+                    self.assertEqual(headers.get(name.lower()), expected.headers.get(name))
+
+    def test_batch_too_large(self):
+        small = CalculatorASGI(max_batch_size=1)
+        status, _, data = call_asgi(small, 'POST', '/api/calculate_time/batch', b'[{}, {}]')
+        self.assertEqual(status, 413)
+        self.assertEqual(json.loads(data), {"error": "Batch too large: 2 items (maximum 1)"})
+
+    def test_index(self):
+        status, headers, data = call_asgi(app, 'GET', '/')
+        self.assertEqual(status, 200)
+        self.assertEqual(data, self.client.get('/').data)
+        self.assertEqual(headers['content-type'], 'text/html; charset=utf-8')
+
+    def test_cache_stats(self):
+        status, _, data = call_asgi(app, 'GET', '/api/cache_stats')
+        self.assertEqual(status, 200)
+        self.assertEqual(set(json.loads(data)["parse_cache"]), {"time", "duration"})
+
+
+class TestASGIRouting(unittest.TestCase):
+
+    def test_security_headers_on_every_response(self):
+        for method, path in (('GET', '/'), ('POST', '/api/calculate_time'), ('GET', '/missing'),
+                             ('GET', '/api/calculate_time/batch'), ('GET', '/static/style.css')):
+            with self.subTest(method=method, path=path):
+                _, headers, _ = call_asgi(app, method, path)
+                for name, value in SECURITY_HEADERS.items():
+                    self.assertEqual(headers[name.lower()], value)
+
+    def test_static_file(self):
+        status, headers, data = call_asgi(app, 'GET', '/static/script.js')
+        self.assertEqual(status, 200)
+        with open(os.path.join(os.path.dirname(__file__), '..', 'static', 'script.js'), 'rb') as f:
+            self.assertEqual(data, f.read())
+        self.assertTrue(headers['content-type'].startswith('text/javascript'))
+
+    def test_static_path_traversal(self):
+        for path in ('/static/../app.py', '/static/missing.js', '/static/'):
+            with self.subTest(path=path):
+                status, _, _ = call_asgi(app, 'GET', path)
+                self.assertEqual(status, 404)
+
+    def test_head_has_no_body(self):
+        status, headers, data = call_asgi(app, 'HEAD', '/')
+        self.assertEqual(status, 200)
+        self.assertEqual(data, b'')
+        self.assertGreater(int(headers['content-length']), 0)
+
+    def test_method_not_allowed(self):
+        status, headers, _ = call_asgi(app, 'GET', '/api/calculate_time/batch')
+        self.assertEqual(status, 405)
+        self.assertEqual(headers['allow'], 'POST')
+        status, headers, _ = call_asgi(app, 'PUT', '/api/calculate_time')
+        self.assertEqual(status, 405)
+        self.assertEqual(headers['allow'], 'GET, HEAD, POST')
+
+    def test_lifespan(self):
+        events = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return events.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(app({'type': 'lifespan'}, receive, send))
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+
+
+if __name__ == '__main__':
+    unittest.main()
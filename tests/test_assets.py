@@ -0,0 +1,161 @@
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as webapp
+from asgi import CalculatorASGI
+from tests.test_asgi import call_asgi
+from timecalculator.assets import (
+    BUILD_DIRNAME, IMMUTABLE_CACHE_CONTROL, AssetManifest, accepts_gzip, build, fingerprinted_name,
+)
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), '..', 'static')
+
+
+class AssetTestCase(unittest.TestCase):
+    """Works on a copy of static/ in a temporary directory."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.static_dir = os.path.join(directory.name, 'static')
+        shutil.copytree(STATIC_DIR, self.static_dir, ignore=shutil.ignore_patterns(BUILD_DIRNAME))
+
+    def read(self, *parts):
+        with open(os.path.join(self.static_dir, *parts), 'rb') as f:
+            return f.read()
+
+    def write(self, filename, content):
+        with open(os.path.join(self.static_dir, filename), 'wb') as f:
+            f.write(content)
+
+
+class TestBuild(AssetTestCase):
+
+    def test_fingerprinted_copies(self):
+        built = build(self.static_dir)
+        self.assertEqual(set(built), {'script.js', 'style.css', 'timecalc.js'})
+        for filename, built_name in built.items():
+            content = self.read(filename)
+            self.assertEqual(built_name, fingerprinted_name(filename, content))
+            self.assertRegex(built_name, r'^[a-z]+\.[0-9a-f]{12}\.(js|css)$')
+            self.assertEqual(self.read(BUILD_DIRNAME, built_name), content)
+            self.assertEqual(gzip.decompress(self.read(BUILD_DIRNAME, built_name + '.gz')), content)
+
+    def test_rebuild_is_reproducible_and_drops_stale_files(self):
+        first = build(self.static_dir)
+        compressed = self.read(BUILD_DIRNAME, first['style.css'] + '.gz')
+        self.write('script.js', b'console.log("changed");\n' * 50)
+        second = build(self.static_dir)
+        self.assertEqual(self.read(BUILD_DIRNAME, second['style.css'] + '.gz'), compressed)
+        self.assertNotEqual(first['script.js'], second['script.js'])
+        files = set(os.listdir(os.path.join(self.static_dir, BUILD_DIRNAME)))
+        self.assertNotIn(first['script.js'], files)
+        self.assertNotIn(first['script.js'] + '.gz', files)
+
+    def test_incompressible_file_has_no_gzip_copy(self):
+        self.write('tiny.js', b'1')
+        built = build(self.static_dir)
+        files = os.listdir(os.path.join(self.static_dir, BUILD_DIRNAME))
+        self.assertIn(built['tiny.js'], files)
+        self.assertNotIn(built['tiny.js'] + '.gz', files)
+        response = AssetManifest(self.static_dir).response(built['tiny.js'], 'gzip')
+        self.assertEqual((response.body, response.headers.get('Content-Encoding')), (b'1', None))
+
+
+class TestAssetManifest(AssetTestCase):
+
+    def test_urls(self):
+        self.assertEqual(AssetManifest(self.static_dir).url('script.js'), '/static/script.js')
+        built = build(self.static_dir)
+        manifest = AssetManifest(self.static_dir)
+        self.assertEqual(len(manifest), 3)
+        self.assertEqual(manifest.url('script.js'), f"/static/build/{built['script.js']}")
+        self.assertEqual(manifest.url('favicon.ico'), '/static/favicon.ico')
+
+    def test_changed_source_falls_back_to_plain_url(self):
+        built = build(self.static_dir)
+        self.write('style.css', self.read('style.css') + b'\n/* edited */\n')
+        with self.assertLogs('timecalculator.assets', 'WARNING') as logs:
+            manifest = AssetManifest(self.static_dir)
+        self.assertIn('style.css', logs.output[0])
+        self.assertEqual(manifest.url('style.css'), '/static/style.css')
+        self.assertNotIn(built['style.css'], manifest)
+        self.assertEqual(manifest.url('script.js'), f"/static/build/{built['script.js']}")
+
+    def test_response_encoding(self):
+        built = build(self.static_dir)['timecalc.js']
+        manifest = AssetManifest(self.static_dir)
+        plain = manifest.response(built, None)
+        self.assertEqual(plain.body, self.read('timecalc.js'))
+        self.assertEqual(plain.headers, {'Content-Type': 'text/javascript; charset=utf-8',
+                                         'Cache-Control': IMMUTABLE_CACHE_CONTROL, 'Vary': 'Accept-Encoding'})
+        compressed = manifest.response(built, 'gzip, deflate, br')
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.body), plain.body)
+        self.assertIsNone(manifest.response('timecalc.000000000000.js', 'gzip'))
+        self.assertIsNone(manifest.response('manifest.json', 'gzip'))
+
+    def test_accepts_gzip(self):
+        for header, expected in [(None, False), ('', False), ('gzip', True), ('deflate, gzip;q=0.5', True),
+                                 ('GZIP', True), ('x-gzip', True), ('br', False), ('*', True),
+                                 ('gzip;q=0', False), ('*;q=0.1, gzip;q=0', False), ('identity, *;q=0', False),
+                                 ('gzip;q=bogus', False)]:
+            with self.subTest(header=header):
+                self.assertEqual(accepts_gzip(header), expected)
+
+
+class TestServingBuiltAssets(AssetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.built = build(self.static_dir)
+        self.manifest = AssetManifest(self.static_dir)
+        patcher = mock.patch.object(webapp, 'assets', self.manifest)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        webapp.app.testing = True
+        self.client = webapp.app.test_client()
+        self.asgi_app = CalculatorASGI(assets=self.manifest)
+
+    def test_index_links_fingerprinted_urls(self):
+        flask_page = self.client.get('/').data.decode()
+        _, _, asgi_page = call_asgi(self.asgi_app, 'GET', '/')
+        for filename, built_name in self.built.items():
+            with self.subTest(filename=filename):
+                self.assertIn(f'"/static/build/{built_name}"', flask_page)
+                self.assertIn(f'"/static/build/{built_name}"', asgi_page.decode())
+
+    def test_flask_and_asgi_send_the_same_response(self):
+        url = f"/static/build/{self.built['script.js']}"
+        for accept_encoding in ('gzip, br', 'identity'):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(url, headers={'Accept-Encoding': accept_encoding})
+                status, headers, body = call_asgi(self.asgi_app, 'GET', url,
+                                                  extra_headers=[(b'accept-encoding', accept_encoding.encode())])
+                self.assertEqual((status, body), (response.status_code, response.data))
+                for name in ('Content-Type', 'Cache-Control', 'Vary', 'Content-Encoding', 'X-Content-Type-Options'):
+                    self.assertEqual(headers.get(name.lower()), response.headers.get(name))
+                self.assertEqual(response.headers['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+                self.assertEqual(response.headers.get('Content-Encoding') == 'gzip', accept_encoding != 'identity')
+
+    def test_unknown_built_asset_is_not_found(self):
+        for path in ('/static/build/script.000000000000.js', '/static/build/manifest.json', '/static/build/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+                self.assertEqual(call_asgi(self.asgi_app, 'GET', path)[0], 404)
+
+    def test_plain_static_urls_still_work(self):
+        status, headers, _ = call_asgi(self.asgi_app, 'GET', '/static/style.css')
+        self.assertEqual((status, headers['cache-control']), (200, 'no-cache'))
+        self.assertEqual(self.client.get('/static/style.css').status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
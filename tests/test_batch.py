@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator import batch
+from timecalculator.calculator import add_time
+
+TIMES = ["3:30 PM", "11:00 PM", "5:00 PM", "11:59 PM", "00:30", "3:30 PM"]
+DURATIONS = ["2:12", "2:30", "150:35", "0:01:00", "2 days, 1:00:59", ":30"]
+
+class BatchPathsMixin:
+    """Runs the same checks against the NumPy and pure-Python paths."""
+    use_numpy = None
+
+    def test_matches_add_time(self):
+        end_minutes, days_passed = batch.add_time_batch(TIMES, DURATIONS, use_numpy=self.use_numpy)
+        self.assertEqual(batch.format_results(end_minutes, days_passed),
+                         [add_time(t, d) for t, d in zip(TIMES, DURATIONS)])
+
+    def test_days_offset(self):
+        end_minutes, days_passed = batch.add_durations([1320], [4 * 3600], days_offset=[1], use_numpy=self.use_numpy)
+        self.assertEqual((list(end_minutes), list(days_passed)), ([120], [2]))
+        end_minutes, days_passed = batch.add_durations([60, 60], [0, 0], days_offset=3, use_numpy=self.use_numpy)
+        self.assertEqual(list(days_passed), [3, 3])
+
+    def test_days_offset_length_must_match(self):
+        with self.assertRaisesRegex(ValueError, "days_offset must be a scalar or have the same length"):
+            batch.add_durations([0, 1, 2], [60, 60, 60], [1], use_numpy=self.use_numpy)
+
+    @unittest.skipIf(batch.np is None, "NumPy is not installed")
+    def test_numpy_scalar_days_offset(self):
+        _, days_passed = batch.add_durations([0, 1], [60, 60], days_offset=batch.np.int64(2), use_numpy=self.use_numpy)
+        self.assertEqual(list(days_passed), [2, 2])
+
+    def test_parse_columns(self):
+        self.assertEqual(list(batch.parse_times(["12:00 AM", "13:05"], use_numpy=self.use_numpy)), [0, 785])
+        self.assertEqual(list(batch.parse_durations(["1 day, 0:00:01", ":05"], use_numpy=self.use_numpy)), [86401, 5])
+
+    def test_iterator_columns(self):
+        self.assertEqual(list(batch.parse_durations(iter(DURATIONS), use_numpy=self.use_numpy)),
+                         list(batch.parse_durations(DURATIONS, use_numpy=self.use_numpy)))
+
+    def test_memo_is_bounded(self):
+        strings = [f"{hours}:00" for hours in range(10)] * 3
+        with mock.patch.object(batch, 'MEMO_SIZE', 2):
+            self.assertEqual(list(batch.parse_durations(strings, use_numpy=self.use_numpy)),
+                             [hours * 3600 for hours in range(10)] * 3)
+
+    def test_invalid_string_reports_row(self):
+        with self.assertRaisesRegex(ValueError, "Row 1: Invalid duration string format: 1-00"):
+            batch.parse_durations(["1:00", "1-00"], use_numpy=self.use_numpy)
+        with self.assertRaisesRegex(ValueError, "Row 0: Time hours must be between 0 and 23 for HH:MM format."):
+            batch.parse_times(["24:00"], use_numpy=self.use_numpy)
+
+    def test_start_minutes_out_of_range(self):
+        with self.assertRaisesRegex(ValueError, "Start minutes must be between 0 and 1439."):
+            batch.add_durations([1440], [0], use_numpy=self.use_numpy)
+
+    def test_length_mismatch(self):
+        with self.assertRaisesRegex(ValueError, "same length"):
+            batch.add_durations([0, 1], [0], use_numpy=self.use_numpy)
+
+    def test_empty_input(self):
+        end_minutes, days_passed = batch.add_time_batch([], [], use_numpy=self.use_numpy)
+        self.assertEqual((len(end_minutes), len(days_passed)), (0, 0))
+
+
+class TestBatchPurePython(BatchPathsMixin, unittest.TestCase):
+    use_numpy = False
+
+    def test_returns_lists(self):
+        end_minutes, days_passed = batch.add_durations([0], [60], use_numpy=False)
+        self.assertEqual((end_minutes, days_passed), ([1], [0]))
+
+
+@unittest.skipIf(batch.np is None, "NumPy is not installed")
+class TestBatchNumPy(BatchPathsMixin, unittest.TestCase):
+    use_numpy = True
+
+    def test_returns_int64_arrays(self):
+        end_minutes, days_passed = batch.add_durations([0], [60], use_numpy=True)
+        self.assertEqual((end_minutes.dtype, days_passed.dtype), (batch.np.int64, batch.np.int64))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+BENCH_CORE = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'bench_core.py')
+
+
+class TestCoreBenchmarkBaselines(unittest.TestCase):
+    """The baseline and regression check of benchmarks/bench_core.py, with tiny runs."""
+
+    def run_bench(self, *args):
+        command = [sys.executable, BENCH_CORE, '--count', '50', '--repeat', '1'] + list(args)
+        return subprocess.run(command, capture_output=True, text=True)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.baseline = os.path.join(self.directory.name, 'core.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save(self):
+        result = self.run_bench('--baseline', self.baseline, '--save')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        with open(self.baseline) as f:
+            return json.load(f)
+
+    def test_save_records_every_case(self):
+        baseline = self.save()
+        self.assertIn('Duration.__init__/representative', baseline['results'])
+        self.assertIn('add_time/invalid', baseline['results'])
+        self.assertGreater(baseline['calibration_ns'], 0)
+        for result in baseline['results'].values():
+            self.assertGreater(result['ns_per_op'], 0)
+            self.assertGreater(result['relative'], 0)
+
+    def test_check_fails_on_regression(self):
+        baseline = self.save()
+        # Pretend the recorded run was a hundred times faster.
+        for result in baseline['results'].values():
+            result['relative'] /= 100
+        with open(self.baseline, 'w') as f:
+            json.dump(baseline, f)
+        result = self.run_bench('--baseline', self.baseline, '--check', '--only', 'Time.__str__')
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('Time.__str__/all minutes', result.stderr)
+
+    def test_check_passes_within_threshold(self):
+        baseline = self.save()
+        baseline['thresholds'] = {'Time.__str__/all minutes': 1000.0}
+        for result in baseline['results'].values():
+            result['relative'] /= 100
+        with open(self.baseline, 'w') as f:
+            json.dump(baseline, f)
+        result = self.run_bench('--baseline', self.baseline, '--check', '--only', 'Time.__str__')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        # --save keeps the per-case thresholds.
+        self.assertEqual(self.save()['thresholds'], {'Time.__str__/all minutes': 1000.0})
+
+    def test_check_without_baseline(self):
+        result = self.run_bench('--baseline', self.baseline, '--check')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('--save', result.stderr)
+
+    @unittest.skipUnless(os.environ.get('TIMECALC_BENCH_CHECK'),
+                         'set TIMECALC_BENCH_CHECK=1 to check the stored baseline (takes a while)')
+    def test_stored_baseline(self):
+        result = subprocess.run([sys.executable, BENCH_CORE, '--check'], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.cache import LRUCache, ParseCache
+from timecalculator.core import Time, Duration
+
+class TestLRUCache(unittest.TestCase):
+    def test_hits_misses_and_evictions(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "a" is now most recently used
+        cache.put("c", 3)                    # evicts "b"
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size, stats.maxsize), (2, 1, 1, 2, 2))
+        self.assertAlmostEqual(stats.hit_ratio, 2 / 3)
+
+    def test_zero_size_stores_nothing(self):
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_resize_evicts(self):
+        cache = LRUCache(maxsize=3)
+        for key in "abc":
+            cache.put(key, key)
+        cache.resize(1)
+        self.assertEqual(cache.stats().evictions, 2)
+        self.assertEqual(cache.get("c"), "c")
+
+    def test_clear_resets_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        self.assertEqual(cache.stats(), (0, 0, 0, 0, 2))
+
+    def test_negative_size_rejected(self):
+        with self.assertRaisesRegex(ValueError, "must be non-negative"):
+            LRUCache(maxsize=-1)
+
+
+class TestParseCache(unittest.TestCase):
+    def test_returns_cached_object(self):
+        cache = ParseCache(Duration, maxsize=8)
+        first = cache.parse("1:30")
+        self.assertIs(cache.parse("1:30"), first)
+        self.assertEqual((cache.stats().hits, cache.stats().misses), (1, 1))
+
+    def test_caches_invalid_input(self):
+        calls = []
+
+        def parser(raw):
+            calls.append(raw)
+            return Time(raw)
+
+        cache = ParseCache(parser, maxsize=8)
+        for _ in range(3):
+            with self.assertRaisesRegex(ValueError, "Initial time must be in H:MM AM/PM or HH:MM format."):
+                cache.parse("bad")
+        self.assertEqual(calls, ["bad"])
+
+    def test_disabled_cache_passes_through(self):
+        cache = ParseCache(Time, maxsize=0)
+        self.assertIs(cache.parse("3:00 PM"), Time("15:00"))
+        self.assertEqual(cache.stats(), (0, 0, 0, 0, 0))
+
+    def test_non_string_input_bypasses_cache(self):
+        cache = ParseCache(Duration, maxsize=8)
+        with self.assertRaises(TypeError):
+            cache.parse(["1:00"])
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app as flask_app
+from asgi import app as asgi_app
+from tests.test_asgi import call_asgi
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(TESTS_DIR, 'vectors', 'calculate_time.json')) as f:
+    VECTORS = json.load(f)
+
+with open(os.path.join(TESTS_DIR, 'vectors', 'timezones.json')) as f:
+    ZONE_TABLES = json.load(f)
+
+
+class TestCalculationVectors(unittest.TestCase):
+    """
+    tests/vectors/calculate_time.json pins the API's response to each request.
+    The JavaScript engine (static/timecalc.js) is checked against the same file,
+    with the zone tables of tests/vectors/timezones.json added, so the page's
+    local results and the server's stay identical.
+    """
+
+    def test_flask_app(self):
+        flask_app.testing = True
+        client = flask_app.test_client()
+        for vector in VECTORS:
+            with self.subTest(note=vector['note'], request=vector['request']):
+                response = client.post('/api/calculate_time', json=vector['request'])
+                self.assertEqual((response.status_code, response.get_json()), (vector['status'], vector['body']))
+
+    def test_asgi_app(self):
+        for vector in VECTORS:
+            with self.subTest(note=vector['note'], request=vector['request']):
+                status, _, data = call_asgi(asgi_app, 'POST', '/api/calculate_time',
+                                            json.dumps(vector['request']).encode())
+                self.assertEqual((status, json.loads(data)), (vector['status'], vector['body']))
+
+    def test_zone_tables(self):
+        # The JavaScript engine is checked with these tables; they must be what the server serves.
+        flask_app.testing = True
+        client = flask_app.test_client()
+        for key, table in ZONE_TABLES.items():
+            with self.subTest(key=key):
+                response = client.get('/api/timezone', query_string={'key': key})
+                self.assertEqual((response.status_code, response.get_json()), (200, table))
+                status, _, data = call_asgi(asgi_app, 'GET', '/api/timezone', query_string=f'key={key}'.encode())
+                self.assertEqual((status, json.loads(data)), (200, table))
+
+    def test_vectors_cover_both_engines(self):
+        self.assertTrue(any(vector['local'] for vector in VECTORS))
+        self.assertTrue(any(not vector['local'] for vector in VECTORS))
+
+    @unittest.skipUnless(shutil.which('node'), 'node is not installed')
+    def test_javascript_engine(self):
+        result = subprocess.run(['node', os.path.join(TESTS_DIR, 'js', 'test_timecalc.js')],
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+    def test_index_loads_the_engine_before_the_page_script(self):
+        flask_app.testing = True
+        page = flask_app.test_client().get('/').data.decode()
+        self.assertLess(page.index('/static/timecalc.js'), page.index('/static/script.js'))
+
+
+if __name__ == '__main__':
+    unittest.main()
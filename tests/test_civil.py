@@ -0,0 +1,111 @@
+import unittest
+import random
+import sys
+import os
+from datetime import date, datetime, timedelta
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.civil import (
+    MAX_INSTANT, MIN_INSTANT, SECONDS_PER_DAY, civil_from_days, days_from_civil, format_instant, parse_iso_date,
+)
+from timecalculator.service import calculate
+
+EPOCH = date(1970, 1, 1)
+STRFTIME_FORMAT = '%a, %Y-%m-%d %I:%M %p'
+
+
+class TestDayNumbers(unittest.TestCase):
+    def test_known_dates(self):
+        self.assertEqual(days_from_civil(1970, 1, 1), 0)
+        self.assertEqual(days_from_civil(1969, 12, 31), -1)
+        self.assertEqual(days_from_civil(2000, 3, 1), 11017)
+        self.assertEqual(civil_from_days(0), (1970, 1, 1))
+        self.assertEqual(civil_from_days(11016), (2000, 2, 29))
+
+    def test_round_trip_against_datetime(self):
+        rng = random.Random(1)
+        samples = [date(1, 1, 1), date(9999, 12, 31), date(1900, 2, 28), date(2000, 2, 29), date(2100, 3, 1)]
+        samples += [date.fromordinal(rng.randint(1, date.max.toordinal())) for _ in range(2000)]
+        for d in samples:
+            with self.subTest(date=d):
+                days = (d - EPOCH).days
+                self.assertEqual(days_from_civil(d.year, d.month, d.day), days)
+                self.assertEqual(civil_from_days(days), (d.year, d.month, d.day))
+
+
+class TestParseIsoDate(unittest.TestCase):
+    def test_strict_dates(self):
+        self.assertEqual(parse_iso_date("1970-01-01"), 0)
+        self.assertEqual(parse_iso_date("2023-10-26"), (date(2023, 10, 26) - EPOCH).days)
+        self.assertEqual(parse_iso_date("0001-01-01"), (date(1, 1, 1) - EPOCH).days)
+        self.assertEqual(parse_iso_date("9999-12-31"), (date(9999, 12, 31) - EPOCH).days)
+
+    def test_leap_days(self):
+        self.assertEqual(parse_iso_date("2024-02-29"), (date(2024, 2, 29) - EPOCH).days)
+        self.assertEqual(parse_iso_date("2000-02-29"), (date(2000, 2, 29) - EPOCH).days)
+        self.assertEqual(parse_iso_date("2024-03-01"), (date(2024, 3, 1) - EPOCH).days)
+        for invalid in ("2023-02-29", "1900-02-29", "2100-02-29"):
+            with self.subTest(date=invalid), self.assertRaises(ValueError):
+                parse_iso_date(invalid)
+
+    def test_strptime_fallback_inputs(self):
+        # Accepted by strptime although not in strict "YYYY-MM-DD" form.
+        for date_str in ("2023-1-5", "2023-01-5", "２０２３-01-05"):
+            with self.subTest(date=date_str):
+                expected = datetime.strptime(date_str, '%Y-%m-%d').date()
+                self.assertEqual(parse_iso_date(date_str), (expected - EPOCH).days)
+
+    def test_invalid_dates(self):
+        for invalid in ("", "0000-01-01", "2023-13-01", "2023-00-10", "2023-01-32", "2023/01/01",
+                        " 2023-01-01", "2023-01-01 ", "abcd-ef-gh", "2023-01-01T00:00"):
+            with self.subTest(date=invalid), self.assertRaises(ValueError):
+                parse_iso_date(invalid)
+
+    def test_non_string(self):
+        with self.assertRaises(TypeError):
+            parse_iso_date(20230101)
+
+
+class TestFormatInstant(unittest.TestCase):
+    def test_known_instants(self):
+        self.assertEqual(format_instant(0), "Thu, 1970-01-01 12:00 AM")
+        self.assertEqual(format_instant(12 * 60 * 60 + 59), "Thu, 1970-01-01 12:00 PM")
+        self.assertEqual(format_instant(-60), "Wed, 1969-12-31 11:59 PM")
+
+    def test_matches_strftime(self):
+        rng = random.Random(2)
+        for _ in range(2000):
+            instant = rng.randint(MIN_INSTANT, MAX_INSTANT)
+            expected = (datetime(1970, 1, 1) + timedelta(seconds=instant)).strftime(STRFTIME_FORMAT)
+            with self.subTest(instant=instant):
+                self.assertEqual(format_instant(instant), expected)
+
+    def test_years_are_not_zero_padded(self):
+        self.assertEqual(format_instant(MIN_INSTANT), "Mon, 1-01-01 12:00 AM")
+        self.assertEqual(format_instant(parse_iso_date("0999-12-31") * SECONDS_PER_DAY), "Tue, 999-12-31 12:00 AM")
+
+    def test_out_of_range(self):
+        self.assertEqual(format_instant(MAX_INSTANT), "Fri, 9999-12-31 11:59 PM")
+        with self.assertRaises(OverflowError):
+            format_instant(MAX_INSTANT + 1)
+        with self.assertRaises(OverflowError):
+            format_instant(MIN_INSTANT - 1)
+
+
+class TestServiceStartDate(unittest.TestCase):
+    def test_overflow_is_unexpected_error(self):
+        # Past 9999-12-31 the datetime code overflowed; the web apps answer 500 as before.
+        with self.assertRaises(OverflowError):
+            calculate({"initial_time": "11:00 PM", "duration": "2:00", "start_date": "9999-12-31"})
+
+    def test_result(self):
+        body, status = calculate({"initial_time": "11:00 PM", "duration": "2:00", "start_date": "2024-02-28"})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["start_datetime_str"], "Wed, 2024-02-28 11:00 PM")
+        self.assertEqual(body["end_datetime_str"], "Thu, 2024-02-29 01:00 AM")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,11 @@ class TestCLI(unittest.TestCase):
         # print(f"Running command: {' '.join(command)}") # For debugging test setup
         return subprocess.run(command, capture_output=True, text=True)
 
+    # Helper to run the CLI with data on stdin (batch mode)
+    def run_cli_with_input(self, args_list, stdin_text):
+        command = [sys.executable, "-m", "timecalculator.cli"] + args_list
+        return subprocess.run(command, input=stdin_text, capture_output=True, text=True)
+
     def test_successful_run(self):
         result = self.run_cli(["5:00 PM", "3:10"])
         self.assertEqual(result.returncode, 0, f"CLI Error: {result.stderr}")
@@ -95,6 +100,16 @@ class TestCLI(unittest.TestCase):
         self.assertNotEqual(result.returncode, 0)
         self.assertTrue(result.stderr.strip().startswith("Error: Initial time must be in H:MM AM/PM or HH:MM format."), f"Actual stderr: {result.stderr}")
 
+    def test_parse_cache_size_option(self):
+        result = self.run_cli(["5:00 PM", "3:10", "--parse-cache-size", "16"])
+        self.assertEqual(result.returncode, 0, f"CLI Error: {result.stderr}")
+        self.assertEqual(result.stdout.strip(), "8:10 PM")
+
+    def test_parse_cache_size_negative(self):
+        result = self.run_cli(["5:00 PM", "3:10", "--parse-cache-size", "-1"])
+        self.assertNotEqual(result.returncode, 0)
+        self.assertTrue(result.stderr.strip().startswith("Error: Cache maxsize must be non-negative."), f"Actual stderr: {result.stderr}")
+
     # Tests for 24-hour format initial_time in CLI
     def test_cli_initial_time_24hr_afternoon(self):
         result = self.run_cli(["13:00", "1:00"])
@@ -116,6 +131,66 @@ class TestCLI(unittest.TestCase):
         self.assertNotEqual(result.returncode, 0)
         self.assertTrue(result.stderr.strip().startswith("Error: Initial time must be in H:MM AM/PM or HH:MM format."), f"Actual stderr: {result.stderr}")
 
+    # Tests for batch mode
+    def test_batch_csv_from_stdin(self):
+        stdin_text = "initial_time,duration\n5:00 PM,150:35\nbad,1:00\n10:00 PM,2:30\n"
+        result = self.run_cli_with_input(["--batch"], stdin_text)
+        self.assertEqual(result.returncode, 0, f"CLI Error: {result.stderr}")
+        self.assertEqual(result.stdout.splitlines(), [
+            "initial_time,duration,days_offset,result,error",
+            '5:00 PM,150:35,,"11:35 PM, 6 days later",',
+            "bad,1:00,,,Initial time must be in H:MM AM/PM or HH:MM format.",
+            "10:00 PM,2:30,,\"12:30 AM, 1 day later\",",
+        ])
+
+    def test_batch_jsonl_file_with_output_file(self):
+        import json
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "jobs.jsonl")
+            output_path = os.path.join(tmp, "results.jsonl")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write('{"initial_time": "11:30 PM", "duration": "1:00:00", "days_offset": 1}\n')
+                f.write('{"initial_time": "1:00 PM", "duration": "1:60"}\n')
+            result = self.run_cli(["--batch", input_path, "--output", output_path])
+            self.assertEqual(result.returncode, 0, f"CLI Error: {result.stderr}")
+            with open(output_path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]["result"], "12:30 AM, 2 days later")
+        self.assertEqual(records[1]["error"], "Minutes component must be between 0 and 59.")
+
+    def test_batch_with_workers_keeps_order(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "jobs.csv")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.writelines(f"{h}:00 AM,{h}:30\n" for h in range(1, 13))
+            sequential = self.run_cli(["--batch", input_path])
+            parallel = self.run_cli(["--batch", input_path, "--workers", "3"])
+        self.assertEqual(parallel.returncode, 0, f"CLI Error: {parallel.stderr}")
+        self.assertEqual(parallel.stdout, sequential.stdout)
+        self.assertEqual(len(parallel.stdout.splitlines()), 12)
+
+    def test_batch_workers_require_file(self):
+        result = self.run_cli_with_input(["--batch", "-", "--workers", "2"], "5:00 PM,3:10\n")
+        self.assertNotEqual(result.returncode, 0)
+        self.assertTrue(result.stderr.startswith("Error: --workers requires --batch FILE"), f"Actual stderr: {result.stderr}")
+
+    def test_batch_rejects_positional_arguments(self):
+        result = self.run_cli(["5:00 PM", "3:10", "--batch", "-"])
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("cannot be combined with --batch", result.stderr)
+
+    def test_missing_arguments_without_batch(self):
+        result = self.run_cli([])
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("initial_time and duration are required", result.stderr)
+
+    def test_batch_missing_file(self):
+        result = self.run_cli(["--batch", "does-not-exist.csv"])
+        self.assertNotEqual(result.returncode, 0)
+        self.assertTrue(result.stderr.startswith("Error: "), f"Actual stderr: {result.stderr}")
+
 
 if __name__ == "__main__":
     # This allows running tests directly from this file if needed,
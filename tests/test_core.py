@@ -0,0 +1,177 @@
+import unittest
+import sys
+import os
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.core import Time, Duration
+
+class TestTimeConstructors(unittest.TestCase):
+    def test_from_minutes(self):
+        self.assertEqual(str(Time.from_minutes(0)), "12:00 AM")
+        self.assertEqual(str(Time.from_minutes(725)), "12:05 PM")
+        self.assertEqual(Time.from_minutes(1439).minutes_from_midnight, 1439)
+
+    def test_from_minutes_out_of_range(self):
+        for minutes in (-1, 1440):
+            with self.subTest(minutes=minutes):
+                with self.assertRaisesRegex(ValueError, "must be between 0 and 1439"):
+                    Time.from_minutes(minutes)
+
+    def test_from_seconds_truncates(self):
+        self.assertEqual(Time.from_seconds(43559).minutes_from_midnight, 725)
+        self.assertEqual(str(Time.from_seconds(86399)), "11:59 PM")
+
+    def test_from_seconds_out_of_range(self):
+        for seconds in (-1, 86400):
+            with self.subTest(seconds=seconds):
+                with self.assertRaisesRegex(ValueError, "must be between 0 and 86399"):
+                    Time.from_seconds(seconds)
+
+    def test_from_minutes_matches_parsed_time(self):
+        for minutes in range(0, 1440, 7):
+            with self.subTest(minutes=minutes):
+                time_obj = Time.from_minutes(minutes)
+                self.assertEqual(Time(str(time_obj)).minutes_from_midnight, minutes)
+
+
+class TestTimeValueSemantics(unittest.TestCase):
+    def test_instances_are_shared(self):
+        self.assertIs(Time("3:00 PM"), Time("15:00"))
+        self.assertIs(Time("12:00 AM"), Time.from_minutes(0))
+        self.assertIs(Time.from_seconds(54059), Time("3:00 PM"))
+
+    def test_addition_returns_shared_instance(self):
+        new_time, _ = Time("11:00 PM") + Duration("2:30")
+        self.assertIs(new_time, Time("1:30 AM"))
+
+    def test_equality_and_hash(self):
+        self.assertEqual(Time("1:00 PM"), Time("13:00"))
+        self.assertNotEqual(Time("1:00 PM"), Time("1:00 AM"))
+        self.assertEqual(len({Time("1:00 PM"), Time("13:00"), Time("1:01 PM")}), 2)
+
+    def test_immutable(self):
+        time_obj = Time("1:00 PM")
+        with self.assertRaises(AttributeError):
+            time_obj._minutes_from_midnight = 0
+        with self.assertRaises(AttributeError):
+            time_obj.extra = 1
+        self.assertEqual(time_obj.minutes_from_midnight, 780)
+
+    def test_pickle_and_copy_preserve_identity(self):
+        import copy
+        import pickle
+        time_obj = Time("9:45 PM")
+        self.assertIs(pickle.loads(pickle.dumps(time_obj)), time_obj)
+        self.assertIs(copy.deepcopy(time_obj), time_obj)
+
+
+class TestTimeAddition(unittest.TestCase):
+    def test_add_returns_time_and_days(self):
+        new_time, days = Time("11:30 PM") + Duration("1 day, 1:00:59")
+        self.assertIsInstance(new_time, Time)
+        self.assertEqual(str(new_time), "12:30 AM")
+        self.assertEqual(days, 2)
+
+    def test_add_non_duration(self):
+        with self.assertRaises(TypeError):
+            Time("1:00 PM") + 5
+
+
+class TestDurationValueSemantics(unittest.TestCase):
+    def test_parsed_parts_without_days(self):
+        duration = Duration("25:04:09")
+        self.assertEqual((duration.days_part, duration.hours_part, duration.minutes_part, duration.seconds_part),
+                         (None, 25, 4, 9))
+
+    def test_parsed_parts_with_days(self):
+        duration = Duration("1 day, 25:00")
+        self.assertEqual((duration.days_part, duration.hours_part, duration.minutes_part, duration.seconds_part),
+                         (1, 25, 0, 0))
+        self.assertEqual(duration.total_seconds, 2 * 86400 + 3600)
+
+    def test_parsed_parts_seconds_only(self):
+        duration = Duration(":07")
+        self.assertEqual((duration.days_part, duration.hours_part, duration.minutes_part, duration.seconds_part),
+                         (0, 0, 0, 7))
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(Duration("1:00"), "__dict__"))
+
+    def test_immutable(self):
+        duration = Duration("1:00")
+        with self.assertRaises(AttributeError):
+            duration._total_seconds = 0
+        self.assertEqual(duration.total_seconds, 3600)
+
+    def test_equality_and_hash_by_total_seconds(self):
+        self.assertEqual(Duration("1 day, 0:00"), Duration("24:00"))
+        self.assertNotEqual(Duration("1:00"), Duration("1:00:01"))
+        self.assertEqual(len({Duration("0:01"), Duration("0:01:00"), Duration(":01")}), 2)
+
+    def test_pickle_round_trip_keeps_parts(self):
+        import pickle
+        duration = Duration("2 days, 30:15:00")
+        restored = pickle.loads(pickle.dumps(duration))
+        self.assertEqual(restored, duration)
+        self.assertEqual((restored.days_part, restored.hours_part), (2, 30))
+
+
+class TestDurationArithmetic(unittest.TestCase):
+    def test_from_seconds(self):
+        duration = Duration.from_seconds(90061)
+        self.assertEqual(duration, Duration("1 day, 1:01:01"))
+        self.assertEqual((duration.days_part, duration.hours_part, duration.minutes_part, duration.seconds_part),
+                         (None, 25, 1, 1))
+        with self.assertRaisesRegex(ValueError, "must not be negative"):
+            Duration.from_seconds(-1)
+        for invalid in (1.0, "60", True):
+            with self.subTest(invalid=invalid):
+                with self.assertRaises(TypeError):
+                    Duration.from_seconds(invalid)
+
+    def test_add_and_sum(self):
+        self.assertEqual(Duration("1 day, 23:30") + Duration("0:45:00"), Duration("2 days, 0:15"))
+        self.assertEqual(str(Duration("0:59:30") + Duration(":30")), "1:00:00")
+        self.assertEqual(sum([Duration("1:00"), Duration("2:00:01")]), Duration("3:00:01"))
+        self.assertEqual(sum([], Duration.from_seconds(0)).total_seconds, 0)
+
+    def test_subtract(self):
+        self.assertEqual(Duration("2 days, 0:00") - Duration("1:00:01"), Duration("46:59:59"))
+        self.assertEqual((Duration("1:00") - Duration("1:00:00")).total_seconds, 0)
+        with self.assertRaisesRegex(ValueError, "Cannot subtract a longer Duration"):
+            Duration(":59") - Duration("0:01")
+
+    def test_multiply_by_integer(self):
+        self.assertEqual(Duration("1:30") * 3, Duration("4:30"))
+        self.assertEqual(2 * Duration("12:00:00"), Duration("1 day, 0:00"))
+        self.assertEqual((Duration("1:00") * 0).total_seconds, 0)
+        with self.assertRaisesRegex(ValueError, "non-negative integer"):
+            Duration("1:00") * -1
+        for factor in (1.5, True, "2"):
+            with self.subTest(factor=factor):
+                with self.assertRaises(TypeError):
+                    Duration("1:00") * factor
+
+    def test_result_parts_are_derived_from_total_seconds(self):
+        result = Duration("1 day, 0:00") + Duration(":30")
+        self.assertEqual((result.days_part, result.hours_part, result.seconds_part), (None, 24, 30))
+
+    def test_comparison(self):
+        self.assertLess(Duration(":59"), Duration("0:01"))
+        self.assertLessEqual(Duration("24:00"), Duration("1 day, 0:00"))
+        self.assertGreater(Duration("1 day, 0:00"), Duration("23:59:59"))
+        self.assertGreaterEqual(Duration("1:00"), Duration("1:00:00"))
+        self.assertEqual(max(Duration("1:00"), Duration("0:30"), Duration(":05")), Duration("1:00"))
+        with self.assertRaises(TypeError):
+            Duration("1:00") < 3600
+
+    def test_unsupported_operands(self):
+        for operation in (lambda d: d + 1, lambda d: 1 + d, lambda d: d - 1, lambda d: d + Time("1:00 PM")):
+            with self.assertRaises(TypeError):
+                operation(Duration("1:00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import json
+import unittest
+import sys
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator import cli, client
+from timecalculator.daemon import CalculatorDaemon, run_cli
+
+
+class TestRunCLI(unittest.TestCase):
+
+    def test_success(self):
+        self.assertEqual(run_cli(["5:00 PM", "3:10"]), {"stdout": "8:10 PM\n", "stderr": "", "status": 0})
+
+    def test_calculation_error(self):
+        reply = run_cli(["invalid", "1:00"])
+        self.assertEqual(reply["status"], 1)
+        self.assertEqual(reply["stdout"], "")
+        self.assertEqual(reply["stderr"], "Error: Initial time must be in H:MM AM/PM or HH:MM format.\n")
+
+    def test_usage_error(self):
+        reply = run_cli([], prog="timecalc")
+        self.assertEqual(reply["status"], 2)
+        self.assertIn("timecalc: error: initial_time and duration are required", reply["stderr"])
+
+    def test_abbreviated_options(self):
+        self.assertEqual(run_cli(["1:00 PM", "1:00", "--days", "2"])["stdout"], "2:00 PM, 2 days later\n")
+
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp, "daemon.sock")
+        self.server = CalculatorDaemon(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmp)
+
+    def raw_request(self, payload: bytes) -> bytes:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            sock.sendall(payload)
+            with sock.makefile("rb") as stream:
+                return stream.readline()
+
+    def test_request(self):
+        self.assertEqual(client.request(["10:00 PM", "2:30", "--days_offset", "1"], self.socket_path),
+                         ("12:30 AM, 2 days later\n", "", 0))
+
+    def test_request_error(self):
+        stdout, stderr, status = client.request(["1:00 PM", "invalid_duration"], self.socket_path)
+        self.assertEqual((stdout, status), ("", 1))
+        self.assertTrue(stderr.startswith("Error: Invalid duration string format"))
+
+    def test_malformed_request(self):
+        for payload in (b"not json\n", b"[1, 2]\n", b'{"argv": "5:00 PM"}\n', b'{"argv": [1]}\n'):
+            with self.subTest(payload=payload):
+                reply = self.raw_request(payload)
+                self.assertIn(b'"status": 2', reply)
+                self.assertIn(b"Malformed daemon request", reply)
+
+    def test_refuses_local_runs(self):
+        for argv, reason in ((["5:00 PM", "3:10", "--parse-cache-size", "0"], "--parse-cache-size"),
+                             (["--parse-cache-size=0", "5:00 PM", "3:10"], "--parse-cache-size"),
+                             (["5:00 PM", "3:10", "--parse", "0"], "--parse-cache-size"),
+                             (["--bat", "local.csv"], "--batch"),
+                             (["stats"], "stats"),
+                             (["stats", "some/file"], "stats")):
+            with self.subTest(argv=argv):
+                with mock.patch.object(cli, "main") as cli_main:
+                    stdout, stderr, status = client.request(argv, self.socket_path)
+                self.assertEqual((stdout, status), ("", 2))
+                self.assertEqual(stderr, f"Error: {reason} cannot be sent to the daemon.\n")
+                cli_main.assert_not_called()
+        # The daemon still answers afterwards.
+        self.assertEqual(client.request(["1:00 PM", "1:00"], self.socket_path), ("2:00 PM\n", "", 0))
+
+    def test_socket_is_private(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_refuses_second_daemon(self):
+        with self.assertRaises(OSError):
+            CalculatorDaemon(self.socket_path)
+
+    def test_client_forwards_to_daemon(self):
+        env = dict(os.environ, TIMECALC_DAEMON_SOCKET=self.socket_path)
+        # The daemon runs in this process, so the forwarded call is visible here.
+        with mock.patch.object(cli, "main", wraps=cli.main) as cli_main:
+            result = subprocess.run([sys.executable, "-m", "timecalculator.client", "5:00 PM", "3:10"],
+                                    capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, f"Client error: {result.stderr}")
+        self.assertEqual(result.stdout, "8:10 PM\n")
+        cli_main.assert_called_once_with(["5:00 PM", "3:10"], "client.py")
+
+
+class TestSocketLifecycle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp, "daemon.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_server_close_removes_socket(self):
+        CalculatorDaemon(self.socket_path).server_close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_replaces_stale_socket(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()  # Leaves the socket file behind with nothing listening.
+        server = CalculatorDaemon(self.socket_path)
+        server.server_close()
+
+    def test_refuses_non_socket_path(self):
+        with open(self.socket_path, "w") as f:
+            f.write("keep me")
+        with self.assertRaises(OSError):
+            CalculatorDaemon(self.socket_path)
+        with open(self.socket_path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+    def test_request_without_daemon(self):
+        with self.assertRaises(OSError):
+            client.request(["5:00 PM", "3:10"], self.socket_path)
+
+    def test_client_falls_back_without_daemon(self):
+        env = dict(os.environ, TIMECALC_DAEMON_SOCKET=self.socket_path)
+        for args, expected_stdout, expected_status in ((["5:00 PM", "3:10"], "8:10 PM\n", 0),
+                                                       (["invalid", "1:00"], "", 1)):
+            with self.subTest(args=args):
+                result = subprocess.run([sys.executable, "-m", "timecalculator.client"] + args,
+                                        capture_output=True, text=True, env=env)
+                self.assertEqual(result.returncode, expected_status)
+                self.assertEqual(result.stdout, expected_stdout)
+
+    def test_client_runs_batch_in_process(self):
+        env = dict(os.environ, TIMECALC_DAEMON_SOCKET=self.socket_path)
+        result = subprocess.run([sys.executable, "-m", "timecalculator.client", "--batch"],
+                                input="5:00 PM,3:10\n", capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, f"Client error: {result.stderr}")
+        self.assertEqual(result.stdout, "5:00 PM,3:10,,8:10 PM,\n")
+
+    def test_local_options_are_not_forwarded(self):
+        for argv in (["--batch"], ["--batch=jobs.csv"], ["--parse-cache-size", "0", "5:00 PM", "3:10"],
+                     ["--parse-cache-size=0", "5:00 PM", "3:10"], ["--bat", "local.csv"], ["--b=local.csv"],
+                     ["5:00 PM", "3:10", "--parse", "0"]):
+            with self.subTest(argv=argv):
+                self.assertFalse(client._forwardable(argv))
+        # Options are read as the CLI reads them: other abbreviations, positionals after
+        # "--" and usage errors (which run nothing) are forwarded.
+        for argv in (["5:00 PM", "3:10", "--days", "2"], ["--", "--batch", "3:10"], ["--batch", "--days_offset", "x"]):
+            with self.subTest(argv=argv):
+                self.assertTrue(client._forwardable(argv))
+
+    def test_client_runs_stats_in_process(self):
+        self.assertFalse(client._forwardable(["stats", "jobs.log"]))
+        self.assertTrue(client._forwardable(["5:00 PM", "3:10"]))
+        env = dict(os.environ, TIMECALC_DAEMON_SOCKET=self.socket_path)
+        result = subprocess.run([sys.executable, "-m", "timecalculator.client", "stats", "--json"],
+                                input="1:00\n", capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, f"Client error: {result.stderr}")
+        self.assertEqual(json.loads(result.stdout)["p50"], 3600)
+
+
+if __name__ == '__main__':
+    unittest.main()
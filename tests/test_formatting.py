@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.formatting import CLOCK_STRINGS, days_later_suffix, format_duration, format_result
+
+class TestFormatting(unittest.TestCase):
+    def test_clock_strings(self):
+        self.assertEqual(len(CLOCK_STRINGS), 1440)
+        self.assertEqual(CLOCK_STRINGS[0], "12:00 AM")
+        self.assertEqual(CLOCK_STRINGS[59], "12:59 AM")
+        self.assertEqual(CLOCK_STRINGS[720], "12:00 PM")
+        self.assertEqual(CLOCK_STRINGS[1439], "11:59 PM")
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(0), "0:00:00")
+        self.assertEqual(format_duration(3723), "1:02:03")
+        self.assertEqual(format_duration(86399), "23:59:59")
+        self.assertEqual(format_duration(86400), "1 day, 0:00:00")
+        self.assertEqual(format_duration(2 * 86400 + 7530), "2 days, 2:05:30")
+
+    def test_days_later_suffix(self):
+        self.assertEqual(days_later_suffix(-2), "")
+        self.assertEqual(days_later_suffix(0), "")
+        self.assertEqual(days_later_suffix(1), ", 1 day later")
+        self.assertEqual(days_later_suffix(6), ", 6 days later")
+        self.assertEqual(days_later_suffix(1000), ", 1000 days later")
+
+    def test_format_result(self):
+        self.assertEqual(format_result(1415, 6), "11:35 PM, 6 days later")
+        self.assertEqual(format_result(30, 0), "12:30 AM")
+        self.assertEqual(format_result(30, -1), "12:30 AM")
+        self.assertEqual(format_result(30, 400), "12:30 AM, 400 days later")
+
+
+if __name__ == "__main__":
+    unittest.main()
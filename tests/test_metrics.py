@@ -0,0 +1,139 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app as flask_app
+from asgi import app as asgi_app
+from tests.test_asgi import call_asgi
+from timecalculator.cache import CacheStats
+from timecalculator.metrics import PROMETHEUS_CONTENT_TYPE, UNMATCHED_ROUTE, Metrics, metrics
+from timecalculator.service import calculate, calculate_json, response_cache
+
+
+def samples(text):
+    """Parses the text format into {series: value}, skipping comments."""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            result[series] = float(value)
+    return result
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_is_cumulative(self):
+        registry = Metrics(buckets=(0.001, 0.01))
+        for seconds in (0.0005, 0.001, 0.002, 0.5):
+            registry.observe_request('/r', 'GET', 200, seconds)
+        values = samples(registry.render({}))
+        self.assertEqual(values['timecalc_http_request_duration_seconds_bucket{route="/r",le="0.001"}'], 2)
+        self.assertEqual(values['timecalc_http_request_duration_seconds_bucket{route="/r",le="0.01"}'], 3)
+        self.assertEqual(values['timecalc_http_request_duration_seconds_bucket{route="/r",le="+Inf"}'], 4)
+        self.assertEqual(values['timecalc_http_request_duration_seconds_count{route="/r"}'], 4)
+        self.assertAlmostEqual(values['timecalc_http_request_duration_seconds_sum{route="/r"}'], 0.5035)
+        self.assertEqual(values['timecalc_http_requests_total{route="/r",method="GET",status="200"}'], 4)
+
+    def test_parse_errors_and_caches(self):
+        registry = Metrics()
+        registry.count_parse_error("duration")
+        registry.count_parse_error("duration")
+        text = registry.render({"response": CacheStats(hits=3, misses=1, evictions=0, size=1, maxsize=8)})
+        values = samples(text)
+        self.assertEqual(values['timecalc_parse_errors_total{input="time"}'], 0)
+        self.assertEqual(values['timecalc_parse_errors_total{input="duration"}'], 2)
+        self.assertEqual(values['timecalc_cache_hit_ratio{cache="response"}'], 0.75)
+        self.assertEqual(values['timecalc_cache_maxsize{cache="response"}'], 8)
+        self.assertIn("# TYPE timecalc_http_request_duration_seconds histogram\n", text)
+        self.assertIn("# TYPE timecalc_cache_size gauge\n", text)
+
+    def test_label_escaping(self):
+        registry = Metrics()
+        registry.observe_request('a"b\\c\nd', 'GET', 200, 0.0)
+        self.assertIn('route="a\\"b\\\\c\\nd"', registry.render({}))
+
+    def test_reset(self):
+        registry = Metrics()
+        registry.observe_request('/r', 'GET', 200, 0.0)
+        registry.count_parse_error("time")
+        registry.reset()
+        values = samples(registry.render({}))
+        self.assertEqual(values['timecalc_parse_errors_total{input="time"}'], 0)
+        self.assertNotIn('timecalc_http_requests_total{route="/r",method="GET",status="200"}', values)
+
+
+class TestParseErrorCounting(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        response_cache.clear()
+
+    def parse_errors(self):
+        values = samples(metrics.render({}))
+        return {name: values[f'timecalc_parse_errors_total{{input="{name}"}}']
+                for name in ("time", "duration", "start_date")}
+
+    def test_split_by_input(self):
+        calculate({"initial_time": "25:00", "duration": "1:00"})
+        calculate({"initial_time": "1:00 PM", "duration": "1:99"})
+        calculate({"initial_time": "1:00 PM", "duration": "bogus", "start_date": "2024-01-01"})
+        calculate({"initial_time": "1:00 PM", "duration": "1:00", "start_date": "2024-02-30"})
+        calculate({"initial_time": "1:00 PM"})  # Missing input, not a parse error
+        self.assertEqual(self.parse_errors(), {"time": 1, "duration": 2, "start_date": 1})
+
+    def test_cached_responses_are_counted(self):
+        for _ in range(3):
+            calculate_json({"initial_time": "1:00 XM", "duration": "1:00"})
+        self.assertEqual(response_cache.stats().hits, 2)
+        self.assertEqual(self.parse_errors()["time"], 3)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        flask_app.testing = True
+        self.client = flask_app.test_client()
+
+    def test_flask(self):
+        self.client.post('/api/calculate_time', json={"initial_time": "1:00 PM", "duration": "1:00"})
+        self.client.get('/api/calculate_time?initial_time=1:00%20PM&duration=nope')
+        self.client.get('/no/such/page')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], PROMETHEUS_CONTENT_TYPE)
+        self.assertEqual(response.headers['X-Content-Type-Options'], 'nosniff')
+        values = samples(response.data.decode())
+        self.assertEqual(values['timecalc_http_requests_total{route="/api/calculate_time",method="POST",status="200"}'], 1)
+        self.assertEqual(values['timecalc_http_requests_total{route="/api/calculate_time",method="GET",status="400"}'], 1)
+        self.assertEqual(values[f'timecalc_http_requests_total{{route="{UNMATCHED_ROUTE}",method="GET",status="404"}}'], 1)
+        self.assertEqual(values['timecalc_http_request_duration_seconds_count{route="/api/calculate_time"}'], 2)
+        self.assertEqual(values['timecalc_parse_errors_total{input="duration"}'], 1)
+        for cache in ("parse_time", "parse_duration", "response", "timezone"):
+            self.assertIn(f'timecalc_cache_hit_ratio{{cache="{cache}"}}', values)
+
+    def test_asgi_uses_the_same_labels(self):
+        requests = [('POST', '/api/calculate_time', b'{"initial_time": "1:00 PM", "duration": "1:00"}'),
+                    ('GET', '/static/style.css', b''),
+                    ('GET', '/static/build/missing.0123456789ab.js', b''),
+                    ('GET', '/static/build/', b''),
+                    ('PUT', '/api/calculate_time', b''),
+                    ('GET', '/api/timezone', b''),
+                    ('GET', '/no/such/page', b'')]
+        for method, path, body in requests:
+            self.client.open(path, method=method, data=body, content_type='application/json')
+        flask_values = samples(self.client.get('/metrics').data.decode())
+        metrics.reset()
+        for method, path, body in requests:
+            call_asgi(asgi_app, method, path, body)
+        status, headers, data = call_asgi(asgi_app, 'GET', '/metrics')
+        self.assertEqual((status, headers['content-type']), (200, PROMETHEUS_CONTENT_TYPE))
+        asgi_values = samples(data.decode())
+        request_series = lambda values: {k: v for k, v in values.items() if k.startswith('timecalc_http_requests_total')}
+        self.assertEqual(request_series(asgi_values), request_series(flask_values))
+
+
+if __name__ == '__main__':
+    unittest.main()
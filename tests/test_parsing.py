@@ -0,0 +1,106 @@
+import re
+import unittest
+import sys
+import os
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.parsing import parse_duration, parse_duration_seconds, parse_time
+
+class TestParseDuration(unittest.TestCase):
+    def test_hours_minutes(self):
+        self.assertEqual(parse_duration("150:35"), (None, 150, 35, 0))
+
+    def test_single_digit_minutes(self):
+        self.assertEqual(parse_duration("1:5"), (None, 1, 5, 0))
+
+    def test_hours_minutes_seconds(self):
+        self.assertEqual(parse_duration("01:02:03"), (None, 1, 2, 3))
+
+    def test_days_prefix(self):
+        self.assertEqual(parse_duration("2 days, 1:02:03"), (2, 1, 2, 3))
+        self.assertEqual(parse_duration("1 day, 2:05"), (1, 2, 5, 0))
+
+    def test_zero_days_prefix_is_reported(self):
+        self.assertEqual(parse_duration("0 days, 1:00:30"), (0, 1, 0, 30))
+
+    def test_seconds_only(self):
+        self.assertEqual(parse_duration(":05"), (0, 0, 0, 5))
+
+    def test_non_ascii_digits_use_pattern_path(self):
+        # \d matches any Unicode decimal digit; the fast path must not change that.
+        self.assertEqual(parse_duration("٣:00"), (None, 3, 0, 0))
+
+    def test_out_of_range_minutes(self):
+        with self.assertRaisesRegex(ValueError, "Minutes component must be between 0 and 59."):
+            parse_duration("1:60")
+
+    def test_out_of_range_seconds(self):
+        with self.assertRaisesRegex(ValueError, "Seconds component must be between 0 and 59."):
+            parse_duration("1:00:60")
+        with self.assertRaisesRegex(ValueError, "Seconds component must be between 0 and 59."):
+            parse_duration(":75")
+
+    def test_minutes_checked_before_seconds(self):
+        with self.assertRaisesRegex(ValueError, "Minutes component must be between 0 and 59."):
+            parse_duration("0:60:60")
+
+    def test_invalid_formats(self):
+        for duration_str in ["", "1", ":", "1:", "1:2:", ":1:00", "1:00:00:00", "1:AA", " 1:00", "1:00\n", "1 day, :30"]:
+            with self.subTest(duration_str=duration_str):
+                with self.assertRaisesRegex(ValueError, "Invalid duration string format"):
+                    parse_duration(duration_str)
+
+
+class TestParseDurationSeconds(unittest.TestCase):
+    def test_matches_parse_duration(self):
+        for duration_str in ["0:00", "150:35", "1:5", "01:02:03", "2 days, 1:02:03", "1 day, 2:05", ":05",
+                             "٣:00", "12345678901234567890:59:59"]:
+            with self.subTest(duration_str=duration_str):
+                days, hours, minutes, seconds = parse_duration(duration_str)
+                self.assertEqual(parse_duration_seconds(duration_str),
+                                 (days or 0) * 86400 + hours * 3600 + minutes * 60 + seconds)
+
+    def test_same_errors_as_parse_duration(self):
+        for duration_str in ["1:60", "1:00:60", "+1:00", "1:00\n", "1:AA", "1:2:", "-1:00:00"]:
+            with self.subTest(duration_str=duration_str):
+                with self.assertRaises(ValueError) as expected:
+                    parse_duration(duration_str)
+                with self.assertRaisesRegex(ValueError, f"^{re.escape(str(expected.exception))}$"):
+                    parse_duration_seconds(duration_str)
+
+
+class TestParseTime(unittest.TestCase):
+    def test_12hr_format(self):
+        self.assertEqual(parse_time("3:00 PM"), 900)
+        self.assertEqual(parse_time("12:30 AM"), 30)
+        self.assertEqual(parse_time("12:00 PM"), 720)
+        self.assertEqual(parse_time("11:59 pm"), 1439)
+
+    def test_24hr_format(self):
+        self.assertEqual(parse_time("00:30"), 30)
+        self.assertEqual(parse_time("23:59"), 1439)
+        self.assertEqual(parse_time("7:05"), 425)
+
+    def test_whitespace_variants_use_pattern_path(self):
+        self.assertEqual(parse_time("3:00  PM"), 900)
+        self.assertEqual(parse_time("3:00\tam"), 180)
+
+    def test_out_of_range(self):
+        with self.assertRaisesRegex(ValueError, "Time hours must be between 1 and 12 for AM/PM format."):
+            parse_time("0:30 AM")
+        with self.assertRaisesRegex(ValueError, "Time hours must be between 0 and 23 for HH:MM format."):
+            parse_time("24:00")
+        with self.assertRaisesRegex(ValueError, "Time minutes must be between 00 and 59."):
+            parse_time("5:60 PM")
+
+    def test_invalid_formats(self):
+        for time_str in ["", "5 PM", "5:00PM", "5:0 PM", "123:00", "5:00 XM", " 5:00", "5:00 AM "]:
+            with self.subTest(time_str=time_str):
+                with self.assertRaisesRegex(ValueError, "Initial time must be in H:MM AM/PM or HH:MM format."):
+                    parse_time(time_str)
+
+
+if __name__ == "__main__":
+    unittest.main()
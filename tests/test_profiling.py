@@ -0,0 +1,111 @@
+import unittest
+import os
+import pstats
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app as flask_app
+from timecalculator import profiling
+from timecalculator.profiling import RequestProfiler, config_from_environment, profile_requests
+
+
+class TestRequestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.original_wsgi_app = flask_app.wsgi_app
+        self.addCleanup(setattr, flask_app, 'wsgi_app', self.original_wsgi_app)
+        flask_app.testing = True
+        self.client = flask_app.test_client()
+
+    def install(self, **kwargs):
+        profiler = RequestProfiler(self.original_wsgi_app, self.directory.name, **kwargs)
+        flask_app.wsgi_app = profiler
+        return profiler
+
+    def profiles(self):
+        return sorted(os.listdir(self.directory.name))
+
+    def post(self, headers=None):
+        return self.client.post('/api/calculate_time', json={"initial_time": "3:00 PM", "duration": "1:30"},
+                                headers=headers or {})
+
+    def test_header_with_token(self):
+        self.install(token="s3cret")
+        with self.assertLogs(profiling.__name__, 'INFO') as logs:
+            response = self.post({'X-Profile': 's3cret'})
+        self.assertEqual(response.status_code, 200)
+        [name] = self.profiles()
+        self.assertRegex(name, r'-POST-api_calculate_time-\d+ms-\d+-1\.prof$')
+        stats = pstats.Stats(os.path.join(self.directory.name, name))
+        self.assertTrue(any(function == 'calculate_json' for _, _, function in stats.stats))
+        self.assertIn("Profiled POST /api/calculate_time", logs.output[0])
+        self.assertIn("top functions by own time", logs.output[0])
+
+    def test_wrong_or_missing_token(self):
+        self.install(token="s3cret")
+        self.post({'X-Profile': 'guess'})
+        self.post()
+        self.assertEqual(self.profiles(), [])
+
+    def test_header_ignored_without_token(self):
+        self.install()
+        self.post({'X-Profile': ''})
+        self.assertEqual(self.profiles(), [])
+
+    def test_sampling(self):
+        draws = iter([0.5, 0.05, 0.2])
+        self.install(sample_rate=0.1, sample=lambda: next(draws))
+        with self.assertLogs(profiling.__name__, 'INFO'):
+            for _ in range(3):
+                self.assertEqual(self.post().status_code, 200)
+        self.assertEqual(len(self.profiles()), 1)
+
+    def test_one_profile_at_a_time(self):
+        profiler = self.install(sample_rate=1.0)
+        profiler._lock.acquire()  # As if another request were being profiled.
+        try:
+            self.assertEqual(self.post().status_code, 200)
+        finally:
+            profiler._lock.release()
+        self.assertEqual(self.profiles(), [])
+
+    def test_handler_errors_propagate(self):
+        def failing_app(environ, start_response):
+            raise RuntimeError("boom")
+        profiler = RequestProfiler(failing_app, self.directory.name, sample_rate=1.0)
+        with self.assertRaises(RuntimeError):
+            profiler({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'}, None)
+        self.assertTrue(profiler._lock.acquire(blocking=False))
+
+
+class TestConfiguration(unittest.TestCase):
+
+    def test_disabled_returns_app_unchanged(self):
+        wsgi_app = object()
+        self.assertIs(profile_requests(wsgi_app, {'PROFILE_DIR': None}), wsgi_app)
+        self.assertIs(profile_requests(wsgi_app, {}), wsgi_app)
+
+    def test_from_environment(self):
+        environment = {'TIMECALC_PROFILE_DIR': '/tmp/profiles', 'TIMECALC_PROFILE_TOKEN': 't',
+                       'TIMECALC_PROFILE_SAMPLE_RATE': '0.01', 'TIMECALC_PROFILE_TOP': 'many'}
+        with mock.patch.dict(os.environ, environment):
+            config = config_from_environment()
+        self.assertEqual(config, {'PROFILE_DIR': '/tmp/profiles', 'PROFILE_TOKEN': 't',
+                                  'PROFILE_SAMPLE_RATE': 0.01, 'PROFILE_TOP_FUNCTIONS': 15})
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(config_from_environment()['PROFILE_DIR'])
+
+    def test_enabled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapped = profile_requests(flask_app.wsgi_app, {'PROFILE_DIR': directory, 'PROFILE_SAMPLE_RATE': 2.0})
+            self.assertIsInstance(wrapped, RequestProfiler)
+            self.assertEqual(wrapped.sample_rate, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
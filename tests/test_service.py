@@ -0,0 +1,182 @@
+import unittest
+import json
+import sys
+import os
+import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator import service
+from timecalculator.service import (
+    calculate, calculate_get, calculate_json, canonical_query, configure_response_cache, etag_for,
+    etag_matches, response_cache, timezone_get, to_json,
+)
+
+
+class TestCalculateJSON(unittest.TestCase):
+
+    def setUp(self):
+        self.original_maxsize = response_cache.maxsize
+        configure_response_cache(16)
+        response_cache.clear()
+
+    def tearDown(self):
+        configure_response_cache(self.original_maxsize)
+        response_cache.clear()
+
+    def test_matches_calculate(self):
+        payloads = [
+            {"initial_time": "2:00 PM", "duration": "1:30"},
+            {"initial_time": "10:00 AM", "duration": "5:00:00", "start_date": "2023-10-26"},
+            {"initial_time": "10:00 AM", "duration": "5:00", "start_date": "not a date"},
+            {"initial_time": "25:00", "duration": "1:00"},
+            {"duration": "1:00"},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                body, status = calculate(payload)
+                self.assertEqual(calculate_json(payload), (to_json(body), status))
+                # Second call comes from the cache and must be identical.
+                self.assertEqual(calculate_json(payload), (to_json(body), status))
+        stats = response_cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (5, 5, 5))
+
+    def test_error_responses_are_cached(self):
+        payload = {"initial_time": "1:00 PM", "duration": "bogus"}
+        first = calculate_json(payload)
+        self.assertEqual(first[1], 400)
+        self.assertIs(calculate_json(payload), first)
+        self.assertEqual(response_cache.stats().hits, 1)
+
+    def test_key_ignores_unrelated_fields_and_empty_values(self):
+        calculate_json({"initial_time": "1:00 PM", "duration": "1:00"})
+        calculate_json({"initial_time": "1:00 PM", "duration": "1:00", "start_date": "", "extra": 1})
+        calculate_json({"initial_time": "1:00 PM", "duration": "1:00", "start_date": None})
+        self.assertEqual(response_cache.stats().hits, 2)
+
+        calculate_json({"duration": "1:00"})
+        body, status = calculate_json({"initial_time": "", "duration": "1:00"})
+        self.assertEqual(response_cache.stats().hits, 3)
+        self.assertEqual((json.loads(body), status), ({"error": "Missing 'initial_time'"}, 400))
+
+    def test_inputs_are_not_normalized_beyond_empty_values(self):
+        first, _ = calculate_json({"initial_time": "1:00 PM", "duration": "nope"})
+        second, _ = calculate_json({"initial_time": "1:00 PM", "duration": "NOPE"})
+        self.assertIn(b"nope", first)
+        self.assertIn(b"NOPE", second)
+
+    def test_non_string_values_bypass_cache(self):
+        # Non-string inputs fail unexpectedly (a 500 from the web apps); nothing is cached.
+        with self.assertRaises(TypeError):
+            calculate_json({"initial_time": "1:00 PM", "duration": 90})
+        self.assertEqual(len(response_cache), 0)
+        self.assertEqual(response_cache.stats().misses, 0)
+
+    def test_bounded(self):
+        configure_response_cache(2)
+        for minutes in range(10, 15):
+            calculate_json({"initial_time": f"1:{minutes} PM", "duration": "1:00"})
+        stats = response_cache.stats()
+        self.assertEqual((stats.size, stats.evictions), (2, 3))
+
+    def test_disabled(self):
+        configure_response_cache(0)
+        payload = {"initial_time": "1:00 PM", "duration": "1:00"}
+        self.assertEqual(calculate_json(payload), calculate_json(payload))
+        self.assertEqual(len(response_cache), 0)
+
+    def test_to_json_format(self):
+        self.assertEqual(to_json({"b": 1, "a": "é"}), b'{"a":"\\u00e9","b":1}\n')
+
+
+class TestCalculateGet(unittest.TestCase):
+
+    def test_canonical_query(self):
+        self.assertEqual(canonical_query({"duration": "1 day, 2:00", "initial_time": "1:00 PM", "x": "y"}),
+                         "initial_time=1:00%20PM&duration=1%20day,%202:00")
+        self.assertEqual(canonical_query({"initial_time": "a+b&c=d/é", "start_date": ""}),
+                         "initial_time=a%2Bb%26c%3Dd%2F%C3%A9")
+        self.assertEqual(canonical_query({}), "")
+
+    def test_etag(self):
+        self.assertEqual(etag_for(b"x"), etag_for(b"x"))
+        self.assertNotEqual(etag_for(b"x"), etag_for(b"y"))
+        self.assertFalse(etag_matches(None, etag_for(b"x")))
+        self.assertFalse(etag_matches('"abc"', etag_for(b"x")))
+
+    def test_canonical_request(self):
+        params = {"initial_time": "1:00 PM", "duration": "1:00"}
+        body, status, headers = calculate_get(params, "initial_time=1:00%20PM&duration=1:00", "/p")
+        self.assertEqual((body, status), calculate_json(params))
+        self.assertEqual(headers["ETag"], etag_for(body))
+
+    def test_cache_control(self):
+        immutable, revalidated = service.CALCULATION_CACHE_CONTROL, service.REVALIDATED_CACHE_CONTROL
+        cases = [
+            ({"initial_time": "1:00 PM", "duration": "1:00"}, 200, immutable),
+            # The timezone only matters with a start_date.
+            ({"initial_time": "1:00 PM", "duration": "1:00", "timezone": "Europe/Paris"}, 200, immutable),
+            ({"initial_time": "1:00 PM", "duration": "1:00", "start_date": "2024-03-31"}, 200, immutable),
+            ({"initial_time": "1:00 PM", "duration": "1:00", "start_date": "2024-03-31",
+              "timezone": "Europe/Paris"}, 200, revalidated),
+            ({"initial_time": "1:00 PM", "duration": "1:00", "start_date": "2024-03-31",
+              "timezone": "Mars/Olympus"}, 400, revalidated),
+            ({"initial_time": "1:00 PM", "duration": "1:99"}, 400, revalidated),
+        ]
+        for params, expected_status, cache_control in cases:
+            with self.subTest(params=params):
+                body, status, headers = calculate_get(params, canonical_query(params), "/p")
+                self.assertEqual((status, headers["Cache-Control"]), (expected_status, cache_control))
+                # A revalidation gets the same caching headers.
+                _, status, not_modified = calculate_get(params, canonical_query(params), "/p", headers["ETag"])
+                self.assertEqual((status, not_modified), (304, headers))
+
+    def test_redirect(self):
+        body, status, headers = calculate_get({"duration": "1:00"}, "duration=1:00&a=b", "/p")
+        self.assertEqual((body, status, headers["Location"]), (b"", 301, "/p?duration=1:00"))
+        self.assertNotIn("ETag", headers)
+
+
+class TestTimezoneGet(unittest.TestCase):
+
+    def test_table(self):
+        body, status, headers = timezone_get({"key": "Europe/Berlin"})
+        table = json.loads(body)
+        self.assertEqual((status, table["key"]), (200, "Europe/Berlin"))
+        self.assertEqual(headers, {"Cache-Control": service.REVALIDATED_CACHE_CONTROL, "ETag": etag_for(body)})
+        self.assertEqual(timezone_get({"key": "Europe/Berlin"}, headers["ETag"]), (b"", 304, headers))
+
+    def test_errors(self):
+        for params, error in (({}, "Missing 'key'"), ({"key": "Mars/Olympus"}, "Unknown timezone: 'Mars/Olympus'")):
+            with self.subTest(params=params):
+                body, status, _ = timezone_get(params)
+                self.assertEqual((status, json.loads(body)), (400, {"error": error}))
+
+
+class TestCacheStats(unittest.TestCase):
+
+    def test_shape(self):
+        stats = service.cache_stats()
+        self.assertEqual(set(stats), {"parse_cache", "response_cache", "timezone_cache"})
+        self.assertEqual(set(stats["response_cache"]),
+                         {"hits", "misses", "evictions", "size", "maxsize", "hit_ratio"})
+
+
+class TestMaxBatchSize(unittest.TestCase):
+
+    def max_batch_size(self, value):
+        env = dict(os.environ, TIMECALC_MAX_BATCH_SIZE=value)
+        result = subprocess.run([sys.executable, "-c", "from timecalculator import service; print(service.MAX_BATCH_SIZE)"],
+                                cwd=os.path.join(os.path.dirname(__file__), '..'), env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return int(result.stdout)
+
+    def test_environment(self):
+        self.assertEqual(self.max_batch_size("25"), 25)
+        self.assertEqual(self.max_batch_size("abc"), service.DEFAULT_MAX_BATCH_SIZE)
+        self.assertEqual(self.max_batch_size(""), service.DEFAULT_MAX_BATCH_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.stats import DurationStats, stats_from_file_parallel, stats_from_lines
+
+
+def nearest_rank(values, q):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+def job_durations(count, seed=1):
+    """Log-normally distributed seconds, as job run times tend to be."""
+    generator = random.Random(seed)
+    return [int(generator.lognormvariate(7, 1.5)) for _ in range(count)]
+
+
+QUANTILES = (0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999, 1)
+
+
+class TestExactStats(unittest.TestCase):
+
+    def test_small_input(self):
+        stats = DurationStats()
+        stats.update([300, 60, 60, 3600, 0])
+        self.assertTrue(stats.is_exact)
+        self.assertEqual((stats.count, stats.total, stats.min, stats.max, stats.mean), (5, 4020, 0, 3600, 804))
+        self.assertEqual(stats.quantiles([0, 0.2, 0.4, 0.5, 0.8, 1]), [0, 0, 60, 60, 300, 3600])
+
+    def test_matches_nearest_rank(self):
+        values = job_durations(5000)
+        stats = DurationStats(exact_limit=None)
+        stats.update(values)
+        self.assertTrue(stats.is_exact)
+        for q in QUANTILES + (0.07, 0.29):
+            with self.subTest(q=q):
+                self.assertEqual(stats.quantile(q), nearest_rank(values, q))
+
+    def test_stays_exact_for_many_repeated_values(self):
+        stats = DurationStats(exact_limit=3)
+        stats.update([60, 120, 180] * 100_000)
+        self.assertTrue(stats.is_exact)
+        self.assertEqual(stats.quantiles([0.33, 0.34, 0.66, 0.67]), [60, 120, 120, 180])
+
+    def test_summary(self):
+        stats = DurationStats()
+        for seconds in range(1, 101):
+            stats.add(seconds)
+        self.assertEqual(stats.summary([50, 95, 99, 99.9]),
+                         {'count': 100, 'min': 1, 'p50': 50, 'p95': 95, 'p99': 99, 'p99.9': 100, 'max': 100,
+                          'mean': 50.5, 'exact': True})
+
+    def test_errors(self):
+        stats = DurationStats()
+        with self.assertRaisesRegex(ValueError, "No durations"):
+            stats.quantile(0.5)
+        with self.assertRaisesRegex(ValueError, "No durations"):
+            stats.summary()
+        with self.assertRaisesRegex(ValueError, "must not be negative"):
+            stats.add(-1)
+        stats.add(1)
+        with self.assertRaisesRegex(ValueError, "between 0 and 1"):
+            stats.quantile(1.5)
+        with self.assertRaisesRegex(ValueError, "relative_accuracy"):
+            DurationStats(relative_accuracy=0)
+
+
+class TestSketch(unittest.TestCase):
+
+    def test_switches_past_the_exact_limit(self):
+        stats = DurationStats(exact_limit=10)
+        stats.update(range(10))
+        self.assertTrue(stats.is_exact)
+        stats.add(10)
+        self.assertFalse(stats.is_exact)
+        self.assertEqual((stats.count, stats.min, stats.max, stats.total), (11, 0, 10, 55))
+
+    def test_relative_accuracy(self):
+        values = job_durations(50_000)
+        for accuracy in (0.01, 0.05):
+            stats = DurationStats(relative_accuracy=accuracy, exact_limit=100)
+            stats.update(values)
+            self.assertFalse(stats.is_exact)
+            self.assertEqual((stats.min, stats.max, stats.total), (min(values), max(values), sum(values)))
+            for q in QUANTILES:
+                with self.subTest(accuracy=accuracy, q=q):
+                    exact = nearest_rank(values, q)
+                    self.assertLessEqual(abs(stats.quantile(q) - exact), accuracy * exact + 0.5)
+
+    def test_memory_is_bounded(self):
+        stats = DurationStats(exact_limit=1000)
+        stats.update(range(0, 10 ** 9, 997))
+        # Buckets grow with the logarithm of the largest value, not with the count.
+        self.assertLess(len(stats._buckets), 1100)
+
+
+class TestMerge(unittest.TestCase):
+
+    def check_merge(self, exact_limit, chunks):
+        whole = DurationStats(exact_limit=exact_limit)
+        merged = DurationStats(exact_limit=exact_limit)
+        for chunk in chunks:
+            whole.update(chunk)
+            part = DurationStats(exact_limit=exact_limit)
+            part.update(chunk)
+            merged.merge(part)
+        self.assertEqual(merged.summary(), whole.summary())
+        self.assertEqual(merged.quantiles(QUANTILES), whole.quantiles(QUANTILES))
+
+    def test_exact_chunks(self):
+        self.check_merge(None, [[1, 2, 3], [3, 4], [], [100]])
+
+    def test_sketch_chunks(self):
+        values = job_durations(30_000)
+        self.check_merge(500, [values[:10_000], values[10_000:20_000], values[20_000:]])
+
+    def test_exact_and_sketch_chunks(self):
+        values = job_durations(5_000)
+        self.check_merge(1000, [values[:3], values, [0, 0, 7], values[:500]])
+
+    def test_merged_exact_chunks_can_outgrow_the_limit(self):
+        merged = DurationStats(exact_limit=5)
+        for chunk in ([1, 2, 3], [4, 5, 6]):
+            part = DurationStats(exact_limit=5)
+            part.update(chunk)
+            merged.merge(part)
+        self.assertFalse(merged.is_exact)
+        self.assertEqual((merged.count, merged.min, merged.max), (6, 1, 6))
+
+    def test_accuracy_must_match(self):
+        with self.assertRaisesRegex(ValueError, "same relative_accuracy"):
+            DurationStats(0.01).merge(DurationStats(0.02))
+
+
+class TestStatsFromLines(unittest.TestCase):
+
+    def test_lines(self):
+        stats, invalid = stats_from_lines(io.StringIO("1:00\n\n0:30:00\n1 day, 0:00\n:15\n"))
+        self.assertEqual((stats.count, stats.min, stats.max, invalid), (4, 15, 86400, 0))
+
+    def test_invalid_lines(self):
+        lines = ["1:00\n", "\n", "bad\n", "1:75\n", "2:00\n"]
+        with self.assertRaisesRegex(ValueError, "^Invalid duration on line 3: "):
+            stats_from_lines(lines)
+        stats, invalid = stats_from_lines(lines, skip_invalid=True)
+        self.assertEqual((stats.count, stats.total, invalid), (2, 3 * 3600, 2))
+
+    def test_parallel_matches_sequential(self):
+        values = job_durations(20_000)
+        lines = [f"{s // 3600}:{s // 60 % 60:02}:{s % 60:02}\n" for s in values]
+        lines[15_000] = "not a duration\n"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.log')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            with self.assertRaisesRegex(ValueError, "^Invalid duration on line 15001: "):
+                stats_from_file_parallel(path, workers=2, chunk_bytes=10_000)
+            parallel, invalid = stats_from_file_parallel(path, workers=2, exact_limit=1000,
+                                                         skip_invalid=True, chunk_bytes=10_000)
+            with open(path, encoding='utf-8') as f:
+                sequential, _ = stats_from_lines(f, exact_limit=1000, skip_invalid=True)
+        self.assertEqual(invalid, 1)
+        self.assertEqual(parallel.summary(), sequential.summary())
+
+
+class TestStatsCommand(unittest.TestCase):
+
+    def run_stats(self, args, stdin_text):
+        command = [sys.executable, "-m", "timecalculator.cli", "stats"] + args
+        return subprocess.run(command, input=stdin_text, capture_output=True, text=True)
+
+    def test_text_report(self):
+        result = self.run_stats([], "1:00\n0:30:00\n\n2 days, 1:00\n")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        lines = result.stdout.splitlines()
+        self.assertEqual(lines[0].split(), ["count", "3"])
+        self.assertEqual(lines[2].split(), ["p50", "1:00:00", "3600", "s"])
+        self.assertEqual(lines[-1], "percentiles: exact")
+
+    def test_json_report(self):
+        result = self.run_stats(["--json", "--percentiles", "50,90", "--skip-invalid"], "1:00\nbad\n3:00\n")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout),
+                         {"count": 2, "min": 3600, "p50": 3600, "p90": 10800, "max": 10800, "mean": 7200.0,
+                          "exact": True, "invalid": 1})
+
+    def test_errors(self):
+        for args, stdin_text, message in (([], "1:00\nbad\n", "Error: Invalid duration on line 2: "),
+                                          ([], "\n", "Error: No durations in the input."),
+                                          (["--workers", "2"], "1:00\n", "Error: --workers requires a FILE")):
+            with self.subTest(args=args, stdin_text=stdin_text):
+                result = self.run_stats(args, stdin_text)
+                self.assertEqual(result.returncode, 1)
+                self.assertTrue(result.stderr.startswith(message), result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
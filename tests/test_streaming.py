@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import csv
+import io
+import json
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+from multiprocessing.pool import ThreadPool
+
+from timecalculator.streaming import (detect_format, imap_window, process_file_parallel, process_lines,
+                                    split_byte_ranges, write_lines)
+
+class TestProcessLines(unittest.TestCase):
+    def test_csv_with_header_and_days_offset(self):
+        lines = ["initial_time,duration,days_offset\n", "10:00 PM,2:30,1\n", "5:00 PM,3:10,\n"]
+        self.assertEqual(list(process_lines(lines, "csv")), [
+            "initial_time,duration,days_offset,result,error\n",
+            '10:00 PM,2:30,1,"12:30 AM, 2 days later",\n',
+            "5:00 PM,3:10,,8:10 PM,\n",
+        ])
+
+    def test_csv_rows_are_padded_to_the_header(self):
+        lines = ["initial_time,duration,days_offset\n", "1:00 PM,1:00\n", "1:00 PM,1:00,1\n", "bad,1:00\n"]
+        records = list(csv.DictReader(process_lines(lines, "csv")))
+        self.assertEqual([(r["days_offset"], r["result"], r["error"]) for r in records], [
+            ("", "2:00 PM", ""),
+            ("1", "2:00 PM, 1 day later", ""),
+            ("", "", "Initial time must be in H:MM AM/PM or HH:MM format."),
+        ])
+        # A header without days_offset gains it; a wider one sets the width.
+        self.assertEqual(list(process_lines(["initial_time,duration\n", "1:00 PM,1:00\n"], "csv")),
+                         ["initial_time,duration,days_offset,result,error\n", "1:00 PM,1:00,,2:00 PM,\n"])
+        self.assertEqual(list(process_lines(["initial_time,duration,days_offset,id\n", "1:00 PM,1:00\n"], "csv")),
+                         ["initial_time,duration,days_offset,id,result,error\n", "1:00 PM,1:00,,,2:00 PM,\n"])
+
+    def test_csv_header_only_allowed_on_first_chunk(self):
+        output = list(process_lines(["initial_time,duration\n"], "csv", allow_header=False))
+        self.assertEqual(output, ["initial_time,duration,,,Initial time must be in H:MM AM/PM or HH:MM format.\n"])
+
+    def test_tsv_errors_inline(self):
+        output = list(process_lines(["1:00 PM\t1:60\n", "1:00 PM\n", "1:00 PM\t1:00\tabc\n"], "tsv"))
+        self.assertEqual(output, [
+            "1:00 PM\t1:60\t\t\tMinutes component must be between 0 and 59.\n",
+            "1:00 PM\t\t\t\tExpected initial_time and duration columns\n",
+            "1:00 PM\t1:00\tabc\t\tInvalid days_offset: 'abc'\n",
+        ])
+
+    def test_jsonl_records(self):
+        lines = [
+            json.dumps({"initial_time": "11:00 PM", "duration": "2:30", "id": 7}) + "\n",
+            "\n",
+            json.dumps({"duration": "2:30"}) + "\n",
+            "not json\n",
+            "[1, 2]\n",
+            json.dumps({"initial_time": "1:00 PM", "duration": "1:00", "days_offset": True}) + "\n",
+        ]
+        records = [json.loads(line) for line in process_lines(lines, "jsonl", extra_days=1)]
+        self.assertEqual(records[0], {"initial_time": "11:00 PM", "duration": "2:30", "id": 7,
+                                      "result": "1:30 AM, 2 days later"})
+        self.assertEqual(records[1]["error"], "Missing 'initial_time'")
+        self.assertTrue(records[2]["error"].startswith("Invalid JSON record"))
+        self.assertEqual(records[3]["error"], "JSON record must be an object")
+        self.assertEqual(records[4]["error"], "Invalid days_offset: True")
+
+    def test_is_lazy(self):
+        def lines():
+            yield "5:00 PM,3:10\n"
+            raise AssertionError("read past the first record")
+
+        self.assertEqual(next(process_lines(lines(), "csv")), "5:00 PM,3:10,,8:10 PM,\n")
+
+    def test_unsupported_format(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported batch format"):
+            process_lines([], "xml")
+
+
+class TestHelpers(unittest.TestCase):
+    def test_detect_format(self):
+        self.assertEqual(detect_format("jobs.TSV"), "tsv")
+        self.assertEqual(detect_format("jobs.ndjson"), "jsonl")
+        self.assertEqual(detect_format("jobs.txt"), "csv")
+        self.assertEqual(detect_format(None), "csv")
+
+    def test_write_lines_in_chunks(self):
+        output = io.StringIO()
+        self.assertEqual(write_lines((f"{i}\n" for i in range(5)), output, chunk_size=2), 5)
+        self.assertEqual(output.getvalue(), "0\n1\n2\n3\n4\n")
+
+    def test_imap_window_keeps_order_and_bounds_pending_tasks(self):
+        taken = []
+
+        def tasks():
+            for i in range(20):
+                taken.append(i)
+                yield i
+
+        with ThreadPool(2) as pool:
+            for consumed, result in enumerate(imap_window(pool, lambda x: x * x, tasks(), 3), 1):
+                self.assertEqual(result, (consumed - 1) ** 2)
+                # Tasks are only taken (and submitted) as results are consumed.
+                self.assertLessEqual(len(taken), consumed + 3)
+            with self.assertRaisesRegex(ValueError, "window must be positive"):
+                list(imap_window(pool, abs, [1], 0))
+
+
+class TestParallelProcessing(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "jobs.csv")
+        rows = ["initial_time,duration\n"] + [f"{h}:{m:02d} PM,{h * 7}:{m:02d}\n" for h in range(1, 13) for m in range(0, 60, 5)]
+        rows[10] = "bad,1:00\n"
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.writelines(rows)
+
+    def test_byte_ranges_cover_file_on_line_boundaries(self):
+        ranges = split_byte_ranges(self.path, chunk_bytes=100)
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, next_start)
+            self.assertEqual(data[end - 1:end], b"\n")
+
+    def test_parallel_output_matches_sequential(self):
+        with open(self.path, encoding="utf-8", newline="") as f:
+            expected = "".join(process_lines(f, "csv", extra_days=1))
+        chunks = list(process_file_parallel(self.path, "csv", extra_days=1, workers=2, chunk_bytes=100))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import json
+import random
+import sys
+import os
+import zoneinfo
+from datetime import datetime, timedelta, timezone
+
+# Adjust the Python path to include the root directory for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timecalculator.civil import MAX_INSTANT, MIN_INSTANT, SECONDS_PER_DAY, parse_iso_date
+from timecalculator.service import calculate
+from timecalculator.timezones import (
+    _BEGINNING_OF_TIME, TransitionTable, _parse_tz_string, _rule_local_instant, load_transition_table,
+    transition_table, zone_cache,
+)
+
+EPOCH = datetime(1970, 1, 1)
+ZONES = ("America/New_York", "Europe/London", "Europe/Dublin", "Australia/Lord_Howe", "Pacific/Chatham",
+         "America/Sao_Paulo", "Asia/Kolkata", "Africa/Casablanca", "Antarctica/Troll", "UTC")
+
+
+def zoneinfo_to_local(instant, zone):
+    aware = (EPOCH + timedelta(seconds=instant)).replace(tzinfo=timezone.utc).astimezone(zone)
+    return int((aware.replace(tzinfo=None) - EPOCH).total_seconds()), aware.tzname()
+
+
+def zoneinfo_from_local(local_instant, zone):
+    aware = (EPOCH + timedelta(seconds=local_instant)).replace(tzinfo=zone)
+    return local_instant - int(aware.utcoffset().total_seconds())
+
+
+class TestTransitionTable(unittest.TestCase):
+    def test_new_york(self):
+        table = load_transition_table("America/New_York")
+        # 2024-03-10 02:00 EST -> 03:00 EDT, at 07:00 UTC.
+        spring_forward = parse_iso_date("2024-03-10") * SECONDS_PER_DAY + 7 * 3600
+        self.assertEqual(table.info_at(spring_forward - 1), (-5 * 3600, "EST"))
+        self.assertEqual(table.info_at(spring_forward), (-4 * 3600, "EDT"))
+
+    def test_gap_and_fold_use_offset_before_transition(self):
+        table = load_transition_table("America/New_York")
+        day = parse_iso_date("2024-03-10") * SECONDS_PER_DAY
+        # 02:30 does not exist on 2024-03-10: read with the EST offset, it is 03:30 EDT.
+        self.assertEqual(table.to_local(table.from_local(day + 2 * 3600 + 1800)), (day + 3 * 3600 + 1800, "EDT"))
+        day = parse_iso_date("2024-11-03") * SECONDS_PER_DAY
+        # 01:30 happens twice on 2024-11-03: the first time (EDT) is used.
+        self.assertEqual(table.to_local(table.from_local(day + 3600 + 1800)), (day + 3600 + 1800, "EDT"))
+
+    def test_matches_zoneinfo(self):
+        rng = random.Random(17)
+        for key in ZONES:
+            zone, table = zoneinfo.ZoneInfo(key), load_transition_table(key)
+            samples = [rng.randint(MIN_INSTANT + SECONDS_PER_DAY, MAX_INSTANT - SECONDS_PER_DAY) for _ in range(200)]
+            samples += [rng.randint(-2 ** 31, 2 ** 32) for _ in range(200)]
+            # Both sides of the transitions around the present.
+            for start in table._utc_starts:
+                if 0 <= start < 2 ** 31:
+                    samples += [start - 3601, start - 1, start, start + 1800, start + 3600]
+            for instant in samples:
+                with self.subTest(zone=key, instant=instant):
+                    self.assertEqual(table.to_local(instant), zoneinfo_to_local(instant, zone))
+                    self.assertEqual(table.from_local(instant), zoneinfo_from_local(instant, zone))
+
+    def test_rules_repeat_after_table(self):
+        # Far past the explicit transitions, offsets come from the shifted 400-year cycle.
+        table, zone = load_transition_table("Europe/Paris"), zoneinfo.ZoneInfo("Europe/Paris")
+        for date_str in ("8765-03-28", "8765-03-29", "9999-10-31", "9999-06-01"):
+            instant = parse_iso_date(date_str) * SECONDS_PER_DAY + 3600
+            with self.subTest(date=date_str):
+                self.assertEqual(table.to_local(instant), zoneinfo_to_local(instant, zone))
+
+    def test_payload_round_trip(self):
+        for key in ("Europe/Berlin", "Asia/Kolkata", "UTC"):
+            with self.subTest(zone=key):
+                table = load_transition_table(key)
+                payload = json.loads(json.dumps(table.to_payload()))
+                infos = [tuple(payload["types"][i]) for i in payload["type_indices"]]
+                rebuilt = TransitionTable(payload["key"], [_BEGINNING_OF_TIME] + payload["transitions"], infos,
+                                          payload["cycle_start"], payload["periodic_before"])
+                for name in TransitionTable.__slots__:
+                    self.assertEqual(getattr(rebuilt, name), getattr(table, name))
+
+    def test_unknown_keys(self):
+        for key in ("Not/A_Zone", "../etc/passwd", "/usr/share/zoneinfo/UTC", "America"):
+            with self.subTest(key=key), self.assertRaisesRegex(ValueError, "Unknown timezone"):
+                load_transition_table(key)
+
+
+class TestTZStrings(unittest.TestCase):
+    def test_parse(self):
+        std, rule = _parse_tz_string("EST5EDT,M3.2.0,M11.1.0")
+        self.assertEqual(std, (-5 * 3600, "EST"))
+        self.assertEqual((rule.dst, rule.start, rule.end),
+                         ((-4 * 3600, "EDT"), ("M", 3, 2, 0, 7200), ("M", 11, 1, 0, 7200)))
+        self.assertEqual(_parse_tz_string("<+0545>-5:45"), ((5 * 3600 + 45 * 60, "+0545"), None))
+        self.assertEqual(_parse_tz_string("<-02>2<-01>,M3.5.0/-1,M10.5.0/0")[1].start, ("M", 3, 5, 0, -3600))
+        with self.assertRaises(ValueError):
+            _parse_tz_string("EST5EDT,M13.1.0,M11.1.0")
+
+    def test_rule_dates(self):
+        day = parse_iso_date
+        self.assertEqual(_rule_local_instant(("M", 3, 2, 0, 7200), 2024), day("2024-03-10") * SECONDS_PER_DAY + 7200)
+        self.assertEqual(_rule_local_instant(("M", 10, 5, 0, 0), 2024), day("2024-10-27") * SECONDS_PER_DAY)
+        self.assertEqual(_rule_local_instant(("J", 60, 0, 0, 0), 2024), day("2024-03-01") * SECONDS_PER_DAY)
+        self.assertEqual(_rule_local_instant(("N", 59, 0, 0, 0), 2024), day("2024-02-29") * SECONDS_PER_DAY)
+
+
+class TestZoneCache(unittest.TestCase):
+    def test_tables_are_cached(self):
+        first = transition_table("Asia/Tokyo")
+        self.assertIs(transition_table("Asia/Tokyo"), first)
+        self.assertGreaterEqual(zone_cache.stats().hits, 1)
+
+
+class TestServiceTimezone(unittest.TestCase):
+    def test_across_spring_forward(self):
+        body, status = calculate({"initial_time": "1:30 AM", "duration": "2:00", "start_date": "2024-03-10",
+                                  "timezone": "America/New_York"})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["start_datetime_str"], "Sun, 2024-03-10 01:30 AM EST")
+        self.assertEqual(body["end_datetime_str"], "Sun, 2024-03-10 04:30 AM EDT")
+
+    def test_across_fall_back(self):
+        body, _ = calculate({"initial_time": "12:30 AM", "duration": "2:00", "start_date": "2024-11-03",
+                             "timezone": "America/New_York"})
+        self.assertEqual(body["end_datetime_str"], "Sun, 2024-11-03 01:30 AM EST")
+
+    def test_without_timezone_unchanged(self):
+        body, _ = calculate({"initial_time": "1:30 AM", "duration": "2:00", "start_date": "2024-03-10",
+                             "timezone": ""})
+        self.assertEqual(body["end_datetime_str"], "Sun, 2024-03-10 03:30 AM")
+
+    def test_unknown_timezone(self):
+        body, status = calculate({"initial_time": "1:30 AM", "duration": "2:00", "start_date": "2024-03-10",
+                                  "timezone": "Mars/Olympus_Mons"})
+        self.assertEqual((body, status), ({"error": "Unknown timezone: 'Mars/Olympus_Mons'"}, 400))
+
+    def test_non_string_timezone(self):
+        for timezone_value, error in ((123, "Unknown timezone: 123"), (["a"], "Unknown timezone: ['a']"),
+                                      (True, "Unknown timezone: True")):
+            with self.subTest(timezone=timezone_value):
+                body, status = calculate({"initial_time": "1:30 AM", "duration": "2:00", "start_date": "2024-03-10",
+                                          "timezone": timezone_value})
+                self.assertEqual((body, status), ({"error": error}, 400))
+
+    def test_ignored_without_start_date(self):
+        body, status = calculate({"initial_time": "1:30 AM", "duration": "2:00", "timezone": "Nowhere"})
+        self.assertEqual((body["calculated_time"], status), ("3:30 AM", 200))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -117,6 +117,135 @@ class TestAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(data.get('error'), "Invalid JSON payload or Content-Type (must be application/json and valid JSON)")
 
+    # --- Tests for the cacheable GET form ---
+
+    def test_get_matches_post(self):
+        for payload in ({"initial_time": "2:00 PM", "duration": "1:30"},
+                        {"initial_time": "10:00 PM", "duration": "5:00:00", "start_date": "2023-12-31"},
+                        {"initial_time": "2:00 PM", "duration": "1:99"}):
+            with self.subTest(payload=payload):
+                post = self.client.post('/api/calculate_time', json=payload)
+                get = self.client.get('/api/calculate_time', query_string=payload, follow_redirects=True)
+                self.assertEqual((get.status_code, get.data), (post.status_code, post.data))
+                self.assertEqual(get.headers['Content-Type'], 'application/json')
+
+    def test_get_caching_headers(self):
+        response = self.client.get('/api/calculate_time?initial_time=2:00%20PM&duration=1:30')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Cache-Control'], 'public, max-age=31536000, immutable')
+        etag = response.headers['ETag']
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+        again = self.client.get('/api/calculate_time?initial_time=2:00%20PM&duration=1:30')
+        self.assertEqual(again.headers['ETag'], etag)
+        other = self.client.get('/api/calculate_time?initial_time=2:00%20PM&duration=1:31')
+        self.assertNotEqual(other.headers['ETag'], etag)
+
+    def test_get_if_none_match(self):
+        url = '/api/calculate_time?initial_time=2:00%20PM&duration=1:30'
+        etag = self.client.get(url).headers['ETag']
+        for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            with self.subTest(header=header):
+                response = self.client.get(url, headers={'If-None-Match': header})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.data, b'')
+                self.assertEqual(response.headers['ETag'], etag)
+        response = self.client.get(url, headers={'If-None-Match': '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_redirects_to_canonical_query(self):
+        cases = {
+            'duration=1:30&initial_time=2:00%20PM': 'initial_time=2:00%20PM&duration=1:30',
+            'initial_time=2:00+PM&duration=1:30': 'initial_time=2:00%20PM&duration=1:30',
+            'initial_time=2:00%20PM&duration=1:30&start_date=&x=1': 'initial_time=2:00%20PM&duration=1:30',
+            'initial_time=2:00%20PM&initial_time=3:00%20PM&duration=1%20day%2C%201:30':
+                'initial_time=2:00%20PM&duration=1%20day,%201:30',
+        }
+        for query, canonical in cases.items():
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/calculate_time?{query}')
+                self.assertEqual(response.status_code, 301)
+                self.assertEqual(response.headers['Location'], f'/api/calculate_time?{canonical}')
+                self.assertEqual(self.client.get(response.headers['Location']).status_code, 200)
+        response = self.client.get('/api/calculate_time?x=1')
+        self.assertEqual(response.headers['Location'], '/api/calculate_time')
+
+    def test_get_missing_fields(self):
+        response = self.client.get('/api/calculate_time?duration=1:30')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data), {"error": "Missing 'initial_time'"})
+
+    # --- Tests for the batch endpoint ---
+
+    def test_batch_mixed_results(self):
+        items = [
+            {"initial_time": "2:00 PM", "duration": "1:30"},
+            {"initial_time": "bad-time", "duration": "1:00"},
+            {"initial_time": "10:00 PM", "duration": "5:00:00", "start_date": "2023-12-31"},
+            {"duration": "1:00"},
+            "not an object",
+            {"initial_time": "2:00 PM", "duration": "1:30"},
+        ]
+        response = self.client.post('/api/calculate_time/batch', json=items)
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)["results"]
+        self.assertEqual(len(results), len(items))
+        self.assertEqual(results[0], {"result_string": "3:30 PM", "calculated_time": "3:30 PM", "days_numeric": 0, "status": 200})
+        self.assertEqual(results[1]["status"], 400)
+        self.assertIn("Initial time must be in H:MM AM/PM or HH:MM format.", results[1]["error"])
+        self.assertEqual(results[2]["status"], 200)
+        self.assertEqual(results[2]["end_datetime_str"], "Mon, 2024-01-01 03:00 AM")
+        self.assertEqual(results[3], {"error": "Missing 'initial_time'", "status": 400})
+        self.assertEqual(results[4], {"error": "Each batch item must be a JSON object", "status": 400})
+        self.assertEqual(results[5], results[0])
+
+    def test_batch_items_match_single_endpoint(self):
+        items = [{"initial_time": "11:59 PM", "duration": "2 days, 0:01:00"}, {"initial_time": "1:00 PM", "duration": "1:60"}]
+        results = json.loads(self.client.post('/api/calculate_time/batch', json=items).data)["results"]
+        for item, result in zip(items, results):
+            single = self.client.post('/api/calculate_time', json=item)
+            expected = dict(json.loads(single.data), status=single.status_code)
+            self.assertEqual(result, expected)
+
+    def test_batch_empty(self):
+        response = self.client.post('/api/calculate_time/batch', json=[])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {"results": []})
+
+    def test_batch_requires_array(self):
+        response = self.client.post('/api/calculate_time/batch', json={"initial_time": "1:00 PM", "duration": "1:00"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON array", json.loads(response.data)["error"])
+
+    def test_batch_too_large(self):
+        original = app.config['MAX_BATCH_SIZE']
+        app.config['MAX_BATCH_SIZE'] = 2
+        try:
+            response = self.client.post('/api/calculate_time/batch', json=[{}, {}, {}])
+        finally:
+            app.config['MAX_BATCH_SIZE'] = original
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(json.loads(response.data)["error"], "Batch too large: 3 items (maximum 2)")
+
+    def test_cache_stats(self):
+        response = self.client.get('/api/cache_stats')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        for name in ("time", "duration"):
+            self.assertEqual(set(data["parse_cache"][name]),
+                             {"hits", "misses", "evictions", "size", "maxsize", "hit_ratio"})
+        self.assertEqual(set(data["response_cache"]),
+                         {"hits", "misses", "evictions", "size", "maxsize", "hit_ratio"})
+
+    def test_repeated_requests_are_served_from_response_cache(self):
+        payload = {"initial_time": "4:17 AM", "duration": "0:43"}
+        before = json.loads(self.client.get('/api/cache_stats').data)["response_cache"]["hits"]
+        first = self.client.post('/api/calculate_time', json=payload)
+        second = self.client.post('/api/calculate_time', json=payload)
+        after = json.loads(self.client.get('/api/cache_stats').data)["response_cache"]["hits"]
+        self.assertEqual(after - before, 1)
+        self.assertEqual((second.status_code, second.data), (first.status_code, first.data))
+        self.assertEqual(second.headers['Content-Type'], 'application/json')
+
     # --- Tests for New Duration Inputs and Start Date Functionality ---
 
     def _construct_duration_str(self, value, unit):
@@ -231,6 +360,24 @@ class TestAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIn("Invalid start_date format. Expected YYYY-MM-DD", data.get('error', ''))
 
+    def test_calculate_with_start_date_and_timezone(self):
+        payload = {"initial_time": "11:00 PM", "duration": "4:00:00", "start_date": "2023-10-28",
+                   "timezone": "Europe/Berlin"}
+        response = self.client.post('/api/calculate_time', json=payload)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        # Clocks go back from 3:00 AM CEST to 2:00 AM CET on 2023-10-29: 4 hours later it is 2:00 AM again.
+        self.assertEqual(data["start_datetime_str"], "Sat, 2023-10-28 11:00 PM CEST")
+        self.assertEqual(data["end_datetime_str"], "Sun, 2023-10-29 02:00 AM CET")
+
+        get = self.client.get('/api/calculate_time', query_string=payload, follow_redirects=True)
+        self.assertEqual(get.data, response.data)
+
+        payload["timezone"] = "Europe/Nowhere"
+        response = self.client.post('/api/calculate_time', json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data), {"error": "Unknown timezone: 'Europe/Nowhere'"})
+
     # def test_error_invalid_days_offset_with_start_date(self): # Removed
     #     payload = {
     #         "initial_time": "10:00 AM",
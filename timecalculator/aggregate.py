@@ -0,0 +1,102 @@
+import os
+from typing import Callable, Iterable, Iterator, Optional, TextIO, Union
+
+from .core import Duration
+from .parsing import parse_duration_seconds
+
+# Streaming totals of many duration strings.
+#
+# The strings are consumed one at a time and parsed straight to integer seconds
+# (parse_duration_seconds), never to Duration objects, so memory stays constant
+# however long the input is. Timesheets and job logs repeat the same few durations
+# heavily, so the seconds of the first MEMO_SIZE distinct strings are remembered;
+# strings first seen after that are parsed each time, which keeps the memo bounded.
+#
+# With lines=True the strings are lines of text (a file, say): surrounding
+# whitespace is stripped, blank lines are skipped and errors give the line number.
+# Otherwise every string must be a duration and errors give the 1-based item number.
+
+MEMO_SIZE = 4096
+
+
+def invalid_duration_error(error: ValueError, position: int, lines: bool = True) -> ValueError:
+    """The error for an invalid duration string, naming its line (or item) number."""
+    return ValueError(f"Invalid duration on {'line' if lines else 'item'} {position}: {error}")
+
+
+def iter_seconds(strings: Iterable[str], lines: bool = False,
+                 on_invalid: Optional[Callable[[int, ValueError], None]] = None) -> Iterator[int]:
+    """
+    Lazily yields the total seconds of each duration string.
+
+    Args:
+        strings: Duration strings, or lines of text when lines is True.
+        lines: Whether to strip the strings and skip blank ones.
+        on_invalid: If given, invalid strings are skipped and it is called with
+                    their item or line number and the parser's error instead.
+
+    Raises:
+        ValueError: For the first invalid duration (unless on_invalid is given),
+                    naming its item or line number.
+    """
+    memo = {}
+    for position, string in enumerate(strings, 1):
+        seconds = memo.get(string)
+        if seconds is None:
+            text = string.strip() if lines else string
+            if not text and lines:
+                continue
+            try:
+                seconds = parse_duration_seconds(text)
+            except ValueError as e:
+                if on_invalid is None:
+                    raise invalid_duration_error(e, position, lines) from None
+                on_invalid(position, e)
+                continue
+            if len(memo) < MEMO_SIZE:
+                memo[string] = seconds
+        yield seconds
+
+
+def sum_seconds(strings: Iterable[str], lines: bool = False) -> int:
+    """
+    Returns the total seconds of all the duration strings (0 when there are none).
+
+    Raises:
+        ValueError: For the first invalid duration, naming its item or line number.
+    """
+    # The loop of iter_seconds, inlined: resuming a generator per string would
+    # roughly double the cost of a memo hit.
+    memo = {}
+    memo_get = memo.get
+    total = 0
+    for position, string in enumerate(strings, 1):
+        seconds = memo_get(string)
+        if seconds is None:
+            text = string.strip() if lines else string
+            if not text and lines:
+                continue
+            try:
+                seconds = parse_duration_seconds(text)
+            except ValueError as e:
+                raise invalid_duration_error(e, position, lines) from None
+            if len(memo) < MEMO_SIZE:
+                memo[string] = seconds
+        total += seconds
+    return total
+
+
+def sum_durations(strings: Iterable[str], lines: bool = False) -> Duration:
+    """Returns the sum of the duration strings as a Duration. See sum_seconds."""
+    return Duration.from_seconds(sum_seconds(strings, lines))
+
+
+def sum_duration_file(source: Union[str, os.PathLike, TextIO]) -> Duration:
+    """
+    Returns the sum of a text file with one duration per line (blank lines are skipped).
+    source is a path or an open text file.
+    """
+    if hasattr(source, "read"):
+        return sum_durations(source, lines=True)
+    with open(source, encoding="utf-8") as f:
+        return sum_durations(f, lines=True)
@@ -0,0 +1,166 @@
+from array import array
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+from . import batch
+from .core import Time, Duration
+from .formatting import CLOCK_STRINGS, format_duration
+
+# Columnar containers for large numbers of times and durations.
+#
+# Values live in a contiguous array('q') (8 bytes per element) exposed through a
+# memoryview, so slicing shares the buffer instead of copying it, and the buffer
+# protocol hands the data to NumPy without conversion. Time and Duration objects
+# are only materialized when a single element is accessed.
+
+_TYPECODE = 'q'
+
+
+def _to_array(values: Any) -> array:
+    """Copies integer values (an iterable, memoryview or NumPy array) into a new array('q')."""
+    if batch.np is not None and isinstance(values, batch.np.ndarray):
+        buffer = array(_TYPECODE)
+        buffer.frombytes(batch.np.ascontiguousarray(values, dtype=batch.np.int64).tobytes())
+        return buffer
+    if isinstance(values, memoryview):
+        values = values.tolist()
+    return array(_TYPECODE, values)
+
+
+def _as_view(values: Any) -> memoryview:
+    """Copies integer values into a new array('q') and returns a read-only view of it."""
+    return memoryview(_to_array(values)).toreadonly()
+
+
+class _IntColumn:
+    """
+    Shared behaviour: an immutable, sliceable sequence over a memoryview of int64 values.
+
+    Subclasses define _element(value), a static method materializing one raw value.
+    """
+
+    __slots__ = ('_view',)
+
+    def __init__(self, values: Iterable[int] = ()):
+        view = _as_view(values)
+        self._check(view)
+        self._view = view
+
+    @classmethod
+    def _wrap(cls, view: memoryview):
+        """Internal constructor around an existing, already-validated view (no copy)."""
+        column = cls.__new__(cls)
+        column._view = view
+        return column
+
+    @staticmethod
+    def _check(view: memoryview) -> None:
+        """Validates raw values; overridden per column type."""
+
+    @property
+    def buffer(self) -> memoryview:
+        """Read-only memoryview of the underlying int64 values (supports the buffer protocol)."""
+        return self._view
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self._wrap(self._view[index])
+        return self._element(self._view[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        element = self._element
+        for value in self._view:
+            yield element(value)
+
+    def tolist(self) -> List[int]:
+        """Returns the raw integer values as a list."""
+        return self._view.tolist()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(len={len(self)})'
+
+
+class TimeArray(_IntColumn):
+    """
+    A column of times of day, stored as minutes from midnight.
+
+    Indexing returns the shared Time instance for that minute; slicing returns a
+    TimeArray sharing the same buffer.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _check(view: memoryview) -> None:
+        if len(view) and (min(view) < 0 or max(view) > 1439):
+            raise ValueError("TimeArray minutes must be between 0 and 1439.")
+
+    @staticmethod
+    def _element(value: int) -> Time:
+        return Time.from_minutes(value)
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> 'TimeArray':
+        """
+        Bulk-parses time strings ("H:MM AM/PM" or "HH:MM").
+
+        Raises:
+            ValueError: For the first invalid string, prefixed with its row number.
+        """
+        return cls._wrap(_as_view(batch.parse_times(strings, use_numpy=False)))
+
+    def strings(self) -> List[str]:
+        """Formats every element as "H:MM AM/PM"."""
+        return [CLOCK_STRINGS[m] for m in self._view]
+
+    def __add__(self, other: 'DurationArray') -> Tuple['TimeArray', array]:
+        """
+        Adds durations element-wise, with the semantics of Time + Duration.
+
+        Returns:
+            (end_times, days_passed): a TimeArray and an array('q') of days passed.
+        """
+        if not isinstance(other, DurationArray):
+            return NotImplemented
+        end_minutes, days_passed = batch.add_durations(self._view, other._view)
+        return TimeArray._wrap(_as_view(end_minutes)), _to_array(days_passed)
+
+
+class DurationArray(_IntColumn):
+    """
+    A column of durations, stored as total seconds.
+
+    Indexing materializes a Duration for that element. Only total seconds are
+    kept, so element parts are reported in canonical form (no days prefix).
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _check(view: memoryview) -> None:
+        if len(view) and min(view) < 0:
+            raise ValueError("DurationArray seconds must be non-negative.")
+
+    @staticmethod
+    def _element(value: int) -> Duration:
+        return Duration._from_state(value, 0)
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> 'DurationArray':
+        """
+        Bulk-parses duration strings (any format accepted by Duration).
+
+        Raises:
+            ValueError: For the first invalid string, prefixed with its row number.
+        """
+        return cls._wrap(_as_view(batch.parse_durations(strings, use_numpy=False)))
+
+    def strings(self) -> List[str]:
+        """Formats every element canonically as 'D days, H:MM:SS'."""
+        return [format_duration(s) for s in self._view]
+
+    def total_seconds(self) -> int:
+        """Returns the sum of all durations in seconds."""
+        return sum(self._view)
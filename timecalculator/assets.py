@@ -0,0 +1,196 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+# Fingerprinted, precompressed static assets.
+#
+# `python -m timecalculator.assets` copies each stylesheet and script in static/
+# to static/build/ under a name containing a hash of its content (script.js ->
+# script.1a2b3c4d5e6f.js) and writes a gzip-compressed copy next to it, plus a
+# manifest mapping the original names to the built ones. A built name changes
+# whenever the content does, so the web apps serve built assets with an immutable,
+# year-long Cache-Control, and send the gzip copy to clients that accept it.
+#
+# Templates link assets through asset_url(filename), which gives the built URL, or
+# the plain /static/ URL for files that have not been built (or have changed since
+# the build), so a checkout without a build still works.
+
+BUILD_DIRNAME = 'build'
+MANIFEST_NAME = 'manifest.json'
+
+# Extensions of the static files that are fingerprinted.
+ASSET_EXTENSIONS = ('.css', '.js')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_HASH_LENGTH = 12
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def fingerprinted_name(filename: str, content: bytes) -> str:
+    """script.js -> script.<first 12 hex digits of its SHA-256>.js"""
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}.{_sha256(content)[:_HASH_LENGTH]}{extension}"
+
+
+def build(static_dir: str) -> Dict[str, str]:
+    """
+    Builds the fingerprinted and gzip-compressed copies of the assets in static_dir
+    into static_dir/build, replacing any earlier build. Returns {filename: built name}.
+    """
+    build_dir = os.path.join(static_dir, BUILD_DIRNAME)
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {}
+    for filename in sorted(os.listdir(static_dir)):
+        source = os.path.join(static_dir, filename)
+        if not filename.endswith(ASSET_EXTENSIONS) or not os.path.isfile(source):
+            continue
+        content = _read(source)
+        built_name = fingerprinted_name(filename, content)
+        with open(os.path.join(build_dir, built_name), 'wb') as f:
+            f.write(content)
+        # mtime=0 keeps the compressed bytes reproducible from build to build.
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) < len(content):
+            with open(os.path.join(build_dir, built_name + '.gz'), 'wb') as f:
+                f.write(compressed)
+        manifest[filename] = {'file': built_name, 'sha256': _sha256(content)}
+
+    current = {entry['file'] for entry in manifest.values()}
+    current.update(name + '.gz' for name in list(current))
+    current.add(MANIFEST_NAME)
+    for stale in set(os.listdir(build_dir)) - current:
+        os.remove(os.path.join(build_dir, stale))
+    with open(os.path.join(build_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return {filename: entry['file'] for filename, entry in manifest.items()}
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header value allows a gzip response."""
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get('gzip', qualities.get('x-gzip', qualities.get('*', 0.0))) > 0.0
+
+
+class BuiltAsset(NamedTuple):
+    """One built asset held in memory: its content type, bytes and gzip bytes (None if not smaller)."""
+    content_type: str
+    content: bytes
+    gzip_content: Optional[bytes]
+
+
+class AssetResponse(NamedTuple):
+    """What to send for a built asset: body and headers (the headers apply to HEAD as well)."""
+    body: bytes
+    headers: Dict[str, str]
+
+
+class AssetManifest:
+    """
+    The built assets of a static directory, loaded into memory, and the URLs to link them by.
+
+    Entries whose source file has changed since the build are ignored (with a
+    warning), so a stale build never serves outdated code.
+    """
+
+    def __init__(self, static_dir: str, url_prefix: str = '/static'):
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix
+        self._urls: Dict[str, str] = {}
+        self._assets: Dict[str, BuiltAsset] = {}
+        build_dir = os.path.join(static_dir, BUILD_DIRNAME)
+        try:
+            with open(os.path.join(build_dir, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        stale: List[str] = []
+        for filename, entry in manifest.items():
+            try:
+                source = _read(os.path.join(static_dir, filename))
+                built_path = os.path.join(build_dir, entry['file'])
+                content = _read(built_path)
+            except FileNotFoundError:
+                stale.append(filename)
+                continue
+            if _sha256(source) != entry['sha256'] or _sha256(content) != entry['sha256']:
+                stale.append(filename)
+                continue
+            try:
+                gzip_content: Optional[bytes] = _read(built_path + '.gz')
+            except FileNotFoundError:
+                gzip_content = None
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            if content_type.startswith('text/'):
+                content_type += '; charset=utf-8'
+            self._assets[entry['file']] = BuiltAsset(content_type, content, gzip_content)
+            self._urls[filename] = f"{url_prefix}/{BUILD_DIRNAME}/{entry['file']}"
+        if stale:
+            logger.warning(f"Static assets changed since the last build, serving them unfingerprinted: "
+                           f"{', '.join(sorted(stale))} (run python -m timecalculator.assets)")
+
+    def url(self, filename: str) -> str:
+        """The URL to link a static file by: its built URL, or the plain one when it has no current build."""
+        return self._urls.get(filename, f"{self.url_prefix}/{filename}")
+
+    def __contains__(self, built_name: str) -> bool:
+        return built_name in self._assets
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def response(self, built_name: str, accept_encoding: Optional[str]) -> Optional[AssetResponse]:
+        """The response for a built asset (gzip when accepted and available), or None if there is no such asset."""
+        asset = self._assets.get(built_name)
+        if asset is None:
+            return None
+        headers = {'Content-Type': asset.content_type, 'Cache-Control': IMMUTABLE_CACHE_CONTROL,
+                   'Vary': 'Accept-Encoding'}
+        if asset.gzip_content is not None and accepts_gzip(accept_encoding):
+            headers['Content-Encoding'] = 'gzip'
+            return AssetResponse(asset.gzip_content, headers)
+        return AssetResponse(asset.content, headers)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    default_static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+    parser = argparse.ArgumentParser(prog='python -m timecalculator.assets',
+                                     description="Build fingerprinted, gzip-compressed copies of the static assets.")
+    parser.add_argument('--static-dir', default=default_static_dir,
+                        help="Directory of the static files (default: the repository's static/).")
+    args = parser.parse_args(argv)
+    for filename, built_name in build(args.static_dir).items():
+        print(f"{filename} -> {BUILD_DIRNAME}/{built_name}")
+
+
+if __name__ == '__main__':
+    main()
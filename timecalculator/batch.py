@@ -0,0 +1,156 @@
+import operator
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .formatting import format_result
+from .parsing import parse_duration_seconds, parse_time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; every function has a pure-Python path.
+    np = None
+
+# Batch computation of Time + Duration over many rows at once.
+#
+# Rows are plain integers -- minutes from midnight for start times, total seconds
+# for durations -- so no Time or Duration objects are created. With NumPy the
+# arithmetic is vectorized over int64 arrays; without it (or with use_numpy=False)
+# the same results are returned as lists.
+#
+# Columns repeat the same few strings heavily, so each distinct string is parsed
+# once: the values of the first MEMO_SIZE distinct strings are remembered (as in
+# timecalculator.aggregate), and strings first seen after that are parsed each
+# time, which keeps the memo bounded however varied the column is.
+
+SECONDS_PER_DAY = 24 * 60 * 60
+MEMO_SIZE = 4096
+
+
+def _numpy_enabled(use_numpy: Optional[bool]) -> bool:
+    """Resolves the use_numpy argument: None means "if installed"."""
+    if use_numpy is None:
+        return np is not None
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed; pass use_numpy=False or None.")
+    return use_numpy
+
+
+def _iter_parsed(strings: Iterable[str], parser: Callable[[str], int]) -> Iterator[int]:
+    """
+    Lazily parses a column of strings, memoizing the first MEMO_SIZE distinct values.
+    Errors are re-raised as ValueError naming the first offending row.
+    """
+    memo: Dict[str, int] = {}
+    for row, raw in enumerate(strings):
+        value = memo.get(raw)
+        if value is None:
+            try:
+                value = parser(raw)
+            except ValueError as e:
+                raise ValueError(f"Row {row}: {e}") from e
+            if len(memo) < MEMO_SIZE:
+                memo[raw] = value
+        yield value
+
+
+def _parse_column(strings: Iterable[str], parser: Callable[[str], int], use_numpy: bool):
+    """Parses a column of strings into an int64 array (filled in place) or a list."""
+    values = _iter_parsed(strings, parser)
+    if use_numpy:
+        count = len(strings) if hasattr(strings, "__len__") else -1
+        return np.fromiter(values, dtype=np.int64, count=count)
+    return list(values)
+
+
+def parse_times(strings: Iterable[str], use_numpy: Optional[bool] = None):
+    """
+    Parses time strings ("H:MM AM/PM" or "HH:MM") into minutes from midnight.
+
+    Returns:
+        An int64 NumPy array, or a list of ints when NumPy is not used.
+
+    Raises:
+        ValueError: For the first invalid string, prefixed with its row number.
+    """
+    return _parse_column(strings, parse_time, _numpy_enabled(use_numpy))
+
+
+def parse_durations(strings: Iterable[str], use_numpy: Optional[bool] = None):
+    """
+    Parses duration strings (any format accepted by Duration) into total seconds.
+
+    Returns:
+        An int64 NumPy array, or a list of ints when NumPy is not used.
+
+    Raises:
+        ValueError: For the first invalid string, prefixed with its row number.
+    """
+    return _parse_column(strings, parse_duration_seconds, _numpy_enabled(use_numpy))
+
+
+def add_durations(start_minutes: Sequence[int], duration_seconds: Sequence[int],
+                  days_offset: Any = 0, use_numpy: Optional[bool] = None) -> Tuple[Any, Any]:
+    """
+    Adds durations to start times row by row, with the semantics of Time + Duration.
+
+    Args:
+        start_minutes: Start times as minutes from midnight (0-1439).
+        duration_seconds: Durations in total seconds (non-negative), same length.
+        days_offset: Whole days added to each row's day count (a scalar or a sequence).
+        use_numpy: True/False to force a path; None uses NumPy when it is installed.
+
+    Returns:
+        (end_minutes, days_passed): end times as minutes from midnight (seconds
+        truncated) and the number of days passed per row, as int64 arrays or lists.
+
+    Raises:
+        ValueError: If the inputs (or a days_offset sequence) differ in length, or a
+                    start time is out of range.
+    """
+    if len(start_minutes) != len(duration_seconds):
+        raise ValueError("start_minutes and duration_seconds must have the same length.")
+    try:
+        offset_count = len(days_offset)
+    except TypeError:  # A scalar (int, NumPy integer, ...): the same offset for every row.
+        offset_count = None
+    if offset_count is not None and offset_count != len(start_minutes):
+        raise ValueError("days_offset must be a scalar or have the same length as start_minutes.")
+
+    if _numpy_enabled(use_numpy):
+        starts = np.asarray(start_minutes, dtype=np.int64)
+        if starts.size and (starts.min() < 0 or starts.max() > 1439):
+            raise ValueError("Start minutes must be between 0 and 1439.")
+        days_passed, seconds_within_day = np.divmod(
+            starts * 60 + np.asarray(duration_seconds, dtype=np.int64), SECONDS_PER_DAY)
+        return seconds_within_day // 60, days_passed + np.asarray(days_offset, dtype=np.int64)
+
+    if any(not (0 <= m <= 1439) for m in start_minutes):
+        raise ValueError("Start minutes must be between 0 and 1439.")
+    if offset_count is None:
+        offsets: Iterable[int] = [operator.index(days_offset)] * len(start_minutes)
+    else:
+        offsets = days_offset
+    end_minutes: List[int] = []
+    days_passed: List[int] = []
+    for start, seconds, offset in zip(start_minutes, duration_seconds, offsets):
+        days, seconds_within_day = divmod(start * 60 + seconds, SECONDS_PER_DAY)
+        end_minutes.append(seconds_within_day // 60)
+        days_passed.append(days + offset)
+    return end_minutes, days_passed
+
+
+def add_time_batch(initial_times: Iterable[str], durations: Iterable[str],
+                   days_offset: Any = 0, use_numpy: Optional[bool] = None) -> Tuple[Any, Any]:
+    """
+    Parses two string columns and adds them row by row; see add_durations.
+
+    Raises:
+        ValueError: For the first invalid string, prefixed with its row number.
+    """
+    use_numpy = _numpy_enabled(use_numpy)
+    return add_durations(parse_times(initial_times, use_numpy), parse_durations(durations, use_numpy),
+                         days_offset, use_numpy)
+
+
+def format_results(end_minutes: Iterable[int], days_passed: Iterable[int]) -> List[str]:
+    """Formats batch results the way add_time does ("H:MM AM/PM[, N day(s) later]")."""
+    return [format_result(int(m), int(d)) for m, d in zip(end_minutes, days_passed)]
@@ -0,0 +1,174 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+from .core import Time, Duration
+
+# Opt-in parse caches for Time and Duration strings.
+#
+# Real inputs are highly repetitive, and Time/Duration are immutable, so a parsed
+# object can be handed out to every caller that passes the same string. Invalid
+# strings are cached too (as their error message) so repeated bad input is cheap.
+# The caches are disabled (size 0) unless TIMECALC_PARSE_CACHE_SIZE is set or
+# configure_parse_cache() is called.
+
+_MISSING = object()
+
+
+class CacheStats(NamedTuple):
+    """Point-in-time counters for one cache."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache (0.0 when there were none)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded mapping that evicts the least recently used entry.
+
+    Lookups through get() are counted as hits or misses; entries dropped to stay
+    within maxsize are counted as evictions. A maxsize of 0 stores nothing.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("Cache maxsize must be non-negative.")
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for key (marking it most recently used), or default."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores value under key, evicting the least recently used entries if needed."""
+        if self._maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        """Changes the bound, evicting entries if the cache is now over it."""
+        if maxsize < 0:
+            raise ValueError("Cache maxsize must be non-negative.")
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _InvalidInput:
+    """Negative cache entry: the ValueError message a string produced."""
+    __slots__ = ('message',)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class ParseCache(LRUCache):
+    """
+    An LRUCache from raw strings to the objects a parser builds from them.
+
+    parse() returns the cached object, or raises a fresh ValueError with the cached
+    message for strings previously found invalid. Non-string input bypasses the cache.
+    """
+
+    def __init__(self, parser: Callable[[str], Any], maxsize: int):
+        super().__init__(maxsize)
+        self._parser = parser
+
+    def parse(self, raw: str) -> Any:
+        if self._maxsize == 0 or raw.__class__ is not str:
+            return self._parser(raw)
+
+        value = self.get(raw, _MISSING)
+        if value is _MISSING:
+            try:
+                value = self._parser(raw)
+            except ValueError as e:
+                self.put(raw, _InvalidInput(str(e)))
+                raise
+            self.put(raw, value)
+        elif value.__class__ is _InvalidInput:
+            raise ValueError(value.message)
+        return value
+
+
+def size_from_environment(variable: str, default: int = 0) -> int:
+    """Reads a size bound from an environment variable (default if unset or not an integer; negatives are 0)."""
+    raw = os.environ.get(variable, "")
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return default
+
+
+time_cache = ParseCache(Time, size_from_environment("TIMECALC_PARSE_CACHE_SIZE"))
+duration_cache = ParseCache(Duration, size_from_environment("TIMECALC_PARSE_CACHE_SIZE"))
+
+
+def cached_time(initial_time_str: str) -> Time:
+    """Returns Time(initial_time_str), served from the parse cache when it is enabled."""
+    return time_cache.parse(initial_time_str)
+
+
+def cached_duration(duration_str: str) -> Duration:
+    """Returns Duration(duration_str), served from the parse cache when it is enabled."""
+    return duration_cache.parse(duration_str)
+
+
+def configure_parse_cache(maxsize: Optional[int]) -> None:
+    """
+    Sets the bound of both parse caches. 0 or None disables them.
+    Existing entries beyond the new bound are evicted; counters are kept.
+    """
+    maxsize = maxsize or 0
+    time_cache.resize(maxsize)
+    duration_cache.resize(maxsize)
+
+
+def parse_cache_stats() -> Dict[str, CacheStats]:
+    """Returns the counters of the Time and Duration parse caches."""
+    return {"time": time_cache.stats(), "duration": duration_cache.stats()}
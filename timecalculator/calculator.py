@@ -1,5 +1,6 @@
 from typing import Optional
-from .core import Time, Duration
+from .cache import cached_time, cached_duration
+from .formatting import format_result
 
 # Removed re import as validation is now in core.py
 
@@ -27,8 +28,9 @@ def add_time(initial_time_str: str, duration_str: str, days_param: Optional[int]
 
   # Create Time and Duration objects. This step also handles validation.
   # ValueErrors from Time/Duration constructors will propagate up.
-  initial_time_obj = Time(initial_time_str)
-  duration_obj = Duration(duration_str)
+  # The parse cache (when enabled) returns the shared objects for repeated strings.
+  initial_time_obj = cached_time(initial_time_str)
+  duration_obj = cached_duration(duration_str)
 
   # Add the duration to the initial time using Time's __add__ method
   new_time_obj, days_passed_from_duration = initial_time_obj + duration_obj
@@ -38,12 +40,7 @@ def add_time(initial_time_str: str, duration_str: str, days_param: Optional[int]
   current_days_param = days_param if days_param is not None else 0
   total_days_passed = days_passed_from_duration + current_days_param
 
-  # Format the output string
-  result_time_str = str(new_time_obj) # Uses Time.__str__
-
-  if total_days_passed == 1:
-    result_time_str += ", 1 day later"
-  elif total_days_passed > 1:
-    result_time_str += f", {total_days_passed} days later"
+  # Format the output string ("H:MM AM/PM" plus ", N day(s) later" when applicable)
+  result_time_str = format_result(new_time_obj.minutes_from_midnight, total_days_passed)
 
   return result_time_str
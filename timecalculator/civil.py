@@ -0,0 +1,137 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Integer calendar arithmetic for the start_date path of the web API.
+#
+# An instant is a whole number of seconds since 1970-01-01 00:00 in the proleptic
+# Gregorian calendar (no time zones, no leap seconds), the same model as a naive
+# datetime. Dates convert to and from day numbers with Howard Hinnant's
+# days_from_civil / civil_from_days algorithms, and instants are formatted as
+# '%a, %Y-%m-%d %I:%M %p' from precomputed tables plus a small cache of date
+# prefixes. Results, accepted inputs and errors are identical to the
+# datetime.strptime / timedelta / strftime code this replaces, including the
+# supported range (years 1 to 9999).
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# The 400-year Gregorian cycle has 146097 days; eras start on March 1st so that the
+# leap day is the last day of a computational year.
+_DAYS_PER_ERA = 146097
+# Day number of 0000-03-01 relative to 1970-01-01.
+_EPOCH_SHIFT = 719468
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """Returns the day number (days since 1970-01-01) of a proleptic Gregorian date."""
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * _DAYS_PER_ERA + day_of_era - _EPOCH_SHIFT
+
+
+def civil_from_days(days: int) -> Tuple[int, int, int]:
+    """Returns the (year, month, day) of a day number (days since 1970-01-01)."""
+    days += _EPOCH_SHIFT
+    era = days // _DAYS_PER_ERA
+    day_of_era = days - era * _DAYS_PER_ERA
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = month_index + (3 if month_index < 10 else -9)
+    return year_of_era + era * 400 + (month <= 2), month, day
+
+
+MIN_DAY = days_from_civil(1, 1, 1)
+MAX_DAY = days_from_civil(9999, 12, 31)
+MIN_INSTANT = MIN_DAY * SECONDS_PER_DAY
+MAX_INSTANT = (MAX_DAY + 1) * SECONDS_PER_DAY - 1
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_before_month_day(leap_year: bool) -> Dict[str, int]:
+    """Maps "MM-DD" for every day of a year to the number of days before it in that year."""
+    table: Dict[str, int] = {}
+    for month in range(1, 13):
+        days_in_month = 29 if leap_year and month == 2 else _DAYS_IN_MONTH[month]
+        for day in range(1, days_in_month + 1):
+            table[f"{month:02d}-{day:02d}"] = len(table)
+    return table
+
+
+# A dictionary hit checks shape, digits and month/day range in one step.
+_COMMON_YEAR_DAYS_BEFORE = _days_before_month_day(False)
+_LEAP_YEAR_DAYS_BEFORE = _days_before_month_day(True)
+
+
+def _is_leap_year(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def parse_iso_date(date_str: str) -> int:
+    """
+    Parses a date as datetime.strptime(date_str, '%Y-%m-%d') would and returns its day number.
+
+    Valid strict "YYYY-MM-DD" dates with ASCII digits are handled directly; every
+    other input (single-digit fields, non-ASCII digits, invalid dates, ...) is
+    handed to strptime.
+
+    Raises:
+        ValueError: If strptime would reject the string.
+        TypeError: If date_str is not a string.
+    """
+    if date_str.__class__ is str and len(date_str) == 10 and date_str[4] == "-":
+        year_str = date_str[:4]
+        if year_str.isdigit() and year_str.isascii() and year_str != "0000":
+            year = int(year_str)
+            table = _LEAP_YEAR_DAYS_BEFORE if _is_leap_year(year) else _COMMON_YEAR_DAYS_BEFORE
+            days_before = table.get(date_str[5:])
+            if days_before is not None:
+                previous = year - 1
+                return MIN_DAY + previous * 365 + previous // 4 - previous // 100 + previous // 400 + days_before
+
+    # Everything else, including invalid dates, so that errors are strptime's own.
+    parsed = datetime.strptime(date_str, '%Y-%m-%d')
+    return days_from_civil(parsed.year, parsed.month, parsed.day)
+
+
+# "Mon, " ... "Sun, " indexed by weekday (Monday is 0), as strftime's "%a, " in the C locale.
+_WEEKDAY_PREFIXES: Tuple[str, ...] = ("Mon, ", "Tue, ", "Wed, ", "Thu, ", "Fri, ", "Sat, ", "Sun, ")
+
+
+def _clock_string(minutes_from_midnight: int) -> str:
+    """Formats minutes from midnight as strftime's "%I:%M %p" (used to build the table)."""
+    hours_24, minutes = divmod(minutes_from_midnight, 60)
+    return f"{(hours_24 - 1) % 12 + 1:02d}:{minutes:02d} {'AM' if hours_24 < 12 else 'PM'}"
+
+
+# "%I:%M %p" for every minute of the day, indexed by minutes from midnight.
+_CLOCK_STRINGS: Tuple[str, ...] = tuple(_clock_string(m) for m in range(24 * 60))
+
+
+@lru_cache(maxsize=4096)
+def _date_prefix(days: int) -> str:
+    """Formats a day number as strftime's "%a, %Y-%m-%d " (cached: traffic clusters around a few dates)."""
+    year, month, day = civil_from_days(days)
+    # 1970-01-01 was a Thursday (weekday 3).
+    return f"{_WEEKDAY_PREFIXES[(days + 3) % 7]}{year}-{month:02d}-{day:02d} "
+
+
+def format_instant(instant: int) -> str:
+    """
+    Formats seconds since 1970-01-01 00:00 as '%a, %Y-%m-%d %I:%M %p' (seconds are dropped).
+
+    Years are not zero-padded, matching strftime on glibc (e.g. "Mon, 1-01-01 12:00 AM").
+
+    Raises:
+        OverflowError: If the instant falls outside years 1 to 9999, where datetime
+            arithmetic would overflow.
+    """
+    if not MIN_INSTANT <= instant <= MAX_INSTANT:
+        raise OverflowError("date value out of range")
+    days, seconds_in_day = divmod(instant, SECONDS_PER_DAY)
+    return _date_prefix(days) + _CLOCK_STRINGS[seconds_in_day // 60]
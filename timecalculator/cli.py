@@ -1,33 +1,127 @@
 import argparse
+import os
 import sys
+from typing import List, Optional
 # Assuming core.py is in the same directory or Python path is set up correctly
 # For direct execution, Python might need `PYTHONPATH=.` or similar.
 # When run as a module (python -m timecalculator.cli), this should work.
-from .core import Time, Duration
+from .cache import cached_time, cached_duration, configure_parse_cache
+from .formatting import format_result
+from .streaming import FORMATS, detect_format, process_file_parallel, process_lines, write_lines
 
-def setup_parser() -> argparse.ArgumentParser:
-    """Sets up the argument parser for the CLI."""
-    parser = argparse.ArgumentParser(description="Add a duration to an initial time.")
+# Parse cache size used in batch mode when --parse-cache-size is not given;
+# batch inputs repeat the same strings heavily.
+BATCH_PARSE_CACHE_SIZE = 4096
+
+def setup_parser(prog: Optional[str] = None) -> argparse.ArgumentParser:
+    """Sets up the argument parser for the CLI. prog defaults to the script name."""
+    parser = argparse.ArgumentParser(prog=prog, description="Add a duration to an initial time.",
+                                     epilog="Run with 'stats --help' for statistics of many durations.")
     parser.add_argument("initial_time",
                         type=str,
+                        nargs="?",
                         help="The starting time in 'H:MM AM/PM' format (e.g., \"3:00 PM\").")
     parser.add_argument("duration",
                         type=str,
+                        nargs="?",
                         help="The duration to add. Formats: 'H:MM:SS', 'H:MM', 'D days, H:MM:SS', 'D days, H:MM', ':SS'. E.g., \"3:10\", \"1 day, 2:05:30\".")
     parser.add_argument("--days_offset",
                         type=int,
                         default=0,
                         help="Optional number of whole days to add to the result (default: 0).")
+    parser.add_argument("--parse-cache-size",
+                        type=int,
+                        default=None,
+                        help="Cache up to this many parsed time and duration strings each "
+                             "(default: TIMECALC_PARSE_CACHE_SIZE, or disabled; "
+                             f"{BATCH_PARSE_CACHE_SIZE} in batch mode).")
+    parser.add_argument("--batch",
+                        nargs="?",
+                        const="-",
+                        metavar="FILE",
+                        help="Process many records from FILE (or stdin when FILE is '-' or omitted) "
+                             "instead of a single initial_time/duration pair.")
+    parser.add_argument("--format",
+                        choices=FORMATS,
+                        help="Batch record format (default: from the file extension, else csv).")
+    parser.add_argument("--output",
+                        metavar="FILE",
+                        help="Write batch results to FILE instead of stdout.")
+    parser.add_argument("--workers",
+                        type=int,
+                        default=1,
+                        metavar="N",
+                        help="Process a batch FILE with N worker processes (default: 1). "
+                             "Output keeps the input order.")
     return parser
 
-def main():
-    """Main function for the CLI."""
-    parser = setup_parser()
-    args = parser.parse_args()
+def run_batch(args: argparse.Namespace) -> None:
+    """
+    Streams records from the batch input to the output, one result record per input record.
+    Per-record errors are written inline; only I/O problems raise.
+    """
+    from_stdin = args.batch == "-"
+    fmt = args.format or detect_format(None if from_stdin else args.batch)
+    if args.workers < 1:
+        raise ValueError("--workers must be at least 1.")
+    if args.workers > 1 and from_stdin:
+        raise ValueError("--workers requires --batch FILE (stdin cannot be split).")
 
+    source = sys.stdin if from_stdin else open(args.batch, encoding="utf-8", newline="")
     try:
-        start_time = Time(args.initial_time)
-        duration_to_add = Duration(args.duration)
+        destination = sys.stdout if args.output is None else open(
+            args.output, "w", encoding="utf-8", newline="", buffering=1 << 16)
+        try:
+            if args.workers > 1:
+                cache_size = (args.parse_cache_size if args.parse_cache_size is not None
+                              else BATCH_PARSE_CACHE_SIZE)
+                chunks = process_file_parallel(args.batch, fmt, args.days_offset, args.workers,
+                                               parse_cache_size=cache_size)
+                for chunk in chunks:
+                    destination.write(chunk)
+                destination.flush()
+            else:
+                write_lines(process_lines(source, fmt, args.days_offset), destination)
+        finally:
+            if destination is not sys.stdout:
+                destination.close()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
+    """Main function for the CLI. argv defaults to sys.argv[1:]; prog names the program in usage messages."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["stats"]:
+        from . import stats
+        stats.main(argv[1:], f"{prog or os.path.basename(sys.argv[0])} stats")
+        return
+
+    parser = setup_parser(prog)
+    args = parser.parse_args(argv)
+
+    if args.batch is not None:
+        if args.initial_time is not None:
+            parser.error("initial_time and duration cannot be combined with --batch")
+        try:
+            configure_parse_cache(args.parse_cache_size if args.parse_cache_size is not None
+                                  else BATCH_PARSE_CACHE_SIZE)
+            run_batch(args)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.initial_time is None or args.duration is None:
+        parser.error("initial_time and duration are required unless --batch is given")
+
+    try:
+        if args.parse_cache_size is not None:
+            configure_parse_cache(args.parse_cache_size)
+
+        start_time = cached_time(args.initial_time)
+        duration_to_add = cached_duration(args.duration)
 
         # The days_offset is added *after* the Time + Duration calculation.
         # Time + Duration already handles days passed from the duration itself.
@@ -35,12 +129,7 @@ def main():
 
         total_days_passed = days_passed_from_duration + args.days_offset
 
-        result_str = str(end_time)
-
-        if total_days_passed == 1:
-            result_str += ", 1 day later"
-        elif total_days_passed > 1:
-            result_str += f", {total_days_passed} days later"
+        result_str = format_result(end_time.minutes_from_midnight, total_days_passed)
 
         print(result_str)
 
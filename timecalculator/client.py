@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import socket
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from typing import List, Optional, Tuple
+
+# Thin command-line client for the calculator daemon (timecalculator.daemon).
+#
+# `python -m timecalculator.client ARGS` accepts the same arguments as
+# `python -m timecalculator.cli`. It forwards them to a running daemon over a Unix
+# domain socket and prints the reply, so each call skips importing and warming up
+# the calculator. When no daemon is listening, for --batch and stats runs (which
+# read local files and stdin) and for --parse-cache-size (which would resize the
+# daemon's caches for every later client), the CLI is run in-process instead.
+#
+# Only a few small standard-library modules are imported at module level; the
+# calculator itself is imported on the fallback path only. Single calculations are
+# side-effect free, so a request that fails part-way is simply re-run in-process.
+#
+# Protocol: the client sends one JSON line {"argv": [...], "prog": str}, where prog
+# is the program name for usage messages; the daemon replies
+# with one JSON line {"stdout": str, "stderr": str, "status": int}.
+
+CONNECT_TIMEOUT = 1.0
+# Generous, so a busy daemon is not mistaken for a dead one.
+REPLY_TIMEOUT = 30.0
+
+
+def default_socket_path() -> str:
+    """Socket path from TIMECALC_DAEMON_SOCKET, else a per-user path in XDG_RUNTIME_DIR or /tmp."""
+    configured = os.environ.get("TIMECALC_DAEMON_SOCKET")
+    if configured:
+        return configured
+    directory = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(directory, f"timecalculator-{os.getuid()}.sock")
+
+
+# CLI options that only make sense in the calling process.
+LOCAL_OPTIONS = ("--batch", "--parse-cache-size")
+
+
+def _may_name_local_option(arg: str) -> bool:
+    """Whether arg could be one of LOCAL_OPTIONS, in full or abbreviated as argparse allows."""
+    name = arg.split("=", 1)[0]
+    return len(name) > 2 and any(option.startswith(name) for option in LOCAL_OPTIONS)
+
+
+def local_option(argv: List[str]) -> Optional[str]:
+    """
+    The first of LOCAL_OPTIONS that argv gives, as the CLI's own parser reads it
+    (so abbreviations count, and arguments after "--" do not), or None.
+    """
+    # Importing the parser means importing the calculator, so it is skipped for
+    # the usual calls, where nothing could name a local option.
+    if not any(_may_name_local_option(arg) for arg in argv):
+        return None
+    from .cli import setup_parser
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            args, _ = setup_parser().parse_known_args(argv)
+    except SystemExit:
+        # A usage error (or --help): the CLI stops before running anything.
+        return None
+    for option in LOCAL_OPTIONS:
+        if getattr(args, option[2:].replace("-", "_")) is not None:
+            return option
+    return None
+
+
+def local_reason(argv: List[str]) -> Optional[str]:
+    """
+    Why argv must run in the calling process, or None if the daemon can run it:
+    "stats" (it reads the caller's files and stdin) or one of LOCAL_OPTIONS.
+    """
+    if argv[:1] == ["stats"]:
+        return "stats"
+    return local_option(argv)
+
+
+def _forwardable(argv: List[str]) -> bool:
+    """Whether the daemon can run these arguments (see local_reason)."""
+    return local_reason(argv) is None
+
+
+def request(argv: List[str], socket_path: Optional[str] = None, prog: Optional[str] = None) -> Tuple[str, str, int]:
+    """
+    Runs the CLI with argv in the daemon.
+
+    Returns:
+        (stdout, stderr, exit status) of the run.
+
+    Raises:
+        OSError: If no daemon is listening on the socket or the connection fails.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path or default_socket_path())
+        sock.settimeout(REPLY_TIMEOUT)
+        sock.sendall(json.dumps({"argv": argv, "prog": prog}).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without replying.")
+    reply = json.loads(line)
+    return reply["stdout"], reply["stderr"], reply["status"]
+
+
+def _run_in_process(argv: List[str], prog: str) -> None:
+    from .cli import main as cli_main
+    cli_main(argv, prog)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point: forwards argv to the daemon, or runs the CLI in-process if none is running."""
+    if argv is None:
+        argv = sys.argv[1:]
+    prog = os.path.basename(sys.argv[0])
+    if not _forwardable(argv):
+        _run_in_process(argv, prog)
+        return
+    try:
+        stdout, stderr, status = request(argv, prog=prog)
+    except OSError:
+        _run_in_process(argv, prog)
+        return
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.stdout.flush()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
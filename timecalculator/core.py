@@ -1,13 +1,28 @@
-import re
 from typing import Tuple, Optional
 
+from .formatting import CLOCK_STRINGS, format_duration
+from .parsing import parse_duration, parse_time
+
+# Duration flag bits recording which form the duration string had.
+# When _HAS_DAYS is set, the parsed day count is stored above the flag bits.
+_HAS_DAYS = 1
+_SECONDS_ONLY = 2
+_FLAG_BITS = 2
+
 class Duration:
     """
     Represents a duration of time.
     Can be initialized from formats like "H:MM:SS", "H:MM", "D days, H:MM:SS",
     "D days, H:MM", or ":SS".
+
+    Duration is an immutable, hashable value type. It stores only the total number of
+    seconds and a small flags field describing the input form; the parsed components
+    (days_part, hours_part, ...) are derived from those on demand. Durations compare
+    and hash by total_seconds.
     """
 
+    __slots__ = ('_total_seconds', '_flags')
+
     def __init__(self, duration_str: str):
         """
         Initializes a Duration object from a string.
@@ -24,134 +39,178 @@ class Duration:
         Raises:
             ValueError: For invalid formats or out-of-range components.
         """
-        self._parsed_days: Optional[int] = None
-        self._parsed_hours: Optional[int] = None
-        self._parsed_minutes: Optional[int] = None
-        self._parsed_seconds: Optional[int] = None
-
-        total_d = 0
-        total_h = 0
-        total_m = 0
-        total_s = 0
-
-        # Pattern 1: Matches optional days part, then hours, minutes, and optional seconds.
-        # - (?:(\d+)\s+days?,\s+)? : Optional non-capturing group for "D days, " part. \d+ captures day number.
-        # - (\d+): Capturing group for hours (allows multiple digits like "48" for 48 hours).
-        # - :(\d{1,2}): Capturing group for minutes (1 or 2 digits).
-        # - (?::(\d{1,2}))? : Optional non-capturing group for ":SS" part. \d{1,2} captures seconds.
-        pat1 = re.compile(r"^(?:(\d+)\s+days?,\s+)?(\d+):(\d{1,2})(?::(\d{1,2}))?$")
-        match1 = pat1.fullmatch(duration_str)
-
-        # Pattern 2: Matches only seconds, formatted as ":SS".
-        # - :(\d{1,2})$ : Capturing group for seconds (1 or 2 digits).
-        pat2 = re.compile(r"^:(\d{1,2})$")
-        match2 = pat2.fullmatch(duration_str)
-
-        if match1:
-            days_str, hours_str, minutes_str, seconds_str = match1.groups()
-            if days_str:
-                total_d = int(days_str)
-                self._parsed_days = total_d
-
-            total_h = int(hours_str) # Required for this pattern
-            self._parsed_hours = total_h
-
-            total_m = int(minutes_str) # Required for this pattern
-            self._parsed_minutes = total_m
-
-            if seconds_str:
-                total_s = int(seconds_str)
-                self._parsed_seconds = total_s
-            elif self._parsed_minutes is not None: # If H:MM format, seconds is 0
-                self._parsed_seconds = 0
-
-        elif match2:
-            seconds_str, = match2.groups()
-            total_s = int(seconds_str)
-            self._parsed_seconds = total_s
-            # For ":SS" format, other parsed components remain 0 or None
-            self._parsed_days = 0
-            self._parsed_hours = 0
-            self._parsed_minutes = 0
+        days, hours, minutes, seconds = parse_duration(duration_str)
+
+        if days is None:
+            flags = 0
+            total_seconds = hours * 60 * 60 + minutes * 60 + seconds
+        elif duration_str[0] == ":":
+            # ":SS" reports zero days, hours and minutes rather than None.
+            flags = _SECONDS_ONLY
+            total_seconds = seconds
         else:
-            raise ValueError(f"Invalid duration string format: {duration_str}")
-
-        # Validate component ranges
-        if self._parsed_days is not None and self._parsed_days < 0:
-            raise ValueError("Days component must be non-negative.")
-        if self._parsed_hours is not None and self._parsed_hours < 0:
-            raise ValueError("Hours component must be non-negative.")
-        if self._parsed_minutes is not None and not (0 <= self._parsed_minutes <= 59):
-            raise ValueError("Minutes component must be between 0 and 59.")
-        if self._parsed_seconds is not None and not (0 <= self._parsed_seconds <= 59):
-            raise ValueError("Seconds component must be between 0 and 59.")
-
-        # Use the directly parsed values for calculation if they were part of the string
-        # Fallback to total_x if a component was not explicitly parsed (e.g. H in :SS)
-        calc_d = self._parsed_days if self._parsed_days is not None else 0
-        calc_h = self._parsed_hours if self._parsed_hours is not None else 0
-        calc_m = self._parsed_minutes if self._parsed_minutes is not None else 0
-        calc_s = self._parsed_seconds if self._parsed_seconds is not None else 0
-
-        self._total_seconds: int = (calc_d * 24 * 60 * 60 +
-                                   calc_h * 60 * 60 +
-                                   calc_m * 60 +
-                                   calc_s)
+            flags = (days << _FLAG_BITS) | _HAS_DAYS
+            total_seconds = days * 24 * 60 * 60 + hours * 60 * 60 + minutes * 60 + seconds
+
+        object.__setattr__(self, '_total_seconds', total_seconds)
+        object.__setattr__(self, '_flags', flags)
+
+    @classmethod
+    def _from_state(cls, total_seconds: int, flags: int) -> 'Duration':
+        """Internal constructor from already-validated stored state (used by pickling)."""
+        duration_obj = cls.__new__(cls)
+        object.__setattr__(duration_obj, '_total_seconds', total_seconds)
+        object.__setattr__(duration_obj, '_flags', flags)
+        return duration_obj
+
+    @classmethod
+    def from_seconds(cls, total_seconds: int) -> 'Duration':
+        """
+        Creates a Duration of total_seconds (a non-negative integer).
+        Its parts are reported as for an "H:MM:SS" string: days_part is None and
+        hours_part holds the whole hours.
+        """
+        if not isinstance(total_seconds, int) or isinstance(total_seconds, bool):
+            raise TypeError("total_seconds for Duration.from_seconds must be an integer.")
+        if total_seconds < 0:
+            raise ValueError("total_seconds for Duration.from_seconds must not be negative.")
+        return cls._from_state(total_seconds, 0)
 
     @property
     def total_seconds(self) -> int:
         """Returns the duration in total seconds."""
         return self._total_seconds
 
-    # Properties to return parsed components
+    # Properties to return parsed components, derived from total seconds and flags
     @property
     def days_part(self) -> Optional[int]:
         """Returns the days component parsed from input string, or None if not specified."""
-        return self._parsed_days
+        if self._flags & _HAS_DAYS:
+            return self._flags >> _FLAG_BITS
+        if self._flags & _SECONDS_ONLY:
+            return 0
+        return None
 
     @property
     def hours_part(self) -> Optional[int]:
         """Returns the hours component parsed from input string, or None if not specified."""
-        return self._parsed_hours
+        days = self._flags >> _FLAG_BITS
+        return (self._total_seconds - days * 24 * 60 * 60) // (60 * 60)
 
     @property
     def minutes_part(self) -> Optional[int]:
         """Returns the minutes component parsed from input string, or None if not specified."""
-        return self._parsed_minutes
+        return self._total_seconds // 60 % 60
 
     @property
     def seconds_part(self) -> Optional[int]:
         """Returns the seconds component parsed from input string, or None if not specified."""
-        return self._parsed_seconds
+        return self._total_seconds % 60
 
     def __str__(self) -> str:
         """Returns the duration canonically as 'D days, H:MM:SS' from total seconds."""
-        if self._total_seconds == 0:
-            return "0:00:00" # Or "0 days, 0:00:00" for full consistency
-
-        calc_d = self._total_seconds // (24 * 60 * 60)
-        remaining_secs = self._total_seconds % (24 * 60 * 60)
-        calc_h = remaining_secs // (60 * 60)
-        remaining_secs %= (60 * 60)
-        calc_m = remaining_secs // 60
-        calc_s = remaining_secs % 60
-
-        if calc_d > 0:
-            day_str = f"{calc_d} day{'s' if calc_d > 1 else ''}, "
-        else:
-            day_str = ""
-        return f"{day_str}{calc_h}:{str(calc_m).zfill(2)}:{str(calc_s).zfill(2)}"
+        return format_duration(self._total_seconds)
 
     def __repr__(self) -> str:
         """Returns a string representation of the Duration object."""
         return f'Duration(total_seconds={self._total_seconds})'
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return self._total_seconds == other._total_seconds
+
+    def __hash__(self) -> int:
+        return hash(self._total_seconds)
+
+    def __lt__(self, other: 'Duration') -> bool:
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return self._total_seconds < other._total_seconds
+
+    def __le__(self, other: 'Duration') -> bool:
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return self._total_seconds <= other._total_seconds
+
+    def __gt__(self, other: 'Duration') -> bool:
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return self._total_seconds > other._total_seconds
+
+    def __ge__(self, other: 'Duration') -> bool:
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return self._total_seconds >= other._total_seconds
+
+    # Arithmetic results are built from total seconds, so they report their parts
+    # like Duration.from_seconds does, whatever form the operands were parsed from.
+
+    def __add__(self, other: 'Duration') -> 'Duration':
+        """Returns the sum of two Durations."""
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return Duration._from_state(self._total_seconds + other._total_seconds, 0)
+
+    def __radd__(self, other: int) -> 'Duration':
+        """Lets the built-in sum() start from 0: sum(durations) is a Duration."""
+        if other.__class__ is int and other == 0:
+            return Duration._from_state(self._total_seconds, 0)
+        return NotImplemented
+
+    def __sub__(self, other: 'Duration') -> 'Duration':
+        """
+        Returns the difference of two Durations.
+
+        Raises:
+            ValueError: If other is longer than this Duration.
+        """
+        if not isinstance(other, Duration):
+            return NotImplemented
+        total_seconds = self._total_seconds - other._total_seconds
+        if total_seconds < 0:
+            raise ValueError("Cannot subtract a longer Duration from a shorter one.")
+        return Duration._from_state(total_seconds, 0)
+
+    def __mul__(self, factor: int) -> 'Duration':
+        """
+        Returns this Duration repeated factor times.
+
+        Raises:
+            ValueError: If factor is negative.
+        """
+        if not isinstance(factor, int) or isinstance(factor, bool):
+            return NotImplemented
+        if factor < 0:
+            raise ValueError("A Duration can only be multiplied by a non-negative integer.")
+        return Duration._from_state(self._total_seconds * factor, 0)
+
+    __rmul__ = __mul__
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Duration objects are immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Duration objects are immutable.")
+
+    def __reduce__(self):
+        return (Duration._from_state, (self._total_seconds, self._flags))
+
 class Time:
-    """Represents a specific point in time on a 24-hour clock."""
+    """
+    Represents a specific point in time on a 24-hour clock.
+
+    Time is an immutable, hashable value type with minute precision. A day has only
+    1440 distinct minutes, so instances are never allocated after import: parsing a
+    string, calling from_minutes/from_seconds or adding a Duration all return the
+    shared instance for that minute from a precomputed table.
+    """
 
-    def __init__(self, initial_time_str: str):
+    __slots__ = ('_minutes_from_midnight',)
+
+    def __new__(cls, initial_time_str: str) -> 'Time':
         """
-        Initializes a Time object from a string.
+        Returns the Time for a time string.
 
         Args:
             initial_time_str: The time string, supporting two formats:
@@ -166,66 +225,7 @@ class Time:
             ValueError: If initial_time_str does not match either format,
                         if components are not integers, or if hours/minutes are out of valid range.
         """
-        # Pattern for "H:MM AM/PM" (12-hour format).
-        # - ^(\d{1,2}): Start, hours (1 or 2 digits).
-        # - :(\d{2}): Minutes (exactly 2 digits).
-        # - \s+(AM|PM)$: Space, then AM or PM (case-insensitive due to flag).
-        pat_12hr = re.compile(r"^(\d{1,2}):(\d{2})\s+(AM|PM)$", re.IGNORECASE)
-
-        # Pattern for "HH:MM" (24-hour format).
-        # - ^(\d{1,2}): Start, hours (1 or 2 digits).
-        # - :(\d{2})$: Minutes (exactly 2 digits), end.
-        pat_24hr = re.compile(r"^(\d{1,2}):(\d{2})$")
-
-        match_12hr = pat_12hr.fullmatch(initial_time_str)
-        match_24hr = pat_24hr.fullmatch(initial_time_str)
-
-        if match_12hr:
-            h_str, m_str, period_str = match_12hr.groups()
-            period = period_str.upper()
-
-            try:
-                hours_12 = int(h_str)
-                minutes = int(m_str)
-            except ValueError: # Should not happen if regex matches digits, but good practice
-                raise ValueError("Time hours and minutes must be valid integers.")
-
-            if not (1 <= hours_12 <= 12):
-                raise ValueError("Time hours must be between 1 and 12 for AM/PM format.")
-            if not (0 <= minutes <= 59):
-                raise ValueError("Time minutes must be between 00 and 59.")
-
-            # Convert to 24-hour format for internal storage
-            hours_24 = hours_12
-            if period == 'AM':
-                if hours_12 == 12:  # 12 AM (midnight) is 0 hours
-                    hours_24 = 0
-            elif period == 'PM':
-                if hours_12 != 12:  # For 1 PM to 11 PM, add 12 hours
-                    hours_24 += 12
-                # For 12 PM (noon), hours_24 remains 12 (no change from initial hours_12)
-
-            self._minutes_from_midnight: int = hours_24 * 60 + minutes
-
-        elif match_24hr:
-            h_str, m_str = match_24hr.groups()
-            try:
-                hours_24 = int(h_str)
-                minutes = int(m_str)
-            except ValueError: # Should not happen
-                raise ValueError("Time hours and minutes must be valid integers.")
-
-            if not (0 <= hours_24 <= 23):
-                raise ValueError("Time hours must be between 0 and 23 for HH:MM format.")
-            if not (0 <= minutes <= 59):
-                raise ValueError("Time minutes must be between 00 and 59.") # Consistent message
-
-            self._minutes_from_midnight: int = hours_24 * 60 + minutes
-        else:
-            raise ValueError("Initial time must be in H:MM AM/PM or HH:MM format.")
-
-        # self._initial_time_str = initial_time_str # Optional: store original for repr if needed
-
+        return _TIME_TABLE[parse_time(initial_time_str)]
 
     @classmethod
     def from_minutes(cls, total_minutes_from_midnight: int) -> 'Time':
@@ -235,20 +235,25 @@ class Time:
         """
         if not (0 <= total_minutes_from_midnight <= 1439): # 1439 = 24*60 - 1
             raise ValueError("total_minutes_from_midnight for Time.from_minutes must be between 0 and 1439.")
+        return cls._from_valid_minutes(total_minutes_from_midnight)
 
-        hours_24 = total_minutes_from_midnight // 60
-        minutes = total_minutes_from_midnight % 60
-
-        period = "AM" if hours_24 < 12 else "PM"
-
-        display_hours_12 = hours_24 % 12
-        if display_hours_12 == 0:  # 00:xx (midnight) or 12:xx (noon)
-            display_hours_12 = 12
+    @classmethod
+    def from_seconds(cls, total_seconds_from_midnight: int) -> 'Time':
+        """
+        Creates a Time object from total seconds from midnight (0-86399).
+        Seconds are truncated, as Time operates at minute precision.
+        """
+        if not (0 <= total_seconds_from_midnight <= 86399): # 86399 = 24*60*60 - 1
+            raise ValueError("total_seconds_from_midnight for Time.from_seconds must be between 0 and 86399.")
+        return cls._from_valid_minutes(total_seconds_from_midnight // 60)
 
-        # Construct the string and use main __init__ for consistency and validation
-        # This ensures the internal state is always set via the same validation path.
-        time_str = f"{display_hours_12}:{str(minutes).zfill(2)} {period}"
-        return cls(time_str)
+    @classmethod
+    def _from_valid_minutes(cls, total_minutes_from_midnight: int) -> 'Time':
+        """
+        Internal constructor for minute values already known to be in 0-1439.
+        Skips string formatting and parsing entirely; callers are responsible for the range.
+        """
+        return _TIME_TABLE[total_minutes_from_midnight]
 
     @property
     def minutes_from_midnight(self) -> int:
@@ -271,32 +276,48 @@ class Time:
         if not isinstance(other, Duration):
             return NotImplemented
 
-        current_time_seconds_from_midnight = self.minutes_from_midnight * 60
-        new_total_seconds_overall = current_time_seconds_from_midnight + other.total_seconds
+        new_total_seconds_overall = self._minutes_from_midnight * 60 + other.total_seconds
+        days_passed, final_new_time_total_seconds_within_day = divmod(new_total_seconds_overall, 24 * 60 * 60)
 
-        days_passed = new_total_seconds_overall // (24 * 60 * 60)
-        final_new_time_total_seconds_within_day = new_total_seconds_overall % (24 * 60 * 60)
-
-        # Time class operates on minute precision, so truncate seconds for the new Time object's state
-        final_new_time_minutes = final_new_time_total_seconds_within_day // 60
-
-        new_time_obj = Time.from_minutes(final_new_time_minutes)
+        # Time class operates on minute precision, so truncate seconds for the new Time object's state.
+        # The remainder is always within 0-86399, so it indexes the shared table directly.
+        new_time_obj = _TIME_TABLE[final_new_time_total_seconds_within_day // 60]
         return new_time_obj, days_passed
 
     def __str__(self) -> str:
         """Returns the time in "H:MM AM/PM" format (e.g., "1:30 PM")."""
-        hours_24 = self._minutes_from_midnight // 60
-        minutes = self._minutes_from_midnight % 60
-
-        period = "AM" if hours_24 < 12 else "PM"
-
-        # Convert 24-hour format to 12-hour format for display
-        display_hours_12 = hours_24 % 12
-        if display_hours_12 == 0:  # Handles 12 AM (00:xx which is 12 AM) and 12 PM (12:xx which is 12 PM)
-            display_hours_12 = 12
-
-        return f"{display_hours_12}:{str(minutes).zfill(2)} {period}"
+        return CLOCK_STRINGS[self._minutes_from_midnight]
 
     def __repr__(self) -> str:
         """Returns a string representation of the Time object, e.g., Time("1:30 PM")."""
         return f'Time("{self.__str__()}")'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self._minutes_from_midnight == other._minutes_from_midnight
+
+    def __hash__(self) -> int:
+        return hash(self._minutes_from_midnight)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Time objects are immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Time objects are immutable.")
+
+    def __reduce__(self):
+        """Pickles and copies resolve back to the shared instance for the same minute."""
+        return (Time.from_minutes, (self._minutes_from_midnight,))
+
+
+def _build_time_table() -> Tuple[Time, ...]:
+    """Creates the one Time instance for each minute of the day."""
+    table = []
+    for minutes in range(24 * 60):
+        time_obj = object.__new__(Time)
+        object.__setattr__(time_obj, '_minutes_from_midnight', minutes)
+        table.append(time_obj)
+    return tuple(table)
+
+_TIME_TABLE: Tuple[Time, ...] = _build_time_table()
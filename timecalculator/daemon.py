@@ -0,0 +1,197 @@
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional
+
+from . import cli
+from .cache import configure_parse_cache
+from .client import default_socket_path, local_reason
+
+# A warm, long-running process that executes CLI invocations for
+# timecalculator.client over a Unix domain socket.
+#
+# Interpreter startup, imports, regex compilation and the precomputed tables are
+# paid once when the daemon starts; each request then costs one socket round trip
+# plus the calculation itself. Requests are served one at a time, which keeps the
+# stdout/stderr capture around cli.main() safe; a single calculation takes
+# microseconds, so this is not a bottleneck.
+
+# Parse cache size used by the daemon when --parse-cache-size is not given; a
+# long-lived process sees the same strings over and over.
+DAEMON_PARSE_CACHE_SIZE = 4096
+
+# Upper bound on one request line, so a misbehaving client cannot make the daemon
+# buffer without limit.
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def _exit_status(code: Any) -> int:
+    """Converts a SystemExit code to a process exit status, printing string codes like Python does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_cli(argv: List[str], prog: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs cli.main(argv) in this process, capturing its output and exit status.
+
+    Returns:
+        {"stdout": str, "stderr": str, "status": int}
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    status = 0
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            cli.main(argv, prog)
+        except SystemExit as e:
+            status = _exit_status(e.code)
+        except Exception:
+            traceback.print_exc()
+            status = 1
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "status": status}
+
+
+def _decode_request(line: bytes) -> Dict[str, Any]:
+    """Validates one request line and returns it as a dict, raising ValueError if malformed."""
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError("'argv' must be a list of strings")
+    prog = request.get("prog")
+    if prog is not None and not isinstance(prog, str):
+        raise ValueError("'prog' must be a string")
+    return request
+
+
+class _CLIRequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request line, runs the CLI and writes one JSON reply line."""
+
+    # Seconds a client may take to send its request before it is dropped.
+    timeout = 5
+
+    def handle(self) -> None:
+        try:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+        except socket.timeout:
+            return
+        if not line:
+            return
+        try:
+            request = _decode_request(line)
+        except ValueError as e:
+            reply = {"stdout": "", "stderr": f"Error: Malformed daemon request: {e}\n", "status": 2}
+        else:
+            reason = local_reason(request["argv"])
+            if reason is not None:
+                # What the client runs in-process: reading the daemon's stdin or files relative to
+                # its directory, or resizing caches shared by every client, is refused here too.
+                reply = {"stdout": "", "stderr": f"Error: {reason} cannot be sent to the daemon.\n", "status": 2}
+            else:
+                reply = run_cli(request["argv"], request.get("prog"))
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+def _claim_socket_path(socket_path: str) -> None:
+    """
+    Removes a stale socket left behind by a daemon that did not shut down cleanly.
+
+    Raises:
+        OSError: If another daemon is listening on socket_path, or the path exists
+            and is not a socket.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{socket_path} exists and is not a socket.")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path)
+            return
+    raise OSError(f"A daemon is already listening on {socket_path}.")
+
+
+class CalculatorDaemon(socketserver.UnixStreamServer):
+    """
+    Serves CLI invocations on a Unix domain socket.
+
+    The socket file is created readable and writable by the current user only,
+    and removed again by server_close().
+    """
+
+    def __init__(self, socket_path: str):
+        _claim_socket_path(socket_path)
+        self.socket_path = socket_path
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _CLIRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def setup_parser() -> argparse.ArgumentParser:
+    """Sets up the argument parser for the daemon."""
+    parser = argparse.ArgumentParser(description="Serve timecalculator CLI requests from a warm process.")
+    parser.add_argument("--socket",
+                        metavar="PATH",
+                        help="Unix socket to listen on (default: TIMECALC_DAEMON_SOCKET, "
+                             "else timecalculator-<uid>.sock in XDG_RUNTIME_DIR or /tmp).")
+    parser.add_argument("--parse-cache-size",
+                        type=int,
+                        default=DAEMON_PARSE_CACHE_SIZE,
+                        help=f"Cache up to this many parsed time and duration strings each "
+                             f"(default: {DAEMON_PARSE_CACHE_SIZE}).")
+    return parser
+
+
+def _stop(signum, frame) -> None:
+    sys.exit(0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the daemon until it receives SIGINT or SIGTERM."""
+    args = setup_parser().parse_args(argv)
+    socket_path = args.socket or default_socket_path()
+    try:
+        configure_parse_cache(args.parse_cache_size)
+        server = CalculatorDaemon(socket_path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    signal.signal(signal.SIGTERM, _stop)
+    print(f"Listening on {socket_path}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
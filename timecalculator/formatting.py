@@ -0,0 +1,61 @@
+from typing import Tuple
+
+# Precomputed string tables for formatting results.
+#
+# A Time has 1440 possible values and the sub-hour part of a Duration has 3600, so
+# both are formatted once at import time. Formatting a result is then a table lookup
+# plus at most one concatenation for the common cases.
+
+def _clock_string(minutes_from_midnight: int) -> str:
+    """Formats minutes from midnight as "H:MM AM/PM" (used to build the table)."""
+    hours_24, minutes = divmod(minutes_from_midnight, 60)
+    period = "AM" if hours_24 < 12 else "PM"
+    display_hours_12 = hours_24 % 12
+    if display_hours_12 == 0:  # 00:xx (midnight) and 12:xx (noon) display as 12
+        display_hours_12 = 12
+    return f"{display_hours_12}:{minutes:02d} {period}"
+
+# "H:MM AM/PM" for every minute of the day, indexed by minutes from midnight.
+CLOCK_STRINGS: Tuple[str, ...] = tuple(_clock_string(m) for m in range(24 * 60))
+
+# ":MM:SS" for every second within an hour, indexed by seconds past the hour.
+_MINUTE_SECOND_SUFFIXES: Tuple[str, ...] = tuple(f":{m:02d}:{s:02d}" for m in range(60) for s in range(60))
+
+# Hours of the final day of a duration, "0" to "23".
+_HOUR_STRINGS: Tuple[str, ...] = tuple(str(h) for h in range(24))
+
+# ", N days later" suffixes for the first year of day offsets; larger offsets are formatted on demand.
+_DAYS_LATER_SUFFIXES: Tuple[str, ...] = ("", ", 1 day later") + tuple(f", {d} days later" for d in range(2, 366))
+
+
+def format_clock(minutes_from_midnight: int) -> str:
+    """Returns "H:MM AM/PM" for minutes from midnight (0-1439)."""
+    return CLOCK_STRINGS[minutes_from_midnight]
+
+
+def format_duration(total_seconds: int) -> str:
+    """Returns a non-negative number of seconds canonically as 'D days, H:MM:SS' (days omitted when 0)."""
+    if total_seconds < 24 * 60 * 60:
+        hours, seconds_in_hour = divmod(total_seconds, 60 * 60)
+        return _HOUR_STRINGS[hours] + _MINUTE_SECOND_SUFFIXES[seconds_in_hour]
+
+    days, seconds_in_day = divmod(total_seconds, 24 * 60 * 60)
+    hours, seconds_in_hour = divmod(seconds_in_day, 60 * 60)
+    day_str = "1 day, " if days == 1 else f"{days} days, "
+    return day_str + _HOUR_STRINGS[hours] + _MINUTE_SECOND_SUFFIXES[seconds_in_hour]
+
+
+def days_later_suffix(total_days_passed: int) -> str:
+    """Returns ", 1 day later" / ", N days later", or "" when no whole day has passed."""
+    if total_days_passed < 1:
+        return ""
+    if total_days_passed < len(_DAYS_LATER_SUFFIXES):
+        return _DAYS_LATER_SUFFIXES[total_days_passed]
+    return f", {total_days_passed} days later"
+
+
+def format_result(minutes_from_midnight: int, total_days_passed: int) -> str:
+    """Formats a calculation result as "H:MM AM/PM" plus the days-later suffix, if any."""
+    if 0 <= total_days_passed < len(_DAYS_LATER_SUFFIXES):
+        return CLOCK_STRINGS[minutes_from_midnight] + _DAYS_LATER_SUFFIXES[total_days_passed]
+    return CLOCK_STRINGS[minutes_from_midnight] + days_later_suffix(total_days_passed)
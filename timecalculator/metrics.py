@@ -0,0 +1,131 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from .cache import CacheStats
+
+# In-process request metrics, exposed in the Prometheus text format.
+#
+# The web front ends record every request (route, method, status and latency)
+# and the service records which input a rejected calculation failed to parse.
+# Recording is a bisect and a few dict updates under one lock, about a
+# microsecond, so the metrics are always on. Latency histograms use fixed
+# buckets; counts are kept per bucket and made cumulative when rendered.
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the latency histogram buckets, plus an implicit +Inf.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+# Route label for requests that matched no route (404s and 405s).
+UNMATCHED_ROUTE = "unmatched"
+
+# Inputs whose parse errors are counted separately.
+PARSE_ERROR_INPUTS = ("time", "duration", "start_date")
+
+_NAMESPACE = "timecalc"
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Thread-safe request and parse error counters with per-route latency histograms."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        # route -> [count per bucket..., count above the last bucket]
+        self._latency_buckets: Dict[str, List[int]] = {}
+        self._latency_sums: Dict[str, float] = {}
+        self._parse_errors: Dict[str, int] = dict.fromkeys(PARSE_ERROR_INPUTS, 0)
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float) -> None:
+        """Records one handled request. route is the route pattern, not the raw path."""
+        index = bisect_left(self.buckets, seconds)
+        key = (route, method, status)
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            counts = self._latency_buckets.get(route)
+            if counts is None:
+                counts = self._latency_buckets[route] = [0] * (len(self.buckets) + 1)
+                self._latency_sums[route] = 0.0
+            counts[index] += 1
+            self._latency_sums[route] += seconds
+
+    def count_parse_error(self, failed_input: str) -> None:
+        """Records a calculation rejected because failed_input (one of PARSE_ERROR_INPUTS) did not parse."""
+        with self._lock:
+            self._parse_errors[failed_input] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._latency_buckets.clear()
+            self._latency_sums.clear()
+            self._parse_errors = dict.fromkeys(PARSE_ERROR_INPUTS, 0)
+
+    def render(self, caches: Mapping[str, CacheStats]) -> str:
+        """The metrics, plus the counters of the given caches, in the Prometheus text format."""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            latency = sorted((route, list(counts), self._latency_sums[route])
+                             for route, counts in self._latency_buckets.items())
+            parse_errors = dict(self._parse_errors)
+
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{_NAMESPACE}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        name = family("http_requests_total", "counter", "HTTP requests handled, by route, method and status.")
+        for (route, method, status), count in requests:
+            lines.append(f"{name}{_labels(route=route, method=method, status=status)} {count}")
+
+        name = family("http_request_duration_seconds", "histogram", "Time to handle an HTTP request, by route.")
+        for route, counts, total in latency:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{name}_bucket{_labels(route=route, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(route=route)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(route=route)} {cumulative}")
+
+        name = family("parse_errors_total", "counter", "Calculations rejected because an input did not parse, by input.")
+        for failed_input in PARSE_ERROR_INPUTS:
+            lines.append(f"{name}{_labels(input=failed_input)} {parse_errors[failed_input]}")
+
+        cache_families = (
+            ("cache_hits_total", "counter", "Cache lookups served from the cache.", lambda s: s.hits),
+            ("cache_misses_total", "counter", "Cache lookups not found in the cache.", lambda s: s.misses),
+            ("cache_evictions_total", "counter", "Entries evicted to stay within the cache bound.", lambda s: s.evictions),
+            ("cache_size", "gauge", "Entries currently held.", lambda s: s.size),
+            ("cache_maxsize", "gauge", "Bound on the number of entries (0 means disabled).", lambda s: s.maxsize),
+            ("cache_hit_ratio", "gauge", "Fraction of lookups served from the cache.", lambda s: s.hit_ratio),
+        )
+        for metric, kind, help_text, value in cache_families:
+            name = family(metric, kind, help_text)
+            for cache, stats in caches.items():
+                lines.append(f"{name}{_labels(cache=cache)} {_number(value(stats))}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
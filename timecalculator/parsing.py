@@ -0,0 +1,201 @@
+import re
+from typing import Tuple, Optional
+
+# Parsers for the string formats accepted by the core classes.
+#
+# The regular expressions are compiled once at import time. In front of them sits a
+# small hand-rolled scanner for the overwhelmingly common shapes ("H:MM", "H:MM:SS",
+# "H:MM AM", "HH:MM", ASCII digits only). Anything the scanner does not recognise --
+# day prefixes, ":SS", non-ASCII digits, unusual whitespace, malformed input -- falls
+# through to the regular expressions, so accepted inputs, results and error messages
+# are identical to matching the patterns directly.
+
+# Pattern 1: Matches optional days part, then hours, minutes, and optional seconds.
+# - (?:(\d+)\s+days?,\s+)? : Optional non-capturing group for "D days, " part. \d+ captures day number.
+# - (\d+): Capturing group for hours (allows multiple digits like "48" for 48 hours).
+# - :(\d{1,2}): Capturing group for minutes (1 or 2 digits).
+# - (?::(\d{1,2}))? : Optional non-capturing group for ":SS" part. \d{1,2} captures seconds.
+_DURATION_PATTERN = re.compile(r"^(?:(\d+)\s+days?,\s+)?(\d+):(\d{1,2})(?::(\d{1,2}))?$")
+
+# Pattern 2: Matches only seconds, formatted as ":SS".
+# - :(\d{1,2})$ : Capturing group for seconds (1 or 2 digits).
+_SECONDS_ONLY_PATTERN = re.compile(r"^:(\d{1,2})$")
+
+# Parsed duration components: (days, hours, minutes, seconds).
+# Days is None when the string had no "D days, " prefix.
+DurationParts = Tuple[Optional[int], int, int, int]
+
+
+# Minute/second fields the scanner accepts, mapped to their values: "0"-"9" and "00"-"59".
+# A dictionary hit checks shape, digits and range in one step.
+_SEXAGESIMAL_FIELDS = {str(n): n for n in range(10)}
+_SEXAGESIMAL_FIELDS.update({f"{n:02d}": n for n in range(60)})
+
+
+def _validate_duration_parts(parts: DurationParts) -> DurationParts:
+    """Applies the component range checks shared by every duration format."""
+    days, hours, minutes, seconds = parts
+    if days is not None and days < 0:
+        raise ValueError("Days component must be non-negative.")
+    if hours < 0:
+        raise ValueError("Hours component must be non-negative.")
+    if not (0 <= minutes <= 59):
+        raise ValueError("Minutes component must be between 0 and 59.")
+    if not (0 <= seconds <= 59):
+        raise ValueError("Seconds component must be between 0 and 59.")
+    return parts
+
+
+def _scan_duration(duration_str: str) -> Optional[DurationParts]:
+    """
+    The scanner fast path: the (None, hours, minutes, seconds) components of an
+    "H:MM" or "H:MM:SS" string with ASCII digits and in-range minutes and seconds, else None.
+    Anything else, including out-of-range values, is left to the patterns so
+    that error messages stay the same.
+    """
+    if duration_str.__class__ is not str:
+        return None
+    fields = duration_str.split(":")
+    field_count = len(fields)
+    if field_count == 2:
+        hours_str, minutes_str = fields
+        minutes = _SEXAGESIMAL_FIELDS.get(minutes_str)
+        if minutes is not None and hours_str.isdigit() and hours_str.isascii():
+            return None, int(hours_str), minutes, 0
+    elif field_count == 3:
+        hours_str, minutes_str, seconds_str = fields
+        minutes = _SEXAGESIMAL_FIELDS.get(minutes_str)
+        seconds = _SEXAGESIMAL_FIELDS.get(seconds_str)
+        if (minutes is not None and seconds is not None
+                and hours_str.isdigit() and hours_str.isascii()):
+            return None, int(hours_str), minutes, seconds
+    return None
+
+
+def parse_duration(duration_str: str) -> DurationParts:
+    """
+    Parses a duration string into its components.
+
+    Args:
+        duration_str: "H:MM:SS", "H:MM", "D days, H:MM:SS", "D days, H:MM" or ":SS".
+
+    Returns:
+        A (days, hours, minutes, seconds) tuple. Days is None unless the string
+        contained a "D days, " prefix. ":SS" yields (0, 0, 0, SS).
+
+    Raises:
+        ValueError: For invalid formats or out-of-range components.
+    """
+    parts = _scan_duration(duration_str)
+    if parts is not None:
+        return parts
+
+    match = _DURATION_PATTERN.fullmatch(duration_str)
+    if match:
+        days_str, hours_str, minutes_str, seconds_str = match.groups()
+        days = int(days_str) if days_str else None
+        seconds = int(seconds_str) if seconds_str else 0
+        return _validate_duration_parts((days, int(hours_str), int(minutes_str), seconds))
+
+    match = _SECONDS_ONLY_PATTERN.fullmatch(duration_str)
+    if match:
+        seconds_str, = match.groups()
+        return _validate_duration_parts((0, 0, 0, int(seconds_str)))
+
+    raise ValueError(f"Invalid duration string format: {duration_str}")
+
+
+def parse_duration_seconds(duration_str: str) -> int:
+    """
+    Parses a duration string straight to its total number of seconds.
+    Accepts the same formats, and raises the same errors, as parse_duration.
+    """
+    parts = _scan_duration(duration_str)
+    if parts is not None:
+        _, hours, minutes, seconds = parts
+        return hours * 3600 + minutes * 60 + seconds
+
+    days, hours, minutes, seconds = parse_duration(duration_str)
+    total_seconds = hours * 60 * 60 + minutes * 60 + seconds
+    if days:
+        total_seconds += days * 24 * 60 * 60
+    return total_seconds
+
+
+# Pattern for "H:MM AM/PM" (12-hour format).
+# - ^(\d{1,2}): Start, hours (1 or 2 digits).
+# - :(\d{2}): Minutes (exactly 2 digits).
+# - \s+(AM|PM)$: Space, then AM or PM (case-insensitive due to flag).
+_TIME_12HR_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})\s+(AM|PM)$", re.IGNORECASE)
+
+# Pattern for "HH:MM" (24-hour format).
+# - ^(\d{1,2}): Start, hours (1 or 2 digits).
+# - :(\d{2})$: Minutes (exactly 2 digits), end.
+_TIME_24HR_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+# Period suffixes the time scanner accepts directly: a single space and AM/PM in any case.
+_PERIOD_SUFFIXES = {f" {a}{m}": f"{a}{m}".upper() for a in "AaPp" for m in "Mm"}
+
+
+def _minutes_from_12hr(hours_12: int, minutes: int, period: str) -> int:
+    """Validates 12-hour clock components and converts them to minutes from midnight."""
+    if not (1 <= hours_12 <= 12):
+        raise ValueError("Time hours must be between 1 and 12 for AM/PM format.")
+    if not (0 <= minutes <= 59):
+        raise ValueError("Time minutes must be between 00 and 59.")
+
+    # Convert to 24-hour format: 12 AM (midnight) is hour 0, 1 PM to 11 PM add 12 hours,
+    # and 12 PM (noon) stays 12.
+    hours_24 = hours_12 % 12
+    if period == 'PM':
+        hours_24 += 12
+    return hours_24 * 60 + minutes
+
+
+def _minutes_from_24hr(hours_24: int, minutes: int) -> int:
+    """Validates 24-hour clock components and converts them to minutes from midnight."""
+    if not (0 <= hours_24 <= 23):
+        raise ValueError("Time hours must be between 0 and 23 for HH:MM format.")
+    if not (0 <= minutes <= 59):
+        raise ValueError("Time minutes must be between 00 and 59.") # Consistent message
+    return hours_24 * 60 + minutes
+
+
+def parse_time(initial_time_str: str) -> int:
+    """
+    Parses a time of day into minutes from midnight (0-1439).
+
+    Args:
+        initial_time_str: "H:MM AM/PM" (hours 1-12, period case-insensitive)
+                          or "HH:MM" (hours 0-23). Minutes must be 00-59.
+
+    Raises:
+        ValueError: If the string matches neither format or a component is out of range.
+    """
+    # Fast path: ASCII digits followed by nothing (24-hour) or " AM"/" PM" (12-hour).
+    # Other spellings, such as extra whitespace or non-ASCII digits, use the patterns.
+    if initial_time_str.__class__ is str:
+        colon = initial_time_str.find(":")
+        if colon == 1 or colon == 2:
+            hours_str = initial_time_str[:colon]
+            minutes_str = initial_time_str[colon + 1:colon + 3]
+            if (len(minutes_str) == 2 and minutes_str.isdigit() and minutes_str.isascii()
+                    and hours_str.isdigit() and hours_str.isascii()):
+                suffix = initial_time_str[colon + 3:]
+                if not suffix:
+                    return _minutes_from_24hr(int(hours_str), int(minutes_str))
+                period = _PERIOD_SUFFIXES.get(suffix)
+                if period is not None:
+                    return _minutes_from_12hr(int(hours_str), int(minutes_str), period)
+
+    match = _TIME_12HR_PATTERN.fullmatch(initial_time_str)
+    if match:
+        hours_str, minutes_str, period_str = match.groups()
+        return _minutes_from_12hr(int(hours_str), int(minutes_str), period_str.upper())
+
+    match = _TIME_24HR_PATTERN.fullmatch(initial_time_str)
+    if match:
+        hours_str, minutes_str = match.groups()
+        return _minutes_from_24hr(int(hours_str), int(minutes_str))
+
+    raise ValueError("Initial time must be in H:MM AM/PM or HH:MM format.")
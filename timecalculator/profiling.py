@@ -0,0 +1,127 @@
+import cProfile
+import hmac
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+# Opt-in profiling of individual web requests.
+#
+# RequestProfiler is WSGI middleware: a selected request runs under cProfile, the
+# stats are written to a directory as a .prof file (readable with pstats or
+# snakeviz), and the hottest functions are logged. A request is selected when it
+# carries an X-Profile header equal to the configured token, or at random with
+# the configured sample rate. Nothing is installed unless a profile directory is
+# configured, so there is no cost when profiling is off. One request is profiled
+# at a time; others selected meanwhile run normally.
+
+PROFILE_HEADER = 'X-Profile'
+DEFAULT_TOP_FUNCTIONS = 15
+
+WSGIApp = Callable[[Dict[str, Any], Callable[..., Any]], Iterable[bytes]]
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def _float_from_environment(variable: str, default: float) -> float:
+    try:
+        return float(os.environ.get(variable, default))
+    except ValueError:
+        return default
+
+
+def config_from_environment() -> Dict[str, Any]:
+    """
+    The PROFILE_* settings for app.config, from the environment:
+        TIMECALC_PROFILE_DIR          directory for .prof files; profiling is off when unset
+        TIMECALC_PROFILE_TOKEN        X-Profile header value that selects a request
+        TIMECALC_PROFILE_SAMPLE_RATE  fraction of requests selected at random (default 0)
+        TIMECALC_PROFILE_TOP          number of functions logged per profile (default 15)
+    """
+    return {
+        'PROFILE_DIR': os.environ.get('TIMECALC_PROFILE_DIR') or None,
+        'PROFILE_TOKEN': os.environ.get('TIMECALC_PROFILE_TOKEN') or None,
+        'PROFILE_SAMPLE_RATE': _float_from_environment('TIMECALC_PROFILE_SAMPLE_RATE', 0.0),
+        'PROFILE_TOP_FUNCTIONS': int(_float_from_environment('TIMECALC_PROFILE_TOP', DEFAULT_TOP_FUNCTIONS)),
+    }
+
+
+def format_top_functions(stats: pstats.Stats, limit: int) -> str:
+    """The limit functions with the most internal time, one per line."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    lines = [f"{'own ms':>9} {'cum ms':>9} {'calls':>7}  function"]
+    for (filename, line, function), (_, calls, own, cumulative, _) in rows:
+        lines.append(f"{own * 1000:9.3f} {cumulative * 1000:9.3f} {calls:7d}  "
+                     f"{os.path.basename(filename)}:{line}({function})")
+    return "\n".join(lines)
+
+
+class RequestProfiler:
+    """WSGI middleware that runs selected requests under cProfile (see the module comment)."""
+
+    def __init__(self, app: WSGIApp, profile_dir: str, token: Optional[str] = None, sample_rate: float = 0.0,
+                 top_functions: int = DEFAULT_TOP_FUNCTIONS, logger: Optional[logging.Logger] = None,
+                 sample: Callable[[], float] = random.random):
+        self.app = app
+        self.profile_dir = profile_dir
+        self.token = token
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.top_functions = top_functions
+        self.logger = logger or logging.getLogger(__name__)
+        self._sample = sample
+        self._lock = threading.Lock()
+        self._sequence = count(1)
+        os.makedirs(profile_dir, exist_ok=True)
+
+    def _selected(self, environ: Mapping[str, Any]) -> bool:
+        if self.token is not None:
+            header = environ.get('HTTP_X_PROFILE')
+            if header is not None and hmac.compare_digest(header.encode('latin-1'), self.token.encode('latin-1')):
+                return True
+        return self.sample_rate > 0.0 and self._sample() < self.sample_rate
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        # cProfile cannot profile two overlapping requests; extra selections run unprofiled.
+        if not self._selected(environ) or not self._lock.acquire(blocking=False):
+            return self.app(environ, start_response)
+        try:
+            profile = cProfile.Profile()
+            started = time.perf_counter()
+            response = profile.runcall(self.app, environ, start_response)
+            elapsed = time.perf_counter() - started
+        finally:
+            self._lock.release()
+        self._report(profile, environ, elapsed)
+        return response
+
+    def _report(self, profile: cProfile.Profile, environ: Mapping[str, Any], elapsed: float) -> None:
+        method, path = environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO', '/')
+        slug = _UNSAFE_FILENAME_CHARS.sub('_', path.strip('/')) or 'root'
+        filename = (f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{slug[:80]}-{elapsed * 1000:.0f}ms"
+                    f"-{os.getpid()}-{next(self._sequence)}.prof")
+        path_on_disk = os.path.join(self.profile_dir, filename)
+        try:
+            profile.dump_stats(path_on_disk)
+        except OSError as e:
+            self.logger.error(f"Could not write request profile {path_on_disk}: {e}")
+            path_on_disk = "(not saved)"
+        top = format_top_functions(pstats.Stats(profile), self.top_functions)
+        self.logger.info(f"Profiled {method} {path} in {elapsed * 1000:.1f} ms, stats in {path_on_disk}; "
+                         f"top functions by own time:\n{top}")
+
+
+def profile_requests(app: WSGIApp, config: Mapping[str, Any], logger: Optional[logging.Logger] = None) -> WSGIApp:
+    """
+    Wraps a WSGI app in a RequestProfiler configured from PROFILE_* settings
+    (see config_from_environment), or returns it unchanged when PROFILE_DIR is unset.
+    """
+    if not config.get('PROFILE_DIR'):
+        return app
+    return RequestProfiler(app, config['PROFILE_DIR'], token=config.get('PROFILE_TOKEN'),
+                           sample_rate=config.get('PROFILE_SAMPLE_RATE', 0.0),
+                           top_functions=config.get('PROFILE_TOP_FUNCTIONS', DEFAULT_TOP_FUNCTIONS), logger=logger)
@@ -0,0 +1,398 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+from .cache import LRUCache, ParseCache, cached_time, cached_duration, parse_cache_stats, size_from_environment
+from .civil import SECONDS_PER_DAY, format_instant, parse_iso_date
+from .core import Time, Duration
+from .metrics import metrics
+from .timezones import transition_table, zone_cache
+
+# The calculation behind the web API, independent of any web framework.
+#
+# calculate() takes the decoded JSON object of one request and returns the response
+# body and HTTP status; web front ends only handle transport concerns (decoding the
+# request, serializing the response, headers, logging unexpected errors).
+
+Payload = Dict[str, Any]
+
+# Headers added to every response, whichever front end serves it.
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'SAMEORIGIN',
+    # A reasonably strict CSP.
+    'Content-Security-Policy': (
+        "default-src 'self'; " # Default policy for fetching resources
+        "script-src 'self'; "  # Allows scripts from 'self' (same origin)
+        "style-src 'self'; "   # Allows stylesheets from 'self'
+        "img-src 'self' data:; " # Allows images from 'self' and data: URIs
+        "font-src 'self'; "    # Allows fonts from 'self'
+        "connect-src 'self';"  # Allows connections (like fetch, XHR) to 'self' for API calls
+    ),
+    # Optional: HTTP Strict Transport Security (HSTS)
+    # 'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+}
+
+INVALID_JSON_ERROR = "Invalid JSON payload or Content-Type (must be application/json and valid JSON)"
+INVALID_BATCH_ERROR = "Invalid JSON payload or Content-Type (must be application/json with a JSON array of items)"
+UNEXPECTED_ERROR = "An unexpected server error occurred"
+
+# Maximum number of items accepted by the batch endpoint (TIMECALC_MAX_BATCH_SIZE;
+# the default when unset or not an integer).
+DEFAULT_MAX_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = size_from_environment("TIMECALC_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE)
+
+# Bound of the response cache used by calculate_json (TIMECALC_RESPONSE_CACHE_SIZE; 0 disables it).
+DEFAULT_RESPONSE_CACHE_SIZE = 4096
+
+# The request fields a response depends on.
+_INPUT_FIELDS = ('initial_time', 'duration', 'start_date', 'timezone')
+
+
+def relative_days_suffix(total_days_passed: int) -> str:
+    """Returns the API's day annotation: " (next day)", " (N days later)", etc., or ""."""
+    if total_days_passed == 1:
+        return " (next day)"
+    if total_days_passed > 1:
+        return f" ({total_days_passed} days later)"
+    if total_days_passed == -1:
+        return " (previous day)"
+    if total_days_passed < -1:
+        return f" ({abs(total_days_passed)} days prior)"
+    return ""
+
+
+def calculate(data: Payload,
+              parse_time: Callable[[str], Time] = cached_time,
+              parse_duration: Callable[[str], Duration] = cached_duration) -> Tuple[Payload, int]:
+    """
+    Runs one calculation for a decoded request object.
+
+    Expects:
+    {
+        "initial_time": "H:MM AM/PM or HH:MM", (string, required)
+        "duration": "D days, H:MM:SS or H:MM:SS or H:MM or :SS", (string, required)
+        "start_date": "YYYY-MM-DD" (string, optional)
+        "timezone": "IANA key, e.g. Europe/Paris" (string, optional, used with start_date)
+    }
+    Returns (body, status). Without start_date a 200 body is:
+    {"result_string": str, "calculated_time": str, "days_numeric": int}
+    With start_date:
+    {"start_datetime_str": str, "end_datetime_str": str, "duration_details_str": str}
+    With a timezone, the start is a wall-clock time in that zone, the duration is
+    elapsed time (across DST transitions), and both datetimes end with the zone
+    abbreviation in effect (e.g. "Sun, 2024-03-10 03:30 AM EDT").
+    Client errors are {"error": str} with status 400; those caused by an input
+    that did not parse are counted in the metrics.
+    Unexpected exceptions propagate to the caller.
+    """
+    body, status, failed_input = _calculate(data, parse_time, parse_duration)
+    if failed_input is not None:
+        metrics.count_parse_error(failed_input)
+    return body, status
+
+
+def _calculate(data: Payload,
+               parse_time: Callable[[str], Time],
+               parse_duration: Callable[[str], Duration]) -> Tuple[Payload, int, Optional[str]]:
+    """calculate(), also returning which input failed to parse ("time", "duration", "start_date"), if any."""
+    initial_time_str = data.get('initial_time')
+    duration_str = data.get('duration')
+    start_date_str = data.get('start_date') # Optional
+    timezone_str = data.get('timezone') # Optional, only used with start_date
+
+    if not initial_time_str:
+        return {"error": "Missing 'initial_time'"}, 400, None
+    if not duration_str:
+        return {"error": "Missing 'duration'"}, 400, None
+
+    failed_input = "time" # The input being parsed, should a ValueError occur
+    try:
+        if not start_date_str:
+            time_obj = parse_time(initial_time_str)
+            failed_input = "duration"
+            duration_obj = parse_duration(duration_str)
+
+            new_time_obj, total_days_passed = time_obj + duration_obj
+
+            calculated_time_str = str(new_time_obj)
+            return {
+                "result_string": calculated_time_str + relative_days_suffix(total_days_passed),
+                "calculated_time": calculated_time_str,
+                "days_numeric": total_days_passed
+            }, 200, None
+
+        # Parse initial_time_str to get the start time of day
+        time_obj_for_parsing = parse_time(initial_time_str) # Can raise ValueError
+
+        # Parse start_date_str
+        try:
+            start_day = parse_iso_date(start_date_str)
+        except ValueError: # Catches invalid date format for start_date_str
+            return {"error": f"Invalid start_date format. Expected YYYY-MM-DD, got '{start_date_str}'"}, 400, "start_date"
+
+        # Combine into a full start instant (seconds since the epoch)
+        start_instant = start_day * SECONDS_PER_DAY + time_obj_for_parsing.minutes_from_midnight * 60
+
+        # Process Duration
+        failed_input = "duration"
+        duration_obj = parse_duration(duration_str) # Can raise ValueError
+
+        if timezone_str:
+            if not isinstance(timezone_str, str): # Only strings can be IANA keys
+                return {"error": f"Unknown timezone: {timezone_str!r}"}, 400, None
+            try:
+                zone = transition_table(timezone_str)
+            except ValueError as e: # Unknown or malformed IANA key
+                return {"error": str(e)}, 400, None
+
+            # Add the duration as elapsed (UTC) time, then read both ends off the zone's clock
+            utc_start_instant = zone.from_local(start_instant)
+            start_instant, start_abbreviation = zone.to_local(utc_start_instant)
+            end_instant, end_abbreviation = zone.to_local(utc_start_instant + duration_obj.total_seconds)
+            return {
+                "start_datetime_str": f"{format_instant(start_instant)} {start_abbreviation}",
+                "end_datetime_str": f"{format_instant(end_instant)} {end_abbreviation}",
+                "duration_details_str": str(duration_obj)
+            }, 200, None
+
+        # Calculate End Instant
+        end_instant = start_instant + duration_obj.total_seconds
+
+        # Format Output Strings (OverflowError past year 9999, as datetime arithmetic would raise)
+        return {
+            "start_datetime_str": format_instant(start_instant),
+            "end_datetime_str": format_instant(end_instant),
+            "duration_details_str": str(duration_obj) # e.g., "X days, H:MM:SS"
+        }, 200, None
+
+    except ValueError as e: # Catches errors from Time/Duration init
+        return {"error": f"Error processing time/duration: {str(e)}"}, 400, failed_input
+
+
+def to_json(payload: Any) -> bytes:
+    """Serializes a response body exactly like Flask's jsonify (sorted keys, compact, trailing newline)."""
+    return (json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n").encode('utf-8')
+
+
+# Response cache.
+#
+# calculate() is a pure function of its input fields, and traffic repeats a
+# few popular queries, so finished responses -- serialized body and status, errors
+# included -- are kept in a bounded LRU cache keyed on the normalized inputs.
+# Entries are only evicted to stay within the bound; they never expire.
+
+response_cache = LRUCache(size_from_environment("TIMECALC_RESPONSE_CACHE_SIZE", DEFAULT_RESPONSE_CACHE_SIZE))
+
+
+def _response_cache_key(data: Payload) -> Optional[Tuple[Optional[str], ...]]:
+    """
+    The cache key for a request: its input fields, with absent or empty values as None
+    (calculate() treats them all alike). None if a field has a non-string value.
+    """
+    key = []
+    for field in _INPUT_FIELDS:
+        value = data.get(field)
+        if not value:
+            key.append(None)
+        elif value.__class__ is str:
+            key.append(value)
+        else:
+            return None
+    return tuple(key)
+
+
+def calculate_json(data: Payload) -> Tuple[bytes, int]:
+    """
+    Like calculate(), but returns the body serialized with to_json(), served from
+    the response cache when the same inputs were seen before.
+    """
+    key = _response_cache_key(data)
+    cached = response_cache.get(key) if key is not None else None
+    if cached is None:
+        body, status, failed_input = _calculate(data, cached_time, cached_duration)
+        cached = (to_json(body), status), failed_input
+        if key is not None:
+            response_cache.put(key, cached)
+    response, failed_input = cached
+    # Counted per request, whether or not the response came from the cache.
+    if failed_input is not None:
+        metrics.count_parse_error(failed_input)
+    return response
+
+
+def configure_response_cache(maxsize: int) -> None:
+    """Sets the bound of the response cache. 0 disables it."""
+    response_cache.resize(maxsize)
+
+
+# HTTP-cacheable GET form of the calculation.
+#
+# GET /api/calculate_time?initial_time=...&duration=...[&start_date=...] returns
+# the same body and status as the POST form. Successful results without a timezone
+# are a pure function of the URL, so they carry a strong ETag (a hash of the body)
+# and a year-long, immutable Cache-Control, letting browsers, proxies and CDNs
+# answer repeats themselves. Results with a timezone depend on the installed tz
+# database, which an update can change (a new zone, a changed offset), and error
+# messages may be reworded, so those responses are only cached briefly and then
+# revalidated with their ETag.
+# To give caches one URL per calculation, any other spelling of the query (field
+# order, unknown or empty fields, repeated fields, other percent-encoding) is
+# redirected to the canonical one.
+
+CALCULATION_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATED_CACHE_CONTROL = "public, max-age=3600"
+
+# Characters left unescaped in canonical query values, for readable URLs.
+_QUERY_SAFE = ":,"
+
+
+def canonical_query(params: Mapping[str, str]) -> str:
+    """
+    The canonical query string for a request's parameters: the input fields in a
+    fixed order, empty ones omitted, values percent-encoded (spaces as %20).
+    params maps each field name to its first value.
+    """
+    return "&".join(f"{field}={quote(params[field], safe=_QUERY_SAFE)}"
+                    for field in _INPUT_FIELDS if params.get(field))
+
+
+def etag_for(body: bytes) -> str:
+    """A strong ETag for a response body (a quoted SHA-256 prefix)."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison, as GET requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def calculate_get(params: Mapping[str, str], query_string: str, path: str,
+                  if_none_match: Optional[str] = None) -> Tuple[bytes, int, Dict[str, str]]:
+    """
+    Handles the GET form of the calculation.
+
+    Args:
+        params: Query parameters, each mapped to its first (decoded) value.
+        query_string: The raw query string of the request URL.
+        path: The request path, used for the redirect Location.
+        if_none_match: The If-None-Match request header, if any.
+
+    Returns:
+        (body, status, headers). A 301 to the canonical URL if query_string is not
+        canonical; a 304 with an empty body if if_none_match matches; otherwise the
+        JSON body of calculate_json with its status. Headers hold the caching
+        headers (and Location for redirects): CALCULATION_CACHE_CONTROL for
+        successes without a timezone, REVALIDATED_CACHE_CONTROL otherwise.
+        Unexpected exceptions propagate.
+    """
+    canonical = canonical_query(params)
+    if query_string != canonical:
+        # Canonicalization depends on the URL alone.
+        location = f"{path}?{canonical}" if canonical else path
+        return b"", 301, {"Cache-Control": CALCULATION_CACHE_CONTROL, "Location": location}
+
+    body, status = calculate_json({field: params.get(field) for field in _INPUT_FIELDS})
+    immutable = status == 200 and not (params.get("start_date") and params.get("timezone"))
+    headers = {"Cache-Control": CALCULATION_CACHE_CONTROL if immutable else REVALIDATED_CACHE_CONTROL}
+    headers["ETag"] = etag = etag_for(body)
+    if etag_matches(if_none_match, etag):
+        return b"", 304, headers
+    return body, status, headers
+
+
+# GET /api/timezone?key=Europe/Paris returns a zone's transition table
+# (TransitionTable.to_payload), which lets the page's JavaScript engine convert
+# wall-clock times in that zone exactly as _calculate does. Like timezone results,
+# tables follow the installed tz database, so they are revalidated hourly.
+
+def timezone_get(params: Mapping[str, str], if_none_match: Optional[str] = None) -> Tuple[bytes, int, Dict[str, str]]:
+    """
+    Handles the time zone table request.
+
+    Args:
+        params: Query parameters, each mapped to its first (decoded) value.
+        if_none_match: The If-None-Match request header, if any.
+
+    Returns:
+        (body, status, headers). A 400 if "key" is missing or not a known zone; a
+        304 with an empty body if if_none_match matches; otherwise 200 with the
+        zone's table. Headers hold the caching headers.
+    """
+    key = params.get("key")
+    if not key:
+        body, status = to_json({"error": "Missing 'key'"}), 400
+    else:
+        try:
+            body, status = to_json(transition_table(key).to_payload()), 200
+        except ValueError as e: # Unknown or malformed IANA key
+            body, status = to_json({"error": str(e)}), 400
+    headers = {"Cache-Control": REVALIDATED_CACHE_CONTROL, "ETag": etag_for(body)}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return b"", 304, headers
+    return body, status, headers
+
+
+def calculate_batch(items: List[Any], on_unexpected_error: Callable[[Exception], None]) -> List[Payload]:
+    """
+    Runs calculate() for every item of a batch and returns one result per item.
+
+    Each result is the item's response body plus its "status". Parsed Time and
+    Duration values are shared between items that repeat the same strings.
+    Items that are not objects, or raise unexpectedly, get an error result
+    instead of failing the whole batch; on_unexpected_error is called for the latter.
+    """
+    parse_cache_size = max(len(items), 1)
+    time_cache = ParseCache(cached_time, parse_cache_size)
+    duration_cache = ParseCache(cached_duration, parse_cache_size)
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            body, status = {"error": "Each batch item must be a JSON object"}, 400
+        else:
+            try:
+                body, status = calculate(item, time_cache.parse, duration_cache.parse)
+            except Exception as e:
+                on_unexpected_error(e)
+                body, status = {"error": UNEXPECTED_ERROR}, 500
+        body["status"] = status
+        results.append(body)
+    return results
+
+
+def batch_too_large(count: int, max_batch_size: int) -> Tuple[Payload, int]:
+    """The 413 response for a batch of count items when at most max_batch_size are allowed."""
+    return {"error": f"Batch too large: {count} items (maximum {max_batch_size})"}, 413
+
+
+def _stats_body(stats) -> Payload:
+    return dict(stats._asdict(), hit_ratio=stats.hit_ratio)
+
+
+def cache_stats() -> Payload:
+    """Body of the cache statistics endpoint: parse, response and time zone cache counters, with hit ratios."""
+    return {
+        "parse_cache": {name: _stats_body(stats) for name, stats in parse_cache_stats().items()},
+        "response_cache": _stats_body(response_cache.stats()),
+        "timezone_cache": _stats_body(zone_cache.stats()),
+    }
+
+
+def metrics_text() -> str:
+    """Body of the metrics endpoint: request and parse error metrics plus the counters of every cache."""
+    caches = {f"parse_{name}": stats for name, stats in parse_cache_stats().items()}
+    caches["response"] = response_cache.stats()
+    caches["timezone"] = zone_cache.stats()
+    return metrics.render(caches)
@@ -0,0 +1,422 @@
+import argparse
+import io
+import json
+import math
+import multiprocessing
+import os
+import sys
+from fractions import Fraction
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .aggregate import invalid_duration_error, iter_seconds
+from .formatting import format_duration
+from .streaming import DEFAULT_CHUNK_BYTES, WINDOW_PER_WORKER, imap_window, split_byte_ranges
+
+# Streaming statistics (count, min, max, mean and quantiles) of durations.
+#
+# DurationStats consumes integer seconds one at a time. While it has seen at most
+# exact_limit distinct values it keeps a count per value, and its quantiles are
+# exact; job logs repeat a small set of durations, so this often holds for
+# large inputs too. Past that it switches to a quantile sketch: values are counted
+# in logarithmic buckets (gamma ** (i - 1), gamma ** i], and a quantile is reported
+# as the midpoint of its bucket, within relative_accuracy of the exact value (plus
+# rounding to whole seconds). At the default 1% that is about 1,000 buckets for
+# everything up to 30 years, whatever the number of values. Count, total, min and
+# max are always exact.
+#
+# Two DurationStats with the same relative_accuracy merge into the statistics of
+# the combined data, so chunks of a large input can be processed in parallel.
+#
+# Quantiles use the nearest-rank definition: the q-quantile of n values is the
+# ceil(q * n)-th smallest (the smallest for q = 0).
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_EXACT_LIMIT = 10_000
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+class DurationStats:
+    """
+    Mergeable, bounded-memory statistics of a stream of durations in seconds.
+
+    Args:
+        relative_accuracy: Relative error bound of quantiles once the sketch is in use (0 < a < 1).
+        exact_limit: Distinct values kept exactly before switching to the sketch
+                     (None keeps every distinct value, so memory is unbounded).
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 exact_limit: Optional[int] = DEFAULT_EXACT_LIMIT):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        if exact_limit is not None and exact_limit < 0:
+            raise ValueError("exact_limit must not be negative.")
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self.total = 0
+        # Exact mode: {seconds: count}. Sketch mode: None, with bucket counts and
+        # the running min and max instead.
+        self._values: Optional[Dict[int, int]] = {}
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self._min = 0
+        self._max = 0
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether quantiles are still computed from every distinct value."""
+        return self._values is not None
+
+    @property
+    def min(self) -> int:
+        self._require_values()
+        return min(self._values) if self._values is not None else self._min
+
+    @property
+    def max(self) -> int:
+        self._require_values()
+        return max(self._values) if self._values is not None else self._max
+
+    @property
+    def mean(self) -> float:
+        self._require_values()
+        return self.total / self.count
+
+    def _require_values(self) -> None:
+        if not self.count:
+            raise ValueError("No durations have been added.")
+
+    def _bucket(self, seconds: int) -> int:
+        return math.ceil(math.log(seconds) / self._log_gamma)
+
+    def _switch_to_sketch(self) -> None:
+        values = self._values
+        self._values = None
+        if values:
+            self._min = min(values)
+            self._max = max(values)
+        for seconds, count in values.items():
+            self._add_to_sketch(seconds, count)
+
+    def _add_to_sketch(self, seconds: int, count: int) -> None:
+        if seconds:
+            index = self._bucket(seconds)
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        else:
+            self._zero_count += count
+
+    def add(self, seconds: int) -> None:
+        """Adds one duration of seconds (a non-negative integer)."""
+        self.update((seconds,))
+
+    def update(self, values: Iterable[int]) -> None:
+        """Adds each duration in values (non-negative integer seconds)."""
+        iterator = iter(values)
+        if self._values is not None:
+            self._update_exact(iterator)
+        if self._values is None:
+            self._update_sketch(iterator)
+
+    def _update_exact(self, iterator: Iterator[int]) -> None:
+        # Stops early, leaving the rest of iterator, if the values outgrow exact_limit.
+        values = self._values
+        get = values.get
+        limit = self.exact_limit
+        count = total = 0
+        try:
+            for seconds in iterator:
+                seen = get(seconds)
+                if seen is None:
+                    if seconds < 0:
+                        raise ValueError(f"Durations must not be negative: {seconds}")
+                    values[seconds] = 1
+                    count += 1
+                    total += seconds
+                    if limit is not None and len(values) > limit:
+                        self._switch_to_sketch()
+                        return
+                else:
+                    values[seconds] = seen + 1
+                    count += 1
+                    total += seconds
+        finally:
+            self.count += count
+            self.total += total
+
+    def _update_sketch(self, iterator: Iterator[int]) -> None:
+        buckets = self._buckets
+        get = buckets.get
+        log = math.log
+        ceil = math.ceil
+        log_gamma = self._log_gamma
+        count = total = zero_count = 0
+        low, high = self._min, self._max
+        if not self.count:
+            low = None
+        try:
+            for seconds in iterator:
+                if seconds > 0:
+                    index = ceil(log(seconds) / log_gamma)
+                    buckets[index] = get(index, 0) + 1
+                elif seconds == 0:
+                    zero_count += 1
+                else:
+                    raise ValueError(f"Durations must not be negative: {seconds}")
+                if low is None:
+                    low = high = seconds
+                elif seconds < low:
+                    low = seconds
+                elif seconds > high:
+                    high = seconds
+                count += 1
+                total += seconds
+        finally:
+            self.count += count
+            self.total += total
+            self._zero_count += zero_count
+            if low is not None:
+                self._min, self._max = low, high
+
+    def merge(self, other: 'DurationStats') -> None:
+        """Adds the durations counted by other (built with the same relative_accuracy) to these statistics."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only statistics with the same relative_accuracy can be merged.")
+        if not other.count:
+            return
+        if not self.count:
+            low, high = other.min, other.max
+        else:
+            low, high = min(self.min, other.min), max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        if self._values is not None and other._values is not None:
+            for seconds, count in other._values.items():
+                self._values[seconds] = self._values.get(seconds, 0) + count
+            if self.exact_limit is not None and len(self._values) > self.exact_limit:
+                self._switch_to_sketch()
+            return
+        if self._values is not None:
+            self._switch_to_sketch()
+        if other._values is not None:
+            for seconds, count in other._values.items():
+                self._add_to_sketch(seconds, count)
+        else:
+            for index, count in other._buckets.items():
+                self._buckets[index] = self._buckets.get(index, 0) + count
+            self._zero_count += other._zero_count
+        self._min, self._max = low, high
+
+    def _counts(self) -> Iterator[Tuple[float, int]]:
+        """(value, count) in increasing order: each distinct value, or each bucket's midpoint."""
+        if self._values is not None:
+            yield from sorted(self._values.items())
+            return
+        if self._zero_count:
+            yield 0, self._zero_count
+        gamma = self._gamma
+        for index in sorted(self._buckets):
+            yield 2 * gamma ** index / (gamma + 1), self._buckets[index]
+
+    def quantiles(self, qs: Sequence[float]) -> List[int]:
+        """The q-quantiles, in seconds, for each q in qs (0 <= q <= 1), in one pass."""
+        self._require_values()
+        ranks = []
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError(f"Quantiles must be between 0 and 1: {q}")
+            # Fraction(str(q)) keeps e.g. 0.07 * 100 from rounding up to rank 8.
+            ranks.append(max(1, math.ceil(Fraction(str(q)) * self.count)))
+        order = sorted(range(len(ranks)), key=ranks.__getitem__)
+        results = [0] * len(ranks)
+        low, high = self.min, self.max
+        counts = self._counts()
+        seen = 0
+        value = 0.0
+        for position in order:
+            while seen < ranks[position]:
+                value, count = next(counts)
+                seen += count
+            results[position] = min(max(round(value), low), high)
+        return results
+
+    def quantile(self, q: float) -> int:
+        """The q-quantile (0 <= q <= 1) in seconds."""
+        return self.quantiles((q,))[0]
+
+    def summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, object]:
+        """
+        count, min, the percentiles as p50, p95, ... , max and mean (all in seconds),
+        and whether the percentiles are exact.
+        """
+        self._require_values()
+        result: Dict[str, object] = {'count': self.count, 'min': self.min}
+        values = self.quantiles([Fraction(str(p)) / 100 for p in percentiles])
+        for percentile, value in zip(percentiles, values):
+            result[f"p{percentile:g}"] = value
+        result['max'] = self.max
+        result['mean'] = self.mean
+        result['exact'] = self.is_exact
+        return result
+
+
+def stats_from_lines(lines: Iterable[str], relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                     exact_limit: Optional[int] = DEFAULT_EXACT_LIMIT,
+                     skip_invalid: bool = False) -> Tuple[DurationStats, int]:
+    """
+    Statistics of lines holding one duration string each (blank lines are skipped).
+
+    Returns:
+        The statistics and the number of invalid lines skipped.
+
+    Raises:
+        ValueError: For the first invalid line, unless skip_invalid is set.
+    """
+    stats = DurationStats(relative_accuracy, exact_limit)
+    invalid = _InvalidLines()
+    stats.update(iter_seconds(lines, lines=True, on_invalid=invalid if skip_invalid else None))
+    return stats, invalid.count
+
+
+class _InvalidLines:
+    """on_invalid callback counting invalid lines and keeping the first one's (line number, error)."""
+
+    def __init__(self):
+        self.count = 0
+        self.first: Optional[Tuple[int, str]] = None
+
+    def __call__(self, position: int, error: ValueError) -> None:
+        if self.first is None:
+            self.first = (position, str(error))
+        self.count += 1
+
+
+class _ChunkResult(NamedTuple):
+    """What a worker returns for one byte range of the input."""
+    stats: DurationStats
+    line_count: int
+    invalid_count: int
+    first_invalid: Optional[Tuple[int, str]]
+
+
+def _stats_for_byte_range(task: Tuple[str, int, int, float, Optional[int]]) -> _ChunkResult:
+    """Worker entry point: statistics of one byte range, with its invalid lines counted rather than raised."""
+    path, start, end, relative_accuracy, exact_limit = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    # newline="" splits lines where a text file opened by the sequential path would.
+    invalid = _InvalidLines()
+    stats = DurationStats(relative_accuracy, exact_limit)
+    stats.update(iter_seconds(io.StringIO(text, newline=""), lines=True, on_invalid=invalid))
+    line_count = sum(1 for _ in io.StringIO(text, newline=""))
+    return _ChunkResult(stats, line_count, invalid.count, invalid.first)
+
+
+def stats_from_file_parallel(path: str, workers: Optional[int] = None,
+                             relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                             exact_limit: Optional[int] = DEFAULT_EXACT_LIMIT, skip_invalid: bool = False,
+                             chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Tuple[DurationStats, int]:
+    """
+    stats_from_lines for a file, split into byte ranges that worker processes
+    summarize separately and that are then merged. Errors name the line in the whole file.
+    """
+    tasks = [(path, start, end, relative_accuracy, exact_limit) for start, end in split_byte_ranges(path, chunk_bytes)]
+    stats = DurationStats(relative_accuracy, exact_limit)
+    invalid_count = 0
+    lines_before = 0
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(workers) as pool:
+        for chunk in imap_window(pool, _stats_for_byte_range, tasks, WINDOW_PER_WORKER * workers):
+            if chunk.first_invalid is not None and not skip_invalid:
+                position, message = chunk.first_invalid
+                raise invalid_duration_error(ValueError(message), lines_before + position)
+            stats.merge(chunk.stats)
+            invalid_count += chunk.invalid_count
+            lines_before += chunk.line_count
+    return stats, invalid_count
+
+
+def _parse_percentiles(text: str) -> List[float]:
+    try:
+        percentiles = [float(part) for part in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got {text!r}") from None
+    if not all(0 <= p <= 100 for p in percentiles):
+        raise argparse.ArgumentTypeError("percentiles must be between 0 and 100")
+    return percentiles
+
+
+def format_summary(summary: Dict[str, object]) -> str:
+    """The text report of a summary: one line per statistic with the duration and its seconds."""
+    lines = [f"{'count':<6} {summary['count']:>14,}"]
+    for name, value in summary.items():
+        if name in ("count", "exact"):
+            continue
+        shown = format_duration(round(value))
+        seconds = f"{value:.2f}" if name == "mean" else str(value)
+        lines.append(f"{name:<6} {shown:>14} {seconds:>14} s")
+    lines.append("percentiles: exact" if summary["exact"] else "percentiles: estimated (quantile sketch)")
+    return "\n".join(lines) + "\n"
+
+
+def setup_parser(prog: Optional[str] = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Statistics of durations read one per line (blank lines are skipped).")
+    parser.add_argument("file", nargs="?", default="-",
+                        help="Input file (default: stdin, also when '-').")
+    parser.add_argument("--percentiles", type=_parse_percentiles, default=list(DEFAULT_PERCENTILES),
+                        metavar="P,P,...", help="Percentiles to report (default: 50,95,99).")
+    parser.add_argument("--accuracy", type=float, default=DEFAULT_RELATIVE_ACCURACY,
+                        help="Relative accuracy of estimated percentiles (default: 0.01).")
+    parser.add_argument("--exact-limit", type=int, default=DEFAULT_EXACT_LIMIT, metavar="N",
+                        help="Distinct durations kept for exact percentiles before estimating "
+                             f"(default: {DEFAULT_EXACT_LIMIT}).")
+    parser.add_argument("--exact", action="store_true",
+                        help="Always compute exact percentiles (memory grows with the distinct durations).")
+    parser.add_argument("--skip-invalid", action="store_true",
+                        help="Skip and count invalid lines instead of stopping at the first.")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Read a FILE in N worker processes and merge their results (default: 1).")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as a JSON object.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> None:
+    """Entry point of `python -m timecalculator.stats` and the CLI's stats subcommand."""
+    parser = setup_parser(prog)
+    args = parser.parse_args(argv)
+    exact_limit = None if args.exact else args.exact_limit
+    try:
+        if args.workers < 1:
+            raise ValueError("--workers must be at least 1.")
+        if args.workers > 1:
+            if args.file == "-":
+                raise ValueError("--workers requires a FILE (stdin cannot be split).")
+            stats, invalid_count = stats_from_file_parallel(args.file, args.workers, args.accuracy,
+                                                            exact_limit, args.skip_invalid)
+        elif args.file == "-":
+            stats, invalid_count = stats_from_lines(sys.stdin, args.accuracy, exact_limit, args.skip_invalid)
+        else:
+            with open(args.file, encoding="utf-8") as f:
+                stats, invalid_count = stats_from_lines(f, args.accuracy, exact_limit, args.skip_invalid)
+        if not stats.count:
+            raise ValueError("No durations in the input.")
+        summary = stats.summary(args.percentiles)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        summary["invalid"] = invalid_count
+        print(json.dumps(summary))
+    else:
+        sys.stdout.write(format_summary(summary))
+        if invalid_count:
+            print(f"skipped {invalid_count:,} invalid line(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+from collections import deque
+from multiprocessing.pool import Pool
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple, TypeVar
+
+from .cache import configure_parse_cache
+from .calculator import add_time
+
+# Streaming record processing for the CLI's batch mode.
+#
+# Input is read line by line and pushed through a generator pipeline
+# (parse record -> calculate -> format record), so memory use does not grow with
+# the input size. Each input record produces one output record in the same format;
+# a record that cannot be calculated carries its error message instead of a result.
+#
+# CSV/TSV records are "initial_time,duration[,days_offset]", optionally preceded by
+# a header row starting with "initial_time"; output rows append "result" and
+# "error" columns. Shorter rows (no days_offset) are padded with empty fields to
+# the header's width, or to the three input columns without a header, so results
+# and errors always land in the same columns. JSON-lines records are objects with the same keys; output
+# objects gain a "result" or an "error" key.
+
+FORMATS = ("csv", "tsv", "jsonl")
+
+_DELIMITERS = {"csv": ",", "tsv": "\t"}
+_INPUT_COLUMNS = ["initial_time", "duration", "days_offset"]
+_OUTPUT_COLUMNS = ["result", "error"]
+_FORMAT_BY_EXTENSION = {".tsv": "tsv", ".tab": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(path: Optional[str]) -> str:
+    """Guesses the record format from a file extension (CSV when unknown or reading stdin)."""
+    if path:
+        for extension, fmt in _FORMAT_BY_EXTENSION.items():
+            if path.lower().endswith(extension):
+                return fmt
+    return "csv"
+
+
+def _parse_days_offset(raw: object) -> int:
+    """Converts a record's days_offset (int, numeric string or empty) to an int."""
+    if raw is None or raw == "":
+        return 0
+    if isinstance(raw, bool) or not isinstance(raw, (int, str)):
+        raise ValueError(f"Invalid days_offset: {raw!r}")
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Invalid days_offset: {raw!r}") from None
+
+
+def calculate_record(initial_time: object, duration: object, days_offset: object, extra_days: int = 0) -> str:
+    """
+    Calculates one record, raising ValueError with a user-facing message on bad input.
+    extra_days is the --days_offset applied to every record.
+    """
+    if not isinstance(initial_time, str) or not initial_time:
+        raise ValueError("Missing 'initial_time'")
+    if not isinstance(duration, str) or not duration:
+        raise ValueError("Missing 'duration'")
+    return add_time(initial_time, duration, _parse_days_offset(days_offset) + extra_days)
+
+
+class _DelimitedLineWriter:
+    """Formats rows as CSV/TSV lines, reusing one buffer."""
+
+    def __init__(self, delimiter: str):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, delimiter=delimiter, lineterminator="\n")
+
+    def format(self, row: List[str]) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(row)
+        return self._buffer.getvalue()
+
+
+def _is_header(row: List[str]) -> bool:
+    return bool(row) and row[0].strip().lower() == "initial_time"
+
+
+def _header_width(header: List[str]) -> int:
+    """Columns of the input part of output rows under a header: its own, and at least the three input columns."""
+    return max(len(header), len(_INPUT_COLUMNS))
+
+
+def _process_delimited(lines: Iterable[str], delimiter: str, extra_days: int,
+                       allow_header: bool, width: int) -> Iterator[str]:
+    writer = _DelimitedLineWriter(delimiter)
+    for index, row in enumerate(csv.reader(lines, delimiter=delimiter)):
+        if not row:
+            continue
+        if index == 0 and allow_header and _is_header(row):
+            width = _header_width(row)
+            yield writer.format(row + _INPUT_COLUMNS[len(row):] + _OUTPUT_COLUMNS)
+            continue
+        padded = row + [""] * (width - len(row))
+        try:
+            if len(row) < 2:
+                raise ValueError("Expected initial_time and duration columns")
+            result = calculate_record(row[0], row[1], row[2] if len(row) > 2 else None, extra_days)
+            yield writer.format(padded + [result, ""])
+        except ValueError as e:
+            yield writer.format(padded + ["", str(e)])
+
+
+def _process_json_lines(lines: Iterable[str], extra_days: int) -> Iterator[str]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield json.dumps({"error": f"Invalid JSON record: {e}"}) + "\n"
+            continue
+        if not isinstance(record, dict):
+            yield json.dumps({"error": "JSON record must be an object"}) + "\n"
+            continue
+        try:
+            record["result"] = calculate_record(record.get("initial_time"), record.get("duration"),
+                                                record.get("days_offset"), extra_days)
+        except ValueError as e:
+            record["error"] = str(e)
+        yield json.dumps(record) + "\n"
+
+
+def process_lines(lines: Iterable[str], fmt: str, extra_days: int = 0, allow_header: bool = True,
+                  width: int = len(_INPUT_COLUMNS)) -> Iterator[str]:
+    """
+    Lazily turns input lines into output lines (each ending in a newline).
+
+    Args:
+        lines: Input lines in the given format.
+        fmt: One of FORMATS.
+        extra_days: Whole days added to every record's result.
+        allow_header: Whether the first CSV/TSV row may be a header.
+        width: Columns CSV/TSV rows are padded to before the output columns
+               (a header on the first row sets its own).
+    """
+    if fmt == "jsonl":
+        return _process_json_lines(lines, extra_days)
+    if fmt in _DELIMITERS:
+        return _process_delimited(lines, _DELIMITERS[fmt], extra_days, allow_header, width)
+    raise ValueError(f"Unsupported batch format: {fmt}")
+
+
+def write_lines(lines: Iterable[str], output: TextIO, chunk_size: int = 512) -> int:
+    """Writes lines to output in chunks of chunk_size and returns the number written."""
+    count = 0
+    chunk: List[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            output.write("".join(chunk))
+            count += len(chunk)
+            chunk.clear()
+    if chunk:
+        output.write("".join(chunk))
+        count += len(chunk)
+    output.flush()
+    return count
+
+
+# Parallel processing of large files.
+#
+# The file is split into byte ranges that end on line boundaries; each range is
+# processed by a worker process and the output chunks are yielded in input order.
+# Records must not span lines (no newlines inside quoted CSV fields).
+#
+# Only a bounded window of ranges (WINDOW_PER_WORKER per worker) is in flight at a
+# time: the next range is submitted once the consumer has taken the oldest result.
+# When output is slower than the workers (a pipe to a slow reader, say), they wait
+# instead of piling up finished chunks, so memory stays at about window * chunk size.
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+WINDOW_PER_WORKER = 2
+
+_Task = TypeVar("_Task")
+_Result = TypeVar("_Result")
+
+
+def split_byte_ranges(path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Splits a file into consecutive (start, end) byte ranges of about chunk_bytes, ending on newlines."""
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be positive.")
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()  # Move to the end of the line the nominal boundary fell in.
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def imap_window(pool: Pool, function: Callable[[_Task], _Result], tasks: Iterable[_Task],
+                window: int) -> Iterator[_Result]:
+    """
+    Like pool.imap, yielding function(task) for each task in task order, but with at
+    most window tasks submitted and not yet consumed.
+    """
+    if window < 1:
+        raise ValueError("window must be positive.")
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(function, (task,)))
+    while pending:
+        yield pending.popleft().get()
+
+
+def _delimited_width(path: str, fmt: str) -> int:
+    """The width rows of a CSV/TSV file are padded to: set by its header, if it has one."""
+    if fmt not in _DELIMITERS:
+        return len(_INPUT_COLUMNS)
+    with open(path, encoding="utf-8", newline="") as f:
+        first_row = next(csv.reader(f, delimiter=_DELIMITERS[fmt]), [])
+    return _header_width(first_row) if _is_header(first_row) else len(_INPUT_COLUMNS)
+
+
+def _process_byte_range(task: Tuple[str, int, int, str, int, int]) -> str:
+    """Worker entry point: processes one byte range and returns its output text."""
+    path, start, end, fmt, extra_days, width = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    # Same line splitting as iterating a file opened with newline="".
+    lines = io.StringIO(text, newline="")
+    return "".join(process_lines(lines, fmt, extra_days, allow_header=(start == 0), width=width))
+
+
+def process_file_parallel(path: str, fmt: str, extra_days: int = 0, workers: Optional[int] = None,
+                          chunk_bytes: int = DEFAULT_CHUNK_BYTES, parse_cache_size: int = 0) -> Iterator[str]:
+    """
+    Processes a file with a pool of worker processes, yielding output chunks in input order.
+
+    Args:
+        path: Input file (must be seekable; stdin is not supported).
+        fmt: One of FORMATS.
+        extra_days: Whole days added to every record's result.
+        workers: Number of worker processes (default: os.cpu_count()).
+        chunk_bytes: Approximate input bytes per task.
+        parse_cache_size: Parse cache bound configured in each worker.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported batch format: {fmt}")
+    # Every range pads its rows to the header's width, which only the first range sees.
+    width = _delimited_width(path, fmt)
+    tasks = [(path, start, end, fmt, extra_days, width) for start, end in split_byte_ranges(path, chunk_bytes)]
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(workers, initializer=configure_parse_cache, initargs=(parse_cache_size,)) as pool:
+        # Later chunks are computed while earlier ones are written, up to the window.
+        yield from imap_window(pool, _process_byte_range, tasks, WINDOW_PER_WORKER * workers)
@@ -0,0 +1,329 @@
+import os
+import re
+import struct
+import zoneinfo
+from array import array
+from bisect import bisect_right
+from typing import BinaryIO, List, Optional, Tuple
+
+from .cache import LRUCache, size_from_environment
+from .civil import SECONDS_PER_DAY, civil_from_days, days_from_civil
+
+# IANA time zone support for the start_date calculation.
+#
+# A zone is loaded once into a TransitionTable: the UTC instants at which its
+# offset changes, the same instants as local wall-clock times, and the
+# (offset, abbreviation) in effect after each of them. Converting an instant
+# either way is then one bisect over an array. The tables are built from the
+# same TZif files zoneinfo reads (its TZPATH, then the tzdata package), and
+# their results match zoneinfo.ZoneInfo with fold=0: wall times in a gap use the
+# offset before the transition, repeated wall times their first occurrence.
+#
+# Beyond a file's last transition, its POSIX TZ footer gives yearly rules. Those
+# are expanded for one 400-year Gregorian cycle, after which dates and weekdays
+# (and so the rules' transitions) repeat exactly; later instants are shifted back
+# by whole cycles before the lookup. Tables are kept in a bounded LRU cache
+# (TIMECALC_TIMEZONE_CACHE_SIZE, default 64 zones).
+
+Instant = int  # Seconds since 1970-01-01 00:00 (UTC, or local wall time).
+ZoneInfoTuple = Tuple[int, str]  # (UTC offset in seconds, abbreviation)
+
+DEFAULT_TIMEZONE_CACHE_SIZE = 64
+
+_CYCLE_SECONDS = 146097 * SECONDS_PER_DAY
+# Smaller than any instant, used as the start of the period before the first transition.
+_BEGINNING_OF_TIME = -(2 ** 62)
+
+
+# POSIX TZ footer: std offset [dst [offset] ,start[/time],end[/time]]
+_TZ_STRING_RE = re.compile(
+    r"(?P<std>[^<0-9:.+-]+|<[a-zA-Z0-9+-]+>)(?P<stdoff>[+-]?\d{1,3}(?::\d{2}(?::\d{2})?)?)"
+    r"(?:(?P<dst>[^<0-9:.+-]+|<[a-zA-Z0-9+-]+>)(?P<dstoff>[+-]?\d{1,3}(?::\d{2}(?::\d{2})?)?)?"
+    r",(?P<start>[^,]+),(?P<end>[^,]+))?",
+    re.ASCII,
+)
+_SECONDS_RE = re.compile(r"(?P<sign>[+-])?(?P<h>\d{1,3})(?::(?P<m>\d{2})(?::(?P<s>\d{2}))?)?", re.ASCII)
+_RULE_DATE_RE = re.compile(
+    r"M(?P<m>1[0-2]|0?[1-9])\.(?P<w>[1-5])\.(?P<d>[0-6])|J(?P<julian>\d{1,3})|(?P<zero_based>\d{1,3})", re.ASCII)
+
+# A rule date: ("M", month, week, weekday) / ("J", day, 0, 0) / ("N", day, 0, 0), plus the time of day in seconds.
+_RuleDate = Tuple[str, int, int, int, int]
+
+
+def _parse_seconds(text: str) -> int:
+    """Parses [+|-]hh[:mm[:ss]] into seconds."""
+    match = _SECONDS_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid time in TZ string: {text}")
+    seconds = int(match.group('h')) * 3600 + int(match.group('m') or 0) * 60 + int(match.group('s') or 0)
+    return -seconds if match.group('sign') == '-' else seconds
+
+
+def _parse_rule_date(text: str) -> _RuleDate:
+    date, _, time = text.partition('/')
+    match = _RULE_DATE_RE.fullmatch(date)
+    if match is None:
+        raise ValueError(f"Invalid rule in TZ string: {text}")
+    seconds = _parse_seconds(time) if time else 2 * 3600
+    if match.group('m'):
+        return ("M", int(match.group('m')), int(match.group('w')), int(match.group('d')), seconds)
+    if match.group('julian'):
+        day = int(match.group('julian'))
+        if not 1 <= day <= 365:
+            raise ValueError(f"Invalid rule in TZ string: {text}")
+        return ("J", day, 0, 0, seconds)
+    day = int(match.group('zero_based'))
+    if day > 365:
+        raise ValueError(f"Invalid rule in TZ string: {text}")
+    return ("N", day, 0, 0, seconds)
+
+
+def _is_leap_year(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _rule_local_instant(rule: _RuleDate, year: int) -> Instant:
+    """The local wall time (in the offset in effect before it) at which a rule fires in a year."""
+    kind, first, week, weekday, seconds = rule
+    if kind == "M":
+        month = first
+        first_of_month = days_from_civil(year, month, 1)
+        next_month = days_from_civil(year + (month == 12), month % 12 + 1, 1)
+        # 1970-01-01 was a Thursday; POSIX weekdays count from Sunday (0).
+        day = first_of_month + (weekday - (first_of_month + 4)) % 7 + (week - 1) * 7
+        if day >= next_month:  # Week 5 means the last such weekday of the month.
+            day -= 7
+    elif kind == "J":  # 1-365, February 29th is never counted.
+        day = days_from_civil(year, 1, 1) + first - 1 + (first >= 60 and _is_leap_year(year))
+    else:  # 0-365, February 29th is counted.
+        day = days_from_civil(year, 1, 1) + first
+    return day * SECONDS_PER_DAY + seconds
+
+
+class _TZRule:
+    """The yearly daylight saving rule of a POSIX TZ string."""
+
+    def __init__(self, std: ZoneInfoTuple, dst: ZoneInfoTuple, start: _RuleDate, end: _RuleDate):
+        self.std, self.dst, self.start, self.end = std, dst, start, end
+
+    def transitions(self, first_year: int, last_year: int) -> List[Tuple[Instant, ZoneInfoTuple]]:
+        """(UTC instant, info from then on) for every transition in the years, in order."""
+        events = []
+        for year in range(first_year, last_year + 1):
+            # The start is given in standard time and the end in daylight saving time.
+            events.append((_rule_local_instant(self.start, year) - self.std[0], self.dst))
+            events.append((_rule_local_instant(self.end, year) - self.dst[0], self.std))
+        # Stable: when a year's end meets the next year's start (DST all year), the start wins.
+        events.sort(key=lambda event: event[0])
+        return events
+
+
+def _parse_tz_string(tz_string: str) -> Tuple[ZoneInfoTuple, Optional[_TZRule]]:
+    """Returns the standard (offset, abbreviation) of a TZ string and its DST rule, if any."""
+    match = _TZ_STRING_RE.fullmatch(tz_string)
+    if match is None:
+        raise ValueError(f"Invalid TZ string: {tz_string}")
+    # POSIX offsets are west of Greenwich, the opposite sign of a UTC offset.
+    std = (-_parse_seconds(match.group('stdoff')), match.group('std').strip('<>'))
+    if match.group('dst') is None:
+        return std, None
+    dst_offset = -_parse_seconds(match.group('dstoff')) if match.group('dstoff') else std[0] + 3600
+    dst = (dst_offset, match.group('dst').strip('<>'))
+    return std, _TZRule(std, dst, _parse_rule_date(match.group('start')), _parse_rule_date(match.group('end')))
+
+
+# TZif (RFC 8536) files.
+
+_TZIF_HEADER = struct.Struct(">4s1s15x6l")
+
+
+def _read_tzif(fobj: BinaryIO) -> Tuple[List[Instant], List[ZoneInfoTuple], Optional[str]]:
+    """
+    Reads a TZif file. Returns the transition instants (UTC), the info in effect
+    before the first and after each transition, and the footer TZ string (None
+    for version 1 files).
+    """
+    magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _TZIF_HEADER.unpack(
+        fobj.read(_TZIF_HEADER.size))
+    if magic != b"TZif":
+        raise ValueError("Invalid TZif file: magic not found")
+    time_size, time_format = 4, "l"
+    if version != b"\x00":
+        # Skip the version 1 data block; the version 2+ block after it has 64-bit times.
+        fobj.seek(timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt, os.SEEK_CUR)
+        magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _TZIF_HEADER.unpack(
+            fobj.read(_TZIF_HEADER.size))
+        time_size, time_format = 8, "q"
+
+    instants = list(struct.unpack(f">{timecnt}{time_format}", fobj.read(timecnt * time_size)))
+    type_indices = struct.unpack(f">{timecnt}B", fobj.read(timecnt))
+    types = [struct.unpack(">lbB", fobj.read(6)) for _ in range(typecnt)]
+    designations = fobj.read(charcnt)
+
+    def abbreviation(index: int) -> str:
+        return designations[index:designations.index(b"\x00", index)].decode('ascii')
+
+    infos = [(utcoff, abbreviation(index)) for utcoff, _, index in types]
+    isdst = [bool(flag) for _, flag, _ in types]
+
+    tz_string = None
+    if version != b"\x00":
+        fobj.seek(leapcnt * (time_size + 4) + isstdcnt + isutcnt, os.SEEK_CUR)
+        tz_string = fobj.read().strip(b"\n").decode('ascii')
+
+    # Entry 0 describes the time before the first transition: the first
+    # standard-time type (the type zoneinfo uses there), else the first one used.
+    first_std = next((i for i, flag in enumerate(isdst) if not flag), type_indices[0] if type_indices else 0)
+    transition_infos = [infos[first_std]] + [infos[i] for i in type_indices]
+    return instants, transition_infos, tz_string
+
+
+def _open_zone_file(key: str) -> BinaryIO:
+    """Opens the TZif file of a key the way zoneinfo finds it: TZPATH first, then the tzdata package."""
+    for directory in zoneinfo.TZPATH:
+        path = os.path.join(directory, key)
+        if os.path.isfile(path):
+            return open(path, 'rb')
+    from importlib import resources
+    package, _, name = ("tzdata.zoneinfo." + key.replace("/", ".")).rpartition(".")
+    return resources.files(package).joinpath(name).open('rb')
+
+
+def _year_of(instant: Instant) -> int:
+    return civil_from_days(instant // SECONDS_PER_DAY)[0]
+
+
+class TransitionTable:
+    """
+    The UTC offsets of one IANA time zone, as sorted arrays searched with bisect.
+
+    to_local() and from_local() convert between UTC and local wall-clock
+    instants in O(log n), with n the number of transitions (a few hundred).
+    """
+    __slots__ = ('key', '_utc_starts', '_local_starts', '_infos', '_cycle_start', '_periodic_before')
+
+    def __init__(self, key: str, utc_starts: List[Instant], infos: List[ZoneInfoTuple],
+                 cycle_start: Optional[Instant] = None, periodic_before: bool = False):
+        """
+        utc_starts[i] is the UTC instant from which infos[i] applies (utc_starts[0]
+        is _BEGINNING_OF_TIME). When cycle_start is given, the table covers at least
+        one 400-year cycle from it, after which offsets repeat (and before it too
+        when periodic_before is set).
+        """
+        self.key = key
+        local_starts = [_BEGINNING_OF_TIME]
+        for i in range(1, len(utc_starts)):
+            # With fold=0, a transition happens in wall time at the later of the two
+            # readings: after a gap, or after the repeated period.
+            local_starts.append(utc_starts[i] + max(infos[i - 1][0], infos[i][0]))
+        self._utc_starts = array('q', utc_starts)
+        self._local_starts = array('q', local_starts)
+        self._infos = tuple(infos)
+        self._cycle_start = cycle_start
+        self._periodic_before = periodic_before
+
+    def _cycle_shift(self, instant: Instant) -> int:
+        """Multiple of the 400-year cycle to subtract from an instant to bring it into the table."""
+        if self._cycle_start is None:
+            return 0
+        cycles = (instant - self._cycle_start) // _CYCLE_SECONDS
+        if cycles > 0 or (cycles < 0 and self._periodic_before):
+            return cycles * _CYCLE_SECONDS
+        return 0
+
+    def info_at(self, instant: Instant) -> ZoneInfoTuple:
+        """The (UTC offset, abbreviation) in effect at a UTC instant."""
+        shift = self._cycle_shift(instant)
+        return self._infos[bisect_right(self._utc_starts, instant - shift) - 1]
+
+    def to_local(self, instant: Instant) -> Tuple[Instant, str]:
+        """Converts a UTC instant to (local wall-clock instant, abbreviation)."""
+        offset, abbreviation = self.info_at(instant)
+        return instant + offset, abbreviation
+
+    def from_local(self, local_instant: Instant) -> Instant:
+        """Converts a local wall-clock instant to UTC, as zoneinfo does with fold=0."""
+        shift = self._cycle_shift(local_instant)
+        offset = self._infos[bisect_right(self._local_starts, local_instant - shift) - 1][0]
+        return local_instant - offset
+
+    def to_payload(self) -> dict:
+        """
+        The table as JSON-serializable data, for clients that convert instants themselves
+        (static/timecalc.js): "transitions" holds the UTC instants of utc_starts[1:],
+        "types" the distinct (offset, abbreviation) pairs, and "type_indices" the type
+        in effect before the first transition and after each one.
+        """
+        types = list(dict.fromkeys(self._infos))
+        index_of = {info: i for i, info in enumerate(types)}
+        return {
+            "key": self.key,
+            "transitions": self._utc_starts[1:].tolist(),
+            "types": [list(info) for info in types],
+            "type_indices": [index_of[info] for info in self._infos],
+            "cycle_start": self._cycle_start,
+            "periodic_before": self._periodic_before,
+        }
+
+    def __len__(self) -> int:
+        return len(self._utc_starts)
+
+    def __repr__(self) -> str:
+        return f"TransitionTable({self.key!r}, {len(self)} periods)"
+
+
+def load_transition_table(key: str) -> TransitionTable:
+    """
+    Builds the TransitionTable of an IANA key such as "Europe/Paris" (uncached).
+
+    Raises:
+        ValueError: If the key is not a known time zone.
+    """
+    try:
+        # Validates the key (no absolute or relative paths) and that the zone exists.
+        zoneinfo.ZoneInfo(key)
+        with _open_zone_file(key) as fobj:
+            instants, infos, tz_string = _read_tzif(fobj)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError, OSError, ImportError):
+        raise ValueError(f"Unknown timezone: '{key}'") from None
+
+    utc_starts = [_BEGINNING_OF_TIME] + instants
+    if not tz_string:
+        return TransitionTable(key, utc_starts, infos)
+
+    std, rule = _parse_tz_string(tz_string)
+    if rule is None:
+        # A fixed offset from the last transition on.
+        infos[-1] = std
+        return TransitionTable(key, utc_starts, infos)
+
+    # Expand the yearly rule past the last transition, for a full 400-year cycle
+    # starting on a January 1st after it (with a year of margin either side).
+    last_transition = instants[-1] if instants else 0
+    first_year = _year_of(last_transition)
+    cycle_start = days_from_civil(first_year + 2, 1, 1) * SECONDS_PER_DAY
+    events = rule.transitions(first_year - 1, first_year + 2 + 400 + 1)
+    # Until the rule's first transition, its state at the last transition applies.
+    infos[-1] = next((info for instant, info in reversed(events) if instant <= last_transition), rule.std)
+    for instant, info in events:
+        if instant > last_transition and info != infos[-1]:
+            utc_starts.append(instant)
+            infos.append(info)
+    return TransitionTable(key, utc_starts, infos, cycle_start, periodic_before=not instants)
+
+
+zone_cache = LRUCache(size_from_environment("TIMECALC_TIMEZONE_CACHE_SIZE", DEFAULT_TIMEZONE_CACHE_SIZE))
+
+
+def transition_table(key: str) -> TransitionTable:
+    """
+    Returns the TransitionTable of an IANA key, from the zone cache when possible.
+
+    Raises:
+        ValueError: If the key is not a known time zone.
+    """
+    table = zone_cache.get(key)
+    if table is None:
+        table = load_transition_table(key)
+        zone_cache.put(key, table)
+    return table